@@ -6,7 +6,7 @@ from typing import TypedDict
 from fastapi import FastAPI, HTTPException
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from fastapi_pagination import add_pagination
 from httpx import AsyncClient
 from slugify import slugify
@@ -20,9 +20,12 @@ from src.common.helpers.caching import init_redis_cache
 from src.common.helpers.error_codes import AppErrorCode
 from src.common.helpers.exception import setup_exception_handlers
 from src.config import settings
-from src.models import Params, Role, User
+from src.middleware.functional import IdentityMapMiddleware
+from src.models import LoginEvent, LoginRollup, Params, Role, User, UserArchive, UserStat, UserTombstone
 from src.routers import auth_router, param_router, perm_router, role_router, user_router
-from src.services import roles, users
+from src.services import archive, params, roles, stats, users
+from src.services.activity import activity_buffer
+from src.services.audit import login_audit
 from src.shared import blacklist_token
 
 __version__ = "0.1.0"
@@ -37,26 +40,44 @@ class State(TypedDict):
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[State]:
     await startup_db_client(
-        app=app, mongodb_uri=settings.MONGODB_URI, database_name=settings.MONGO_DB, document_models=[User, Role, Params]
+        app=app,
+        mongodb_uri=settings.MONGODB_URI,
+        database_name=settings.MONGO_DB,
+        document_models=[User, Role, Params, UserStat, UserArchive, LoginEvent, LoginRollup, UserTombstone],
     )
 
     await load_app_description(mongodb_client=app.mongo_db_client)
     await load_app_permissions(mongodb_client=app.mongo_db_client)
 
+    await users.backfill_identifier_fields()
+    await params.backfill_slugs()
+    await users.backfill_role_summaries()
+    await roles.backfill_permission_codes()
     await roles.create_admin_role()
     await users.create_admin_user()
+    await stats.ensure_user_stats()
 
     blacklist_token.init_blacklist_token_file()
 
     await init_redis_cache(app_name=BASE_URL, cache_db_url=settings.CACHE_DB_URL)
 
+    activity_buffer.start()
+    login_audit.start()
+    stats.stats_reconciler.start()
+    archive.user_archiver.start()
+
     yield
+    await archive.user_archiver.stop()
+    await stats.stats_reconciler.stop()
+    await login_audit.stop()
+    await activity_buffer.stop()
     await shutdown_db_client(app=app)
 
 
 app: FastAPI = FastAPI(
     lifespan=lifespan,
     version=__version__,
+    default_response_class=ORJSONResponse,
     title=f"{settings.APP_TITLE} API Service",
     docs_url="/auth/docs",
     openapi_url="/auth/openapi.json",
@@ -85,6 +106,7 @@ setup_exception_handlers(app)
 
 # Compress responses larger than 1000 bytes
 app.add_middleware(GZipMiddleware, minimum_size=int(settings.COMPRESS_MIN_SIZE))
+app.add_middleware(IdentityMapMiddleware)
 
 
 @app.exception_handler(HTTPException)
@@ -1,6 +1,6 @@
 from functools import lru_cache
 from typing import Optional
-from pydantic import Field, PositiveInt
+from pydantic import Field, PositiveFloat, PositiveInt
 from pydantic_settings import BaseSettings
 
 
@@ -24,11 +24,33 @@ class AuthBaseConfig(BaseSettings):
     LIST_PARAMETERS_ENDPOINT_SECURITY_ENABLED: Optional[bool] = Field(
         default=False, alias="LIST_PARAMETERS_ENDPOINT_SECURITY_ENABLED"
     )
+    ACTIVITY_FLUSH_INTERVAL: Optional[PositiveInt] = Field(default=5, alias="ACTIVITY_FLUSH_INTERVAL")
+    ACTIVITY_BUFFER_MAX_SIZE: Optional[PositiveInt] = Field(default=1000, alias="ACTIVITY_BUFFER_MAX_SIZE")
+    BATCH_LOADER_WINDOW: Optional[PositiveFloat] = Field(default=0.002, alias="BATCH_LOADER_WINDOW")
+    BATCH_LOADER_MAX_SIZE: Optional[PositiveInt] = Field(default=100, alias="BATCH_LOADER_MAX_SIZE")
+    USER_BATCH_MAX_IDS: Optional[PositiveInt] = Field(default=200, alias="USER_BATCH_MAX_IDS")
+    EXPORT_BATCH_SIZE: Optional[PositiveInt] = Field(default=500, alias="EXPORT_BATCH_SIZE")
+    IMPORT_BATCH_SIZE: Optional[PositiveInt] = Field(default=1000, alias="IMPORT_BATCH_SIZE")
+    IMPORT_HASH_WORKERS: Optional[PositiveInt] = Field(default=4, alias="IMPORT_HASH_WORKERS")
+    PAGINATION_COUNT_TTL: Optional[PositiveFloat] = Field(default=10, alias="PAGINATION_COUNT_TTL")
+    USER_STATS_RECONCILE_INTERVAL: Optional[PositiveInt] = Field(default=3600, alias="USER_STATS_RECONCILE_INTERVAL")
+    ROLE_SLUG_CACHE_TTL: Optional[PositiveFloat] = Field(default=60, alias="ROLE_SLUG_CACHE_TTL")
+    PENDING_SIGNUP_TTL: Optional[PositiveInt] = Field(default=86400, alias="PENDING_SIGNUP_TTL")
+    USER_ARCHIVE_AFTER_DAYS: Optional[PositiveInt] = Field(default=180, alias="USER_ARCHIVE_AFTER_DAYS")
+    USER_ARCHIVE_INTERVAL: Optional[PositiveInt] = Field(default=86400, alias="USER_ARCHIVE_INTERVAL")
+    USER_ARCHIVE_BATCH_SIZE: Optional[PositiveInt] = Field(default=500, alias="USER_ARCHIVE_BATCH_SIZE")
+    LOGIN_EVENT_RETENTION: Optional[PositiveInt] = Field(default=7776000, alias="LOGIN_EVENT_RETENTION")
+    USER_TOMBSTONE_RETENTION: Optional[PositiveInt] = Field(default=2592000, alias="USER_TOMBSTONE_RETENTION")
 
     # USER MODEL NAME
     USER_MODEL_NAME: str = Field(..., alias="USER_MODEL_NAME")
     ROLE_MODEL_NAME: str = Field(..., alias="ROLE_MODEL_NAME")
     PARAM_MODEL_NAME: str = Field(..., alias="PARAM_MODEL_NAME")
+    USER_STAT_MODEL_NAME: str = Field(default="user_stats", alias="USER_STAT_MODEL_NAME")
+    USER_ARCHIVE_MODEL_NAME: str = Field(default="user_archives", alias="USER_ARCHIVE_MODEL_NAME")
+    LOGIN_EVENT_MODEL_NAME: str = Field(default="login_events", alias="LOGIN_EVENT_MODEL_NAME")
+    LOGIN_ROLLUP_MODEL_NAME: str = Field(default="login_rollups", alias="LOGIN_ROLLUP_MODEL_NAME")
+    USER_TOMBSTONE_MODEL_NAME: str = Field(default="user_tombstones", alias="USER_TOMBSTONE_MODEL_NAME")
 
     # FRONTEND URL CONFIG
     FRONTEND_URL: Optional[str] = Field(..., alias="FRONTEND_URL")
@@ -4,6 +4,8 @@ from fastapi import Request, status
 from fastapi.responses import PlainTextResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from src.shared.identity_map import identity_map
+
 
 class TimeoutMiddleware(BaseHTTPMiddleware):
     """
@@ -28,3 +30,23 @@ class TimeoutMiddleware(BaseHTTPMiddleware):
             return await asyncio.wait_for(call_next(request), timeout=self.timeout)
         except asyncio.TimeoutError:
             return PlainTextResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content="Request timed out")
+
+
+class IdentityMapMiddleware:
+    """
+    Pure ASGI middleware opening a request-scoped identity map (see ``src.shared.identity_map``).
+
+    Documents fetched by id during the request are memoized until the response is sent, so repeated
+    ``get_one_user``/``get_one_role`` calls from dependencies, routers and services query MongoDB once.
+
+    example: app.add_middleware(IdentityMapMiddleware)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        with identity_map.scope():
+            await self.app(scope, receive, send)
@@ -1,5 +1,22 @@
+from .archive import UserArchive
+from .audit import LoginEvent, LoginRollup
 from .params import Params
 from .roles import Role
-from .users import User, UserOut
+from .stats import UserStat
+from .tombstone import UserTombstone
+from .users import identifier_fields, User, USER_HIDDEN_FIELDS, UserOut, UserStatus
 
-__all__ = ["User", "Role", "Params", "UserOut"]
+__all__ = [
+    "User",
+    "Role",
+    "Params",
+    "UserStat",
+    "UserArchive",
+    "LoginEvent",
+    "LoginRollup",
+    "UserTombstone",
+    "UserOut",
+    "UserStatus",
+    "USER_HIDDEN_FIELDS",
+    "identifier_fields",
+]
@@ -0,0 +1,27 @@
+from datetime import datetime, UTC
+
+import pymongo
+from beanie import Document
+from pydantic import ConfigDict, Field
+
+from src.config import settings
+
+
+class UserArchive(Document):
+    """
+    Users moved out of the ``User`` collection after a long deactivation.
+
+    Documents are stored as they were in ``User`` (plus ``archived_at``) so a restore is a plain copy back.
+    """
+
+    archived_at: datetime = Field(default_factory=lambda: datetime.now(tz=UTC), description="Archive date")
+
+    model_config = ConfigDict(extra="allow")
+
+    class Settings:
+        name = settings.USER_ARCHIVE_MODEL_NAME
+        indexes = [
+            pymongo.IndexModel(keys=[("archived_at", pymongo.ASCENDING)]),
+            pymongo.IndexModel(keys=[("email_norm", pymongo.ASCENDING)]),
+            pymongo.IndexModel(keys=[("phone_norm", pymongo.ASCENDING)]),
+        ]
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Optional
+
+import pymongo
+from beanie import Document, Granularity, PydanticObjectId, TimeSeriesConfig
+from pydantic import BaseModel, Field
+
+from src.config import settings
+from src.shared.utils import AuditPeriod, AuditScope
+
+
+class LoginEventMeta(BaseModel):
+    user: PydanticObjectId = Field(..., description="User who logged in")
+    role: Optional[PydanticObjectId] = Field(None, description="Role of the user at login time")
+
+
+class LoginEvent(Document):
+    """
+    One successful login, stored in a time-series collection bucketed by ``meta`` (user and role).
+
+    Raw events are only written (in batches) and expire after ``LOGIN_EVENT_RETENTION`` seconds;
+    reads go through ``LoginRollup``.
+    """
+
+    timestamp: datetime = Field(..., description="Login date")
+    meta: LoginEventMeta
+    address_ip: Optional[str] = Field(None, description="Client IP address")
+    device_id: Optional[str] = Field(None, description="Client device")
+
+    class Settings:
+        name = settings.LOGIN_EVENT_MODEL_NAME
+        timeseries = TimeSeriesConfig(
+            time_field="timestamp",
+            meta_field="meta",
+            granularity=Granularity.minutes,
+            expire_after_seconds=settings.LOGIN_EVENT_RETENTION,
+        )
+
+
+class LoginRollup(Document):
+    """Number of logins of one user or one role over one hour or one day, maintained with ``$inc``."""
+
+    scope: AuditScope = Field(..., description="Kind of the counted key")
+    key: Optional[PydanticObjectId] = Field(None, description="User or role identifier")
+    period: AuditPeriod = Field(..., description="Bucket size")
+    start: datetime = Field(..., description="Bucket start (UTC)")
+    count: int = Field(0, description="Number of logins")
+
+    class Settings:
+        name = settings.LOGIN_ROLLUP_MODEL_NAME
+        indexes = [
+            pymongo.IndexModel(
+                keys=[
+                    ("scope", pymongo.ASCENDING),
+                    ("key", pymongo.ASCENDING),
+                    ("period", pymongo.ASCENDING),
+                    ("start", pymongo.ASCENDING),
+                ],
+                unique=True,
+            ),
+        ]
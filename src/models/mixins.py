@@ -4,5 +4,5 @@ from pydantic import Field
 
 
 class DatetimeTimestamp:
-    created_at: Optional[datetime] = Field(default=datetime.now(tz=UTC), description="Datetime created")
-    updated_at: Optional[datetime] = Field(default=datetime.now(tz=UTC), description="Datetime updated")
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(tz=UTC), description="Datetime created")
+    updated_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(tz=UTC), description="Datetime updated")
@@ -1,20 +1,17 @@
 from typing import Optional
 
 import pymongo
-from beanie import before_event, Document, Indexed, Insert
+from beanie import before_event, Document, Insert
 from slugify import slugify
-from starlette import status
 
 from pydantic import Field
-from src.common.helpers.exception import CustomHTTPException
 from src.config import settings
 from src.schemas import ParamsModel
-from src.shared.error_codes import ParamErrorCode
 from .mixins import DatetimeTimestamp
 
 
 class Params(ParamsModel, DatetimeTimestamp, Document):
-    slug: Optional[Indexed(str)] = Field(..., description="Slug of the parameter")
+    slug: Optional[str] = Field(None, description="Slug of the parameter")
 
     class Settings:
         name = settings.PARAM_MODEL_NAME
@@ -28,17 +25,17 @@ class Params(ParamsModel, DatetimeTimestamp, Document):
                 ],
                 unique=True,
                 background=True,
-            )
+            ),
+            pymongo.IndexModel(keys=[("slug", pymongo.ASCENDING)], unique=True),
+            pymongo.IndexModel(keys=[("updated_at", pymongo.DESCENDING)]),
+            pymongo.IndexModel(keys=[("type", pymongo.ASCENDING), ("updated_at", pymongo.DESCENDING)]),
         ]
 
+    @staticmethod
+    def build_slug(type: str, name: str) -> str:
+        return slugify(f"{type}-{name}")
+
     @before_event(Insert)
-    async def generate_unique_slug(self, **kwargs):
-        new_slug_value = slugify(self.name)
-        if await Params.find({"slug": new_slug_value, "type": self.type}).exists() is True:
-            raise CustomHTTPException(
-                code_error=ParamErrorCode.PARAM_ALREADY_EXIST,
-                message_error=f"This parameter '{self.name}' already exists.",
-                status_code=status.HTTP_400_BAD_REQUEST,
-            )
-        new_value = self.type + self.name
-        self.slug = slugify(new_value)
+    def generate_unique_slug(self, **kwargs):
+        # Uniqueness is enforced by the unique index on ``slug``.
+        self.slug = self.build_slug(self.type, self.name)
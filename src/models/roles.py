@@ -1,21 +1,20 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Mapping, Optional
 
 import pymongo
-from beanie import before_event, Document, Indexed, Insert
+from beanie import before_event, Document, Insert
 from slugify import slugify
-from starlette import status
 from pydantic import Field
 
-from src.common.helpers.exception import CustomHTTPException
 from src.config import settings
-from src.schemas import RoleModel
-from src.shared.error_codes import RoleErrorCode
+from src.schemas import RoleModel, RoleSummary
 from .mixins import DatetimeTimestamp
 
 
 class Role(RoleModel, DatetimeTimestamp, Document):
     permissions: List[Dict] = Field(default_factory=list, description="Role permissions")
-    slug: Optional[Indexed(str)] = Field(None, description="Role slug")
+    slug: Optional[str] = Field(None, description="Role slug")
+    version: int = Field(1, description="Role revision, incremented on every update")
+    permission_codes: List[str] = Field(default_factory=list, description="Permission codes flattened from ``permissions``")
 
     class Settings:
         name = settings.ROLE_MODEL_NAME
@@ -27,16 +26,25 @@ class Role(RoleModel, DatetimeTimestamp, Document):
                     ("description", pymongo.TEXT),
                     ("slug", pymongo.TEXT),
                 ]
-            )
+            ),
+            pymongo.IndexModel(keys=[("slug", pymongo.ASCENDING)], unique=True),
+            pymongo.IndexModel(keys=[("permission_codes", pymongo.ASCENDING)]),
         ]
 
+    @staticmethod
+    def flatten_permissions(permissions: Iterable[Mapping]) -> List[str]:
+        """Codes granted by ``[{service_info, permissions: [{code, description}]}]`` blocks, sorted and unique."""
+
+        return sorted({perm["code"] for block in permissions for perm in block.get("permissions", [])})
+
+    def summary(self) -> RoleSummary:
+        return RoleSummary(_id=self.id, name=self.name, slug=self.slug, version=self.version)
+
+    @before_event(Insert)
+    def generate_unique_slug(self, **kwargs):
+        # Uniqueness is enforced by the unique index on ``slug``.
+        self.slug = slugify(self.name)
+
     @before_event(Insert)
-    async def generate_unique_slug(self, **kwargs):
-        new_slug_value = slugify(self.name)
-        if await Role.find({"slug": new_slug_value}).exists() is True:
-            raise CustomHTTPException(
-                code_error=RoleErrorCode.ROLE_ALREADY_EXIST,
-                message_error=f"This role '{self.name}' already exists.",
-                status_code=status.HTTP_400_BAD_REQUEST,
-            )
-        self.slug = new_slug_value
+    def flatten_permission_codes(self, **kwargs):
+        self.permission_codes = self.flatten_permissions(self.permissions)
@@ -0,0 +1,23 @@
+from datetime import datetime, UTC
+from typing import Optional
+
+import pymongo
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+
+from src.config import settings
+
+
+class UserStat(Document):
+    """Number of (non primary) users for one role and account state, maintained with ``$inc`` on every change."""
+
+    role: Optional[PydanticObjectId] = Field(None, description="Role of the counted users")
+    is_active: bool = Field(..., description="Account state of the counted users")
+    count: int = Field(0, description="Number of users")
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(tz=UTC), description="Last change of the counter")
+
+    class Settings:
+        name = settings.USER_STAT_MODEL_NAME
+        indexes = [
+            pymongo.IndexModel(keys=[("role", pymongo.ASCENDING), ("is_active", pymongo.ASCENDING)], unique=True),
+        ]
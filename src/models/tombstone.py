@@ -0,0 +1,25 @@
+from datetime import datetime, UTC
+
+import pymongo
+from beanie import Document
+from pydantic import Field
+
+from src.config import settings
+
+
+class UserTombstone(Document):
+    """
+    Trace of a hard-deleted user, keyed by the user id, read by the users change feed.
+
+    ``updated_at`` is the deletion date so tombstones sort with the users on ``(updated_at, _id)``;
+    they expire after ``USER_TOMBSTONE_RETENTION`` seconds.
+    """
+
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(tz=UTC), description="Deletion date")
+
+    class Settings:
+        name = settings.USER_TOMBSTONE_MODEL_NAME
+        indexes = [
+            pymongo.IndexModel(keys=[("updated_at", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)]),
+            pymongo.IndexModel(keys=[("updated_at", pymongo.ASCENDING)], expireAfterSeconds=settings.USER_TOMBSTONE_RETENTION),
+        ]
@@ -1,23 +1,88 @@
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional
 
 import pymongo
-from beanie import Document
-from pydantic import Field
+from beanie import before_event, Document, Insert, PydanticObjectId, Replace, Save
+from pydantic import BaseModel, Field
 
 from src.config import settings
-from src.schemas import CreateUser
+from src.schemas import CreateUser, RoleSummary, USER_QUERY_INDEXES
+from src.shared.utils import normalize_email, normalize_phonenumber
 from .mixins import DatetimeTimestamp
 
 
 class User(CreateUser, DatetimeTimestamp, Document):
     is_active: Optional[bool] = Field(False, description="User is active")
     is_primary: Optional[bool] = Field(False, description="User is primary")
+    email_norm: Optional[str] = Field(None, description="Canonical email used for lookups")
+    phone_norm: Optional[str] = Field(None, description="Canonical E.164 phone number used for lookups")
+    role_summary: Optional[RoleSummary] = Field(None, description="Denormalized role name and slug")
+    pending_expires_at: Optional[datetime] = Field(None, description="Purge date of a signup never verified")
 
     class Settings:
         name = settings.USER_MODEL_NAME
         use_state_management = True
-        indexes = [pymongo.IndexModel(keys=[("fullname", pymongo.TEXT)])]
+        indexes = [
+            pymongo.IndexModel(keys=[("fullname", pymongo.TEXT)]),
+            *[pymongo.IndexModel(keys=[(key, pymongo.ASCENDING) for key in keys]) for keys in USER_QUERY_INDEXES],
+            pymongo.IndexModel(keys=[("updated_at", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)]),
+            # TTL : MongoDB supprime les inscriptions jamais vérifiées une fois ``pending_expires_at`` dépassé
+            pymongo.IndexModel(
+                keys=[("pending_expires_at", pymongo.ASCENDING)],
+                expireAfterSeconds=0,
+                partialFilterExpression={"is_active": False, "pending_expires_at": {"$type": "date"}},
+            ),
+            pymongo.IndexModel(
+                keys=[("email_norm", pymongo.ASCENDING)],
+                unique=True,
+                partialFilterExpression={"email_norm": {"$type": "string"}},
+            ),
+            pymongo.IndexModel(
+                keys=[("phone_norm", pymongo.ASCENDING)],
+                unique=True,
+                partialFilterExpression={"phone_norm": {"$type": "string"}},
+            ),
+        ]
+
+    @before_event(Insert, Replace, Save)
+    def normalize_identifiers(self):
+        self.email_norm = normalize_email(self.email)
+        self.phone_norm = normalize_phonenumber(self.phonenumber)
+
+
+def identifier_fields(values: Mapping[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    ``email_norm``/``phone_norm`` for the ``email``/``phonenumber`` keys of a partial ``$set``.
+
+    Beanie document events do not fire on ``update``/``set``, so these paths add the canonical fields themselves.
+    """
+    fields = {}
+    if "email" in values:
+        fields["email_norm"] = normalize_email(values["email"])
+    if "phonenumber" in values:
+        fields["phone_norm"] = normalize_phonenumber(values["phonenumber"])
+    return fields
+
+
+# Champs jamais renvoyés par l'API, au format ``exclude`` de pydantic (les clés imbriquées sont des dicts)
+USER_HIDDEN_FIELDS = {
+    "password": True,
+    "is_primary": True,
+    "email_norm": True,
+    "phone_norm": True,
+    "pending_expires_at": True,
+    # Déjà exposé sous ``extras.role_info``
+    "role_summary": True,
+    "attributes": {"otp_secret": True, "otp_created_at": True},
+}
 
 
 class UserOut(User):
     extras: Dict[str, Any] = {}
+
+
+class UserStatus(BaseModel):
+    """Projection used by identifier lookups that only need to know whether an account exists and is active."""
+
+    id: PydanticObjectId = Field(alias="_id")
+    is_active: Optional[bool] = False
@@ -2,7 +2,6 @@ from typing import Optional
 
 from beanie import PydanticObjectId
 from fastapi import APIRouter, BackgroundTasks, Body, Depends, Query, Request, status
-from fastapi_pagination.ext.beanie import paginate
 from pymongo import ASCENDING, DESCENDING
 
 from src.common.helpers.pagination import customize_page
@@ -13,10 +12,18 @@ from src.models import Params
 from src.schemas import FilterParams, ParamsModel
 from src.services import params
 from src.shared import API_TRAILHUB_ENDPOINT, API_VERIFY_ACCESS_TOKEN_ENDPOINT
+from src.shared.pagination import construct_items, paginate_collection
+from src.shared.etag import etag_matches, not_modified, with_etag
+from src.shared.serialization import JSONSerializer
 from src.shared.utils import SortEnum
 
 param_router = APIRouter(prefix="/parameters", tags=["PARAMETERS"])
 
+ParamsPage = customize_page(Params)
+
+param_serializer = JSONSerializer(Params)
+param_page_serializer = JSONSerializer(ParamsPage)
+
 
 @param_router.post(
     "",
@@ -54,13 +61,17 @@ async def create(request: Request, bg: BackgroundTasks, payload: ParamsModel = B
         else []
     ),
     summary="Get all parameters",
-    response_model=customize_page(Params),
+    response_model=ParamsPage,
     status_code=status.HTTP_200_OK,
 )
 async def all(
+    request: Request,
     filter: FilterParams = Depends(FilterParams),
     sort: Optional[SortEnum] = Query(default=SortEnum.DESC, alias="sort", description="Sort by 'asc' or 'desc"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. '_id,name,type'"),
+    include_total: bool = Query(True, description="Compute the total number of items, disable to skip the count"),
 ):
+    fieldset = params.fieldset(fields)
     search = {}
 
     if filter.type:
@@ -69,9 +80,20 @@ async def all(
     if filter.name:
         search["name"] = {"$regex": filter.name, "$options": "i"}
 
+    etag = await params.list_etag(search, request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     sorted = DESCENDING if sort == SortEnum.DESC else ASCENDING
-    params = Params.find(search, sort=[("created_at", sorted)])
-    return await paginate(params)
+    page = await paginate_collection(
+        Params.get_motor_collection(),
+        search,
+        construct_items(Params),
+        sort=[("created_at", sorted)],
+        projection=fieldset.projection,
+        include_total=include_total,
+    )
+    return with_etag(param_page_serializer.response(page, include=fieldset.page_include(ParamsPage.model_fields)), etag)
 
 
 @param_router.get(
@@ -84,8 +106,20 @@ async def all(
     summary="Get one params",
     status_code=status.HTTP_200_OK,
 )
-async def read(id: PydanticObjectId):
-    return await params.get_one(id=PydanticObjectId(id))
+async def read(
+    request: Request,
+    id: PydanticObjectId,
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. '_id,name,type'"),
+):
+    fieldset = params.fieldset(fields)
+    if etag_matches(request, etag := await params.get_etag(id=PydanticObjectId(id), fields=fields)):
+        return not_modified(etag)
+
+    if fieldset.include is not None:
+        result = await params.get_one_fields(id=PydanticObjectId(id), fieldset=fieldset)
+    else:
+        result = await params.get_one(id=PydanticObjectId(id))
+    return with_etag(param_serializer.response(result, include=fieldset.include), etag)
 
 
 @param_router.patch(
@@ -1,9 +1,9 @@
 import asyncio
-from typing import Optional, Set
+from datetime import datetime
+from typing import List, Optional, Set
 
 from beanie import PydanticObjectId
 from fastapi import APIRouter, BackgroundTasks, Body, Depends, Query, Request, status
-from fastapi_pagination.ext.beanie import paginate
 from pymongo import ASCENDING, DESCENDING
 from slugify import slugify
 
@@ -13,15 +13,26 @@ from src.common.services.trailhub_client import send_event
 from src.config import enable_endpoint, settings
 from src.middleware import AuthorizedHTTPBearer, CheckPermissionsHandler
 from src.models import Role
-from src.schemas import RoleModel
-from src.services import roles
+from src.schemas import BulkResult, LoginRollupSeries, RoleModel, UserReadModel
+from src.services import audit, roles
 from src.shared import API_TRAILHUB_ENDPOINT, API_VERIFY_ACCESS_TOKEN_ENDPOINT
-from src.shared.utils import SortEnum
+from src.shared.pagination import construct_items, paginate_collection
+from src.shared.etag import etag_matches, not_modified, with_etag
+from src.shared.serialization import JSONSerializer
+from src.shared.utils import AuditPeriod, AuditScope, SortEnum
 
 service_appname_slug = slugify(settings.APP_NAME)
 
 role_router = APIRouter(prefix="/roles", tags=["ROLES"], redirect_slashes=False)
 
+RolePage = customize_page(Role)
+MembersPage = customize_page(UserReadModel)
+
+role_serializer = JSONSerializer(Role)
+role_page_serializer = JSONSerializer(RolePage)
+members_page_serializer = JSONSerializer(MembersPage)
+login_rollups_serializer = JSONSerializer(LoginRollupSeries)
+
 
 @role_router.post(
     "/_create",
@@ -59,7 +70,7 @@ async def create_role(request: Request, bg: BackgroundTasks, payload: RoleModel
 
 @role_router.get(
     "",
-    response_model=customize_page(Role),
+    response_model=RolePage,
     dependencies=(
         [
             Depends(AuthorizedHTTPBearer),
@@ -74,14 +85,73 @@ async def create_role(request: Request, bg: BackgroundTasks, payload: RoleModel
 async def listing_roles(
     query: Optional[str] = Query(None, description="Filter by role"),
     sorting: Optional[SortEnum] = Query(SortEnum.DESC, description="Order by creation date: 'asc' or 'desc"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. '_id,name,slug'"),
+    include_total: bool = Query(True, description="Compute the total number of items, disable to skip the count"),
 ):
+    fieldset = roles.role_fieldset(fields)
     search = {}
     if query:
         search["$text"] = {"$search": query}
 
     sorted = DESCENDING if sorting == SortEnum.DESC else ASCENDING
-    roles = Role.find(search, sort=[("created_at", sorted)])
-    return await paginate(roles)
+    page = await paginate_collection(
+        Role.get_motor_collection(),
+        search,
+        construct_items(Role),
+        sort=[("created_at", sorted)],
+        projection=fieldset.projection,
+        include_total=include_total,
+    )
+    return role_page_serializer.response(page, include=fieldset.page_include(RolePage.model_fields))
+
+
+@role_router.post(
+    "/_bulk-delete",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-delete-role"})),
+    ],
+    response_model=BulkResult,
+    summary="Delete many roles",
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_delete_roles(request: Request, bg: BackgroundTasks, ids: List[PydanticObjectId] = Body(..., embed=True)):
+    deleted = await roles.delete_many_roles(role_ids=ids)
+    await asyncio.gather(
+        delete_custom_key(custom_key_prefix=settings.APP_NAME + "access"),
+        delete_custom_key(custom_key_prefix=settings.APP_NAME + "validate"),
+    )
+
+    if settings.USE_TRACK_ACTIVITY_LOGS:
+        await send_event(
+            request=request,
+            bg=bg,
+            oauth_url=API_VERIFY_ACCESS_TOKEN_ENDPOINT,
+            trailhub_url=API_TRAILHUB_ENDPOINT,
+            source=settings.APP_NAME.lower(),
+            message=f" has deleted {deleted} roles",
+            user_id=None,
+        )
+    return BulkResult(action="delete", matched=deleted, modified=deleted)
+
+
+@role_router.get(
+    "/_by-permission",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-display-role"})),
+    ],
+    response_model=RolePage,
+    summary="Get the roles granting a permission",
+    status_code=status.HTTP_200_OK,
+)
+async def listing_roles_by_permission(
+    code: str = Query(..., description="Permission code, e.g. 'auth:can-delete-user'"),
+    sorting: Optional[SortEnum] = Query(SortEnum.DESC, description="Order by creation date: 'asc' or 'desc"),
+    include_total: bool = Query(True, description="Compute the total number of items, disable to skip the count"),
+):
+    page = await roles.get_roles_for_permission(code=code, sorting=sorting, include_total=include_total)
+    return role_page_serializer.response(page)
 
 
 @role_router.get(
@@ -93,8 +163,20 @@ async def listing_roles(
     summary="Get one roles",
     status_code=status.HTTP_200_OK,
 )
-async def ger_role(id: PydanticObjectId):
-    return await roles.get_one_role(role_id=PydanticObjectId(id))
+async def ger_role(
+    request: Request,
+    id: PydanticObjectId,
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. '_id,name,slug'"),
+):
+    fieldset = roles.role_fieldset(fields)
+    if etag_matches(request, etag := await roles.get_role_etag(role_id=PydanticObjectId(id), fields=fields)):
+        return not_modified(etag)
+
+    if fieldset.include is not None:
+        role = await roles.get_one_role_fields(role_id=PydanticObjectId(id), fieldset=fieldset)
+    else:
+        role = await roles.get_one_role(role_id=PydanticObjectId(id))
+    return with_etag(role_serializer.response(role, include=fieldset.include), etag)
 
 
 @role_router.put(
@@ -153,15 +235,37 @@ if bool(enable_endpoint.SHOW_MEMBERS_IN_ROLE_ENDPOINT):
             Depends(AuthorizedHTTPBearer),
             Depends(CheckPermissionsHandler(required_permissions={"auth:can-display-role"})),
         ],
-        response_model=customize_page(dict),
+        response_model=MembersPage,
         summary="Get role members",
         status_code=status.HTTP_200_OK,
     )
     async def get_role_members(
         name: str,
         sorting: Optional[SortEnum] = Query(SortEnum.DESC, description="Order by creation date: 'asc' or 'desc"),
+        include_total: bool = Query(True, description="Compute the total number of items, disable to skip the count"),
     ):
-        return await roles.get_users_for_role(name=name, sorting=sorting)
+        page = await roles.get_users_for_role(name=name, sorting=sorting, include_total=include_total)
+        return members_page_serializer.response(page)
+
+
+@role_router.get(
+    "/{id}/logins",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-display-role"})),
+    ],
+    response_model=LoginRollupSeries,
+    summary="Login counts of role members per hour or day",
+    status_code=status.HTTP_200_OK,
+)
+async def get_role_logins(
+    id: PydanticObjectId,
+    period: AuditPeriod = Query(AuditPeriod.HOUR, description="Bucket size: 'hour' or 'day'"),
+    since: Optional[datetime] = Query(None, description="Start of the window, defaults to 24 hours or 30 days ago"),
+    until: Optional[datetime] = Query(None, description="End of the window, defaults to now"),
+):
+    series = await audit.get_login_rollups(AuditScope.ROLE, PydanticObjectId(id), period, since=since, until=until)
+    return login_rollups_serializer.response(series)
 
 
 @role_router.patch(
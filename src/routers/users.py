@@ -1,22 +1,53 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
 from beanie import PydanticObjectId
 from fastapi import APIRouter, BackgroundTasks, Body, Depends, Query, Request, status
-from fastapi_pagination.async_paginator import paginate
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pymongo import ASCENDING, DESCENDING
 
 from src.common.helpers.pagination import customize_page
 from src.common.services.trailhub_client import send_event
 from src.config import settings
 from src.middleware import AuthorizedHTTPBearer, CheckPermissionsHandler, CheckUserAccessHandler
-from src.models import User, UserOut
-from src.schemas import CreateUser, UpdatePassword, UpdateUser
-from src.services import roles, users
+from src.models import User, USER_HIDDEN_FIELDS, UserOut
+from src.schemas import (
+    BulkResult,
+    CreateUser,
+    LoginRollupSeries,
+    UpdatePassword,
+    UpdateUser,
+    USER_READ_PROJECTION,
+    UserBatchQuery,
+    UserBulkTarget,
+    UserBulkUpdate,
+    UserChangesPage,
+    UserImportReport,
+    UserReadModel,
+    UserStats,
+)
+from src.services import archive, audit, roles, stats, users
 from src.shared import API_TRAILHUB_ENDPOINT, API_VERIFY_ACCESS_TOKEN_ENDPOINT
-from src.shared.utils import AccountAction, SortEnum
+from src.shared.pagination import CountStrategy, paginate_collection
+from src.shared.etag import etag_matches, not_modified, with_etag
+from src.shared.bulk_import import aiter_rows
+from src.shared.export import MEDIA_TYPES
+from src.shared.serialization import JSONSerializer
+from src.shared.utils import AccountAction, AuditPeriod, AuditScope, ExportFormat, SortEnum
 
 user_router = APIRouter(prefix="/users", tags=["USERS"], redirect_slashes=False)
 
+UserPage = customize_page(UserReadModel)
+
+user_serializer = JSONSerializer(User, exclude=USER_HIDDEN_FIELDS)
+user_out_serializer = JSONSerializer(UserOut, exclude=USER_HIDDEN_FIELDS)
+user_read_serializer = JSONSerializer(UserReadModel)
+user_page_serializer = JSONSerializer(UserPage)
+user_changes_serializer = JSONSerializer(UserChangesPage)
+user_import_serializer = JSONSerializer(UserImportReport)
+user_stats_serializer = JSONSerializer(UserStats)
+login_rollups_serializer = JSONSerializer(LoginRollupSeries)
+
 
 @user_router.post(
     "",
@@ -29,14 +60,12 @@ user_router = APIRouter(prefix="/users", tags=["USERS"], redirect_slashes=False)
         else []
     ),
     response_model=User,
-    response_model_exclude={"password", "is_primary"},
     status_code=status.HTTP_201_CREATED,
     summary="Create new user",
 )
 @user_router.post(
     "/add",
     response_model=User,
-    response_model_exclude={"password", "is_primary"},
     status_code=status.HTTP_201_CREATED,
     summary="Add new user",
     include_in_schema=False,
@@ -54,7 +83,7 @@ async def create_user(request: Request, bg: BackgroundTasks, payload: CreateUser
                 message=f" has created a new user with the email '{payload.email}'",
                 user_id=None,
             )
-        return result
+        return user_serializer.response(result, status_code=status.HTTP_201_CREATED)
     else:
         result = await users.create_user(payload)
         if settings.USE_TRACK_ACTIVITY_LOGS:
@@ -67,7 +96,7 @@ async def create_user(request: Request, bg: BackgroundTasks, payload: CreateUser
                 message=f" has created a new user with the email '{payload.email}'",
                 user_id=None,
             )
-        return result
+        return user_serializer.response(result, status_code=status.HTTP_201_CREATED)
 
 
 @user_router.get(
@@ -76,15 +105,13 @@ async def create_user(request: Request, bg: BackgroundTasks, payload: CreateUser
         Depends(AuthorizedHTTPBearer),
         Depends(CheckPermissionsHandler(required_permissions={"auth:can-display-user"})),
     ],
-    response_model=customize_page(UserOut),
-    response_model_exclude={"password", "is_primary", "attributes.otp_secret", "attributes.otp_created_at"},
+    response_model=UserPage,
     summary="Get all users",
     status_code=status.HTTP_200_OK,
 )
 @user_router.get(
     "/_read",
-    response_model=customize_page(UserOut),
-    response_model_exclude={"password", "is_primary", "attributes.otp_secret", "attributes.otp_created_at"},
+    response_model=UserPage,
     summary="Get all users (internal)",
     status_code=status.HTTP_200_OK,
     include_in_schema=False,
@@ -94,53 +121,196 @@ async def listing_users(
     # is_primary: bool = Query(default=False, description="Filter grant super admin"),
     is_active: Optional[bool] = Query(default=None, alias="active", description="Filter account is active or disable"),
     sorting: Optional[SortEnum] = Query(SortEnum.DESC, alias="sort", description="Order by creation date: 'asc' or 'desc"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. '_id,fullname,role_info'"),
+    include_total: bool = Query(True, description="Compute the total number of items, disable to skip the count"),
+    filters: Optional[List[str]] = Query(
+        None,
+        alias="filter",
+        description="Repeatable 'field:operator:value' filter, e.g. 'role:eq:<id>', 'created_at:gte:2024-01-01',"
+        " 'attributes.city:eq:Abidjan' (operators: eq, in with '|' separated values, gt, gte, lt, lte)",
+    ),
+    order_by: Optional[str] = Query(
+        None, description="Comma separated sort fields, '-' prefix for descending, e.g. '-last_login'. Overrides 'sort'"
+    ),
 ):
-    # search = {"is_primary": is_primary}
-    search = {}
-    if is_active:
-        search.update({"is_active": is_active, "is_primary": False})
-    if query:
-        search["$or"] = [
-            {"email": {"$regex": query, "$options": "i"}},
-            {"fullname": {"$regex": query, "$options": "i"}},
-            {
-                "$expr": {
-                    "$gt": [
-                        {
-                            "$indexOfArray": [
-                                {
-                                    "$map": {
-                                        "input": {"$objectToArray": "$attributes"},
-                                        "as": "attr",
-                                        "in": {"$toLower": "$$attr.v"},
-                                    }
-                                },
-                                {"$toLower": query},
-                            ]
-                        },
-                        -1,
-                    ]
-                }
-            },
-        ]
+    fieldset = users.user_fieldset(fields)
+    sorted = DESCENDING if sorting == SortEnum.DESC else ASCENDING
+    compiled = users.users_listing_query(query, is_active, filters, order_by, sort=sorted)
 
+    page = await paginate_collection(
+        User.get_motor_collection(),
+        compiled.filter,
+        users.user_read_models_transformer(fieldset),
+        sort=compiled.sort,
+        projection=fieldset.projection or USER_READ_PROJECTION,
+        include_total=include_total,
+        # Le filtre exclut toujours l'utilisateur principal : le total estimé de la collection le compterait
+        count_strategy=CountStrategy.CACHED,
+    )
+    return user_page_serializer.response(page, include=fieldset.page_include(UserPage.model_fields))
+
+
+@user_router.get(
+    "/_export",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-display-user"})),
+    ],
+    summary="Export users as NDJSON or CSV",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def export_users(
+    query: Optional[str] = Query(None, description="Filter by user"),
+    is_active: Optional[bool] = Query(default=None, alias="active", description="Filter account is active or disable"),
+    sorting: Optional[SortEnum] = Query(SortEnum.ASC, alias="sort", description="Order by creation date: 'asc' or 'desc"),
+    filters: Optional[List[str]] = Query(None, alias="filter", description="Same filters as the users listing"),
+    order_by: Optional[str] = Query(None, description="Same sort as the users listing"),
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="Export format: 'ndjson' or 'csv'"),
+    batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=10000, description="Documents read per cursor batch"),
+):
     sorted = DESCENDING if sorting == SortEnum.DESC else ASCENDING
-    users_list = await User.find(search, sort=[("created_at", sorted)]).to_list()
-    users_output = []
-    for user in users_list:
-        if user.is_primary is False:
-            role_data = await roles.get_one_role(role_id=user.role)
-            users_output.append(
-                UserOut(
-                    **user.model_dump(
-                        by_alias=True,
-                        mode="json",
-                        exclude={"password", "is_primary", "attributes.otp_secret", "attributes.otp_created_at"},
-                    ),
-                    extras={"role_info": {"name": role_data.name, "slug": role_data.slug} if role_data else None},
-                )
-            )
-    return await paginate(users_output)
+    compiled = users.users_listing_query(query, is_active, filters, order_by, sort=sorted)
+    return StreamingResponse(
+        users.export_users(compiled.filter, export_format, batch_size, sort=compiled.sort),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="users.{export_format}"'},
+    )
+
+
+@user_router.post(
+    "/_import",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-create-user"})),
+    ],
+    response_model=UserImportReport,
+    summary="Import users from NDJSON or CSV",
+    status_code=status.HTTP_200_OK,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}, "text/csv": {"schema": {"type": "string"}}}
+        }
+    },
+)
+async def import_users(
+    request: Request,
+    import_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="Body format: 'ndjson' or 'csv'"),
+    batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=10000, description="Rows inserted per batch"),
+):
+    # Le corps est lu au fil de l'eau : seul le lot en cours est gardé en mémoire
+    report = await users.import_users(aiter_rows(request.stream(), import_format), batch_size=batch_size)
+    return user_import_serializer.response(report)
+
+
+@user_router.patch(
+    "/_bulk",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-update-user"})),
+    ],
+    response_model=BulkResult,
+    summary="Activate, deactivate or reassign the role of many users",
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_update_users(request: Request, bg: BackgroundTasks, payload: UserBulkUpdate = Body(...)):
+    result = await users.bulk_update_users(payload)
+    if settings.USE_TRACK_ACTIVITY_LOGS:
+        await send_event(
+            request=request,
+            bg=bg,
+            oauth_url=API_VERIFY_ACCESS_TOKEN_ENDPOINT,
+            trailhub_url=API_TRAILHUB_ENDPOINT,
+            source=settings.APP_NAME.lower(),
+            message=f" has applied '{payload.action}' to {result.modified} users",
+            user_id=None,
+        )
+    return result
+
+
+@user_router.post(
+    "/_bulk-delete",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-delete-user"})),
+    ],
+    response_model=BulkResult,
+    summary="Delete many users",
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_delete_users(request: Request, bg: BackgroundTasks, payload: UserBulkTarget = Body(...)):
+    result = await users.bulk_delete_users(payload)
+    if settings.USE_TRACK_ACTIVITY_LOGS:
+        await send_event(
+            request=request,
+            bg=bg,
+            oauth_url=API_VERIFY_ACCESS_TOKEN_ENDPOINT,
+            trailhub_url=API_TRAILHUB_ENDPOINT,
+            source=settings.APP_NAME.lower(),
+            message=f" has deleted {result.modified} users",
+            user_id=None,
+        )
+    return result
+
+
+@user_router.get(
+    "/_by-permission",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-display-user"})),
+    ],
+    response_model=UserPage,
+    summary="Get the users whose role grants a permission",
+    status_code=status.HTTP_200_OK,
+)
+async def listing_users_by_permission(
+    code: str = Query(..., description="Permission code, e.g. 'auth:can-delete-user'"),
+    sorting: Optional[SortEnum] = Query(SortEnum.DESC, alias="sort", description="Order by creation date: 'asc' or 'desc"),
+    include_total: bool = Query(True, description="Compute the total number of items, disable to skip the count"),
+):
+    page = await roles.get_users_for_permission(code=code, sorting=sorting, include_total=include_total)
+    return user_page_serializer.response(page)
+
+
+@user_router.get(
+    "/_stats",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-display-user"})),
+    ],
+    response_model=UserStats,
+    summary="User counts per role and account state",
+    status_code=status.HTTP_200_OK,
+)
+async def users_stats():
+    return user_stats_serializer.response(await stats.get_user_stats())
+
+
+@user_router.get(
+    "/_changes",
+    response_model=UserChangesPage,
+    summary="Users change feed (internal)",
+    status_code=status.HTTP_200_OK,
+    include_in_schema=False,
+)
+async def users_changes(
+    since: Optional[str] = Query(None, description="Cursor returned by the previous call, omit to start from the beginning"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of changes to return"),
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for a change when there is none"),
+):
+    result = await users.get_user_changes(since=since, limit=limit, wait=wait)
+    return user_changes_serializer.response(result)
+
+
+@user_router.post(
+    "/_batch",
+    summary="Get many users by id (internal)",
+    status_code=status.HTTP_200_OK,
+    include_in_schema=False,
+)
+async def batch_users(payload: UserBatchQuery = Body(...)):
+    result = await users.get_users_by_ids(user_ids=payload.ids, fields=payload.fields)
+    return ORJSONResponse(content=result, status_code=status.HTTP_200_OK)
 
 
 @user_router.get(
@@ -150,30 +320,36 @@ async def listing_users(
         Depends(AuthorizedHTTPBearer),
         Depends(CheckPermissionsHandler(required_permissions={"auth:can-display-user"})),
     ],
-    response_model_exclude={"password", "is_primary", "attributes.otp_secret", "attributes.otp_created_at"},
     summary="Get single user",
     status_code=status.HTTP_200_OK,
 )
 @user_router.get(
     "/{id}/_read",
     response_model=UserOut,
-    response_model_exclude={"password", "is_primary", "attributes.otp_secret", "attributes.otp_created_at"},
     summary="Get single user (internal)",
     status_code=status.HTTP_200_OK,
     include_in_schema=False,
 )
-async def get_user(id: PydanticObjectId):
+async def get_user(
+    request: Request,
+    id: PydanticObjectId,
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. '_id,fullname,role_info'"),
+    archived: bool = Query(False, description="Read the user from the archive of long-deactivated accounts"),
+):
+    fieldset = users.user_fieldset(fields)
+    if archived:
+        user_data = await archive.get_archived_user(user_id=PydanticObjectId(id))
+        return user_read_serializer.response(user_data, include=fieldset.include)
+
+    if etag_matches(request, etag := await users.get_user_etag(user_id=PydanticObjectId(id), fields=fields)):
+        return not_modified(etag)
+
+    if fieldset.include is not None:
+        user_data = await users.get_one_user_fields(user_id=PydanticObjectId(id), fieldset=fieldset)
+        return with_etag(user_read_serializer.response(user_data, include=fieldset.include), etag)
+
     user_data = await users.get_one_user(user_id=PydanticObjectId(id))
-    role_data = await roles.get_one_role(role_id=user_data.role)
-    result = UserOut(
-        **user_data.model_dump(
-            by_alias=True,
-            mode="json",
-            exclude={"password", "is_primary", "attributes.otp_secret", "attributes.otp_created_at"},
-        ),
-        extras={"role_info": {"name": role_data.name, "slug": role_data.slug} if role_data else None},
-    )
-    return result
+    return with_etag(user_out_serializer.response(users.to_user_out(user_data)), etag)
 
 
 @user_router.get(
@@ -191,6 +367,26 @@ async def get_user_attributes(id: PydanticObjectId):
     return user_data.attributes
 
 
+@user_router.get(
+    "/{id}/logins",
+    dependencies=[
+        Depends(AuthorizedHTTPBearer),
+        Depends(CheckPermissionsHandler(required_permissions={"auth:can-display-user"})),
+    ],
+    response_model=LoginRollupSeries,
+    summary="Login counts of a user per hour or day",
+    status_code=status.HTTP_200_OK,
+)
+async def get_user_logins(
+    id: PydanticObjectId,
+    period: AuditPeriod = Query(AuditPeriod.HOUR, description="Bucket size: 'hour' or 'day'"),
+    since: Optional[datetime] = Query(None, description="Start of the window, defaults to 24 hours or 30 days ago"),
+    until: Optional[datetime] = Query(None, description="End of the window, defaults to now"),
+):
+    series = await audit.get_login_rollups(AuditScope.USER, PydanticObjectId(id), period, since=since, until=until)
+    return login_rollups_serializer.response(series)
+
+
 @user_router.patch(
     "/{id}",
     response_model=User,
@@ -199,7 +395,6 @@ async def get_user_attributes(id: PydanticObjectId):
         Depends(CheckUserAccessHandler(key="id")),
         Depends(CheckPermissionsHandler(required_permissions={"auth:can-update-user"})),
     ],
-    response_model_exclude={"password", "is_primary", "attributes.otp_secret", "attributes.otp_created_at"},
     summary="Update user information",
     status_code=status.HTTP_200_OK,
 )
@@ -216,7 +411,7 @@ async def update_user(request: Request, bg: BackgroundTasks, id: PydanticObjectI
             message=f" has updated the user information '{id}'",
             user_id=str(id),
         )
-    return result
+    return user_serializer.response(result)
 
 
 @user_router.put(
@@ -10,10 +10,33 @@ from .auth import (
     VerifyOTP,
 )
 from .mixins import FilterParams, SendEmailMessage, SendSmsMessage
-from .params import ParamsModel
-from .response import ResponseModelData
-from .roles import RoleModel
-from .users import CreateUser, PhonenumberModel, UpdateUser, UserBaseSchema
+from .params import PARAM_FIELDSET, ParamsModel
+from .response import BulkResult, ResponseModelData
+from .roles import ROLE_FIELDSET, RoleModel, RoleSummary
+from .users import (
+    CreateUser,
+    LoginRollupPoint,
+    LoginRollupSeries,
+    PhonenumberModel,
+    UpdateUser,
+    USER_FIELDSET,
+    USER_EXPORT_COLUMNS,
+    USER_FILTER_FIELDS,
+    USER_QUERY_INDEXES,
+    USER_READ_PROJECTION,
+    USER_SORTABLE,
+    UserBaseSchema,
+    UserBatchQuery,
+    UserBulkFilter,
+    UserBulkTarget,
+    UserBulkUpdate,
+    UserChangesPage,
+    UserImportError,
+    UserImportReport,
+    UserStats,
+    RoleUserStats,
+    UserReadModel,
+)
 
 __all__ = [
     "UserBaseSchema",
@@ -21,6 +44,24 @@ __all__ = [
     "PhonenumberModel",
     "CreateUser",
     "UpdateUser",
+    "UserReadModel",
+    "USER_EXPORT_COLUMNS",
+    "USER_FILTER_FIELDS",
+    "USER_QUERY_INDEXES",
+    "USER_READ_PROJECTION",
+    "USER_SORTABLE",
+    "USER_FIELDSET",
+    "UserBatchQuery",
+    "UserBulkFilter",
+    "UserBulkTarget",
+    "UserBulkUpdate",
+    "UserChangesPage",
+    "UserImportError",
+    "UserImportReport",
+    "UserStats",
+    "RoleUserStats",
+    "LoginRollupPoint",
+    "LoginRollupSeries",
     "VerifyOTP",
     "RefreshToken",
     "RequestChangePassword",
@@ -29,8 +70,12 @@ __all__ = [
     "ChangePassword",
     "UpdatePassword",
     "ResponseModelData",
+    "BulkResult",
     "RoleModel",
+    "RoleSummary",
     "ParamsModel",
+    "PARAM_FIELDSET",
+    "ROLE_FIELDSET",
     "FilterParams",
     "SendEmailMessage",
     "SendSmsMessage",
@@ -4,3 +4,14 @@ from pydantic import BaseModel, Field
 class ParamsModel(BaseModel):
     name: str = Field(..., description="Name of the parameter")
     type: str = Field(..., description="Type of the parameter")
+
+
+# Champs sélectionnables via ``fields`` : nom public -> (attribut du modèle, chemins MongoDB)
+PARAM_FIELDSET = {
+    "_id": ("id", ("_id",)),
+    "name": ("name", ("name",)),
+    "type": ("type", ("type",)),
+    "slug": ("slug", ("slug",)),
+    "created_at": ("created_at", ("created_at",)),
+    "updated_at": ("updated_at", ("updated_at",)),
+}
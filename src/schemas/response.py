@@ -1,6 +1,6 @@
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Optional, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 T = TypeVar("T", Any, BaseModel)
 
@@ -8,3 +8,9 @@ T = TypeVar("T", Any, BaseModel)
 class ResponseModelData(BaseModel, Generic[T]):
     message: str
     data: T
+
+
+class BulkResult(BaseModel):
+    action: Optional[str] = None
+    matched: int = Field(0, description="Documents selected by the operation")
+    modified: int = Field(0, description="Documents actually changed or deleted")
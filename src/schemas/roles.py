@@ -1,8 +1,43 @@
-from typing import Optional
+from typing import Any, Mapping, Optional
 
-from pydantic import BaseModel, StrictStr, Field
+from beanie import PydanticObjectId
+from pydantic import BaseModel, ConfigDict, StrictStr, Field
 
 
 class RoleModel(BaseModel):
     name: StrictStr = Field(..., description="Role name")
     description: Optional[StrictStr] = Field(None, description="Role description")
+
+
+# Champs sélectionnables via ``fields`` : nom public -> (attribut du modèle, chemins MongoDB)
+ROLE_FIELDSET = {
+    "_id": ("id", ("_id",)),
+    "name": ("name", ("name",)),
+    "slug": ("slug", ("slug",)),
+    "description": ("description", ("description",)),
+    "permissions": ("permissions", ("permissions",)),
+    "permission_codes": ("permission_codes", ("permission_codes",)),
+    "version": ("version", ("version",)),
+    "created_at": ("created_at", ("created_at",)),
+    "updated_at": ("updated_at", ("updated_at",)),
+}
+
+
+class RoleSummary(BaseModel):
+    """Subset of a role denormalized on user documents."""
+
+    id: PydanticObjectId = Field(..., alias="_id", description="Role ID")
+    name: str = Field(..., description="Role name")
+    slug: Optional[str] = Field(None, description="Role slug")
+    version: int = Field(1, description="Role revision the summary was copied from")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @classmethod
+    def from_document(cls, document: Mapping[str, Any]) -> "RoleSummary":
+        return cls.model_construct(
+            id=document["_id"],
+            name=document.get("name"),
+            slug=document.get("slug"),
+            version=document.get("version", 1),
+        )
@@ -1,13 +1,17 @@
 import re
-from typing import Any, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
 
 from beanie import PydanticObjectId
-from pydantic import BaseModel, EmailStr, Field, field_validator, StrictStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, StrictStr
 from slugify import slugify
 from starlette import status
 
 from src.common.helpers.exception import CustomHTTPException
 from src.shared.error_codes import UserErrorCode
+from src.shared.filters import EQUALITY_OPERATORS, FilterField, FilterOperator, RANGE_OPERATORS
+from src.shared.utils import AuditPeriod, AuditScope, UserBulkAction
+from .roles import RoleSummary
 
 
 class PhonenumberModel(BaseModel):
@@ -92,3 +96,182 @@ class UpdateUser(BaseModel):
             validated_attributes[slugified_key] = value
 
         return validated_attributes
+
+
+HIDDEN_ATTRIBUTES = frozenset({"otp_secret", "otp_created_at"})
+
+
+class UserReadModel(BaseModel):
+    """
+    Read-only view of a user for listings, role members and exports.
+
+    Instances are built with ``model_construct`` from raw documents already projected by the database
+    (see ``USER_READ_PROJECTION``), so no validation runs and no Beanie saved-state copy is kept per item.
+    """
+
+    id: PydanticObjectId = Field(..., alias="_id")
+    email: Optional[str] = None
+    phonenumber: Optional[str] = None
+    fullname: Optional[str] = None
+    role: Optional[PydanticObjectId] = None
+    # Source de ``extras.role_info``, jamais sérialisé tel quel
+    role_summary: Optional[RoleSummary] = Field(None, exclude=True)
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+    is_active: Optional[bool] = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    extras: Dict[str, Any] = Field(default_factory=dict)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @classmethod
+    def from_document(cls, document: Mapping[str, Any]) -> "UserReadModel":
+        summary = document.get("role_summary")
+        return cls.model_construct(
+            id=document["_id"],
+            email=document.get("email"),
+            phonenumber=document.get("phonenumber"),
+            fullname=document.get("fullname"),
+            role=document.get("role"),
+            role_summary=RoleSummary.from_document(summary) if summary else None,
+            attributes={
+                key: value for key, value in (document.get("attributes") or {}).items() if key not in HIDDEN_ATTRIBUTES
+            },
+            is_active=document.get("is_active", False),
+            created_at=document.get("created_at"),
+            updated_at=document.get("updated_at"),
+            extras={},
+        )
+
+
+# Champs jamais exposés en lecture : exclus directement par MongoDB
+USER_READ_PROJECTION = {
+    "password": 0,
+    "is_primary": 0,
+    "email_norm": 0,
+    "phone_norm": 0,
+    "revision_id": 0,
+    "pending_expires_at": 0,
+    "attributes.otp_secret": 0,
+    "attributes.otp_created_at": 0,
+}
+
+# Formes de requêtes servies par un index (clés dans l'ordre de l'index, toutes ascendantes)
+USER_QUERY_INDEXES = (
+    ("created_at",),
+    ("fullname",),
+    ("attributes.last_login",),
+    ("is_active", "created_at"),
+    ("is_active", "attributes.last_login"),
+    ("role", "created_at"),
+    ("role", "attributes.last_login"),
+    ("role", "is_active", "created_at"),
+    ("attributes.$**",),
+)
+
+# Champs filtrables via ``filter=champ:opérateur:valeur`` (``attributes.<clé>:eq:...`` via l'index wildcard)
+USER_FILTER_FIELDS = {
+    "role": FilterField("role", PydanticObjectId, EQUALITY_OPERATORS),
+    "is_active": FilterField("is_active", bool, frozenset({FilterOperator.EQ})),
+    "created_at": FilterField("created_at", datetime, RANGE_OPERATORS),
+    "last_login": FilterField("attributes.last_login", datetime, RANGE_OPERATORS),
+}
+
+USER_SORTABLE = {"created_at": "created_at", "last_login": "attributes.last_login", "fullname": "fullname"}
+
+# Colonnes des exports CSV (les exports NDJSON gardent le document projeté complet)
+USER_EXPORT_COLUMNS = ("_id", "email", "phonenumber", "fullname", "role", "is_active", "attributes", "created_at", "updated_at")
+
+# Champs sélectionnables via ``fields`` : nom public -> (attribut de UserReadModel, chemins MongoDB)
+USER_FIELDSET = {
+    "_id": ("id", ("_id",)),
+    "email": ("email", ("email",)),
+    "phonenumber": ("phonenumber", ("phonenumber",)),
+    "fullname": ("fullname", ("fullname",)),
+    "role": ("role", ("role",)),
+    "role_info": ("extras", ("role", "role_summary")),
+    "attributes": ("attributes", ("attributes",)),
+    "is_active": ("is_active", ("is_active",)),
+    "created_at": ("created_at", ("created_at",)),
+    "updated_at": ("updated_at", ("updated_at",)),
+}
+
+
+class UserBatchQuery(BaseModel):
+    ids: List[PydanticObjectId] = Field(..., min_length=1, description="Users to resolve")
+    fields: Optional[List[str]] = Field(default=None, examples=[["_id", "fullname", "role_info"]])
+
+
+class UserChangesPage(BaseModel):
+    """One page of the users change feed, ordered by ``(updated_at, _id)``."""
+
+    items: List[UserReadModel] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="Cursor to pass as ``since`` to get the following changes")
+    has_more: bool = Field(False, description="More changes are immediately available")
+
+
+class UserImportError(BaseModel):
+    row: int = Field(..., description="1-based position of the rejected row in the imported file")
+    error: str
+
+
+class UserImportReport(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[UserImportError] = Field(default_factory=list)
+    elapsed: float = Field(0, description="Import duration in seconds")
+    rows_per_second: float = 0
+
+
+class UserBulkFilter(BaseModel):
+    query: Optional[str] = Field(None, description="Same search as the users listing")
+    active: Optional[bool] = Field(None, description="Account state")
+    role: Optional[PydanticObjectId] = Field(None, description="Current role")
+
+
+class UserBulkTarget(BaseModel):
+    """Users targeted by a bulk operation: either explicit ``ids`` or a ``filter``, never both."""
+
+    ids: Optional[List[PydanticObjectId]] = Field(default=None, min_length=1)
+    filter: Optional[UserBulkFilter] = None
+
+
+class UserBulkUpdate(UserBulkTarget):
+    action: UserBulkAction
+    role: Optional[PydanticObjectId] = Field(None, description="New role, required by 'reassign-role'")
+
+
+class RoleUserStats(BaseModel):
+    role: Optional[PydanticObjectId] = None
+    role_summary: Optional[RoleSummary] = None
+    active: int = 0
+    inactive: int = 0
+    total: int = 0
+
+
+class UserStats(BaseModel):
+    """User counters per role and account state, read from the ``UserStat`` materialized view."""
+
+    active: int = 0
+    inactive: int = 0
+    total: int = 0
+    roles: List[RoleUserStats] = Field(default_factory=list)
+    updated_at: Optional[datetime] = None
+
+
+class LoginRollupPoint(BaseModel):
+    start: datetime
+    count: int = 0
+
+
+class LoginRollupSeries(BaseModel):
+    """Login counts of one user or role per hour or day, read from the ``LoginRollup`` pre-aggregates."""
+
+    scope: AuditScope
+    key: PydanticObjectId
+    period: AuditPeriod
+    since: datetime
+    until: datetime
+    total: int = 0
+    points: List[LoginRollupPoint] = Field(default_factory=list)
@@ -0,0 +1,81 @@
+import logging
+from datetime import datetime, UTC
+from typing import Any, Dict
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from src.config import settings
+from src.models import User
+from src.shared.write_behind import WriteBehindBuffer
+
+logging.basicConfig(format="%(message)s", level=logging.INFO)
+_log = logging.getLogger(__name__)
+
+
+class UserActivityBuffer(WriteBehindBuffer):
+    """
+    Write-behind buffer for non-critical login metadata (``last_login``, ``address_ip``).
+
+    Updates are coalesced in memory per user (last writer wins for each key) and flushed
+    periodically with a single unordered ``bulk_write``, keeping the write off the login path.
+    The buffer is local to the process: pending values are only visible to the worker that recorded them,
+    so values read by other workers, such as ``device_id``, must not go through it.
+
+    :param flush_interval: Number of seconds between two periodic flushes.
+    :type flush_interval: int
+    :param max_pending: Number of buffered users that triggers an early flush.
+    :type max_pending: int
+    """
+
+    def __init__(self, flush_interval: int, max_pending: int):
+        super().__init__("User activity flush", flush_interval, max_pending)
+        self._pending: Dict[PydanticObjectId, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, user_id: PydanticObjectId, **attributes: Any) -> None:
+        self._pending.setdefault(user_id, {}).update(attributes)
+        self._flush_if_full()
+
+    def pending(self, user_id: PydanticObjectId) -> Dict[str, Any]:
+        return dict(self._pending.get(user_id, {}))
+
+    def discard(self, user_id: PydanticObjectId, *keys: str) -> None:
+        if (attributes := self._pending.get(user_id)) is None:
+            return
+        for key in keys:
+            attributes.pop(key, None)
+        if not attributes:
+            self._pending.pop(user_id, None)
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        flushed_at = datetime.now(tz=UTC)
+        operations = [
+            UpdateOne(
+                {"_id": user_id},
+                {"$set": {"updated_at": flushed_at, **{f"attributes.{key}": value for key, value in attributes.items()}}},
+            )
+            for user_id, attributes in pending.items()
+        ]
+
+        try:
+            await User.get_motor_collection().bulk_write(operations, ordered=False)
+        except PyMongoError as exc:
+            _log.error(f"--> Failed to flush activity of {len(operations)} users: {exc}")
+            for user_id, attributes in pending.items():
+                self._pending[user_id] = {**attributes, **self._pending.get(user_id, {})}
+            return 0
+        return len(operations)
+
+
+activity_buffer = UserActivityBuffer(
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL,
+    max_pending=settings.ACTIVITY_BUFFER_MAX_SIZE,
+)
@@ -0,0 +1,111 @@
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, UTC
+from typing import Optional
+
+from beanie import PydanticObjectId
+from pymongo import ReplaceOne
+from pymongo.errors import DuplicateKeyError
+from starlette import status
+
+from src.common.helpers.exception import CustomHTTPException
+from src.config import settings
+from src.models import User, UserArchive
+from src.schemas import USER_READ_PROJECTION, UserReadModel
+from src.shared.error_codes import UserErrorCode
+from src.shared.identity_map import identity_map
+from src.shared.periodic import PeriodicTask
+from . import stats
+
+logging.basicConfig(format="%(message)s", level=logging.INFO)
+_log = logging.getLogger(__name__)
+
+
+def archivable_users_filter(older_than: timedelta) -> dict:
+    """Deactivated users untouched for ``older_than``; pending signups are left to their TTL index."""
+
+    return {
+        "is_active": False,
+        "is_primary": {"$ne": True},
+        "pending_expires_at": None,
+        "updated_at": {"$lt": datetime.now(tz=UTC) - older_than},
+    }
+
+
+async def archive_inactive_users(
+    older_than: Optional[timedelta] = None, batch_size: int = settings.USER_ARCHIVE_BATCH_SIZE
+) -> int:
+    """
+    Move long-deactivated users from ``User`` to ``UserArchive``, ``batch_size`` documents at a time.
+
+    Each batch is first copied (idempotent upserts by ``_id``) then deleted from ``User`` only if the user
+    is still inactive, so a crash or a concurrent reactivation never loses a user.
+    """
+    older_than = older_than or timedelta(days=settings.USER_ARCHIVE_AFTER_DAYS)
+    users, archive = User.get_motor_collection(), UserArchive.get_motor_collection()
+    selector, archived = archivable_users_filter(older_than), 0
+
+    while documents := await users.find(selector, limit=batch_size).to_list(length=None):
+        archived_at = datetime.now(tz=UTC)
+        await archive.bulk_write(
+            [ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": archived_at}, upsert=True) for doc in documents],
+            ordered=False,
+        )
+        ids = [doc["_id"] for doc in documents]
+        result = await users.delete_many({"_id": {"$in": ids}, "is_active": False})
+
+        if result.deleted_count != len(ids):
+            # Réactivés entre la copie et la suppression : la copie archivée est retirée
+            kept = {doc["_id"] async for doc in users.find({"_id": {"$in": ids}}, projection={"_id": 1})}
+            await archive.delete_many({"_id": {"$in": list(kept)}})
+            documents = [doc for doc in documents if doc["_id"] not in kept]
+
+        removed = Counter((doc.get("role"), False) for doc in documents)
+        await stats.apply_deltas({key: -count for key, count in removed.items()})
+        archived += result.deleted_count
+
+    if archived:
+        identity_map.evict(User)
+        _log.info(f"--> {archived} deactivated users archived")
+    return archived
+
+
+async def get_archived_user(user_id: PydanticObjectId) -> UserReadModel:
+    """Read an archived user; the archive is only queried when a caller asks for it explicitly."""
+
+    archive = UserArchive.get_motor_collection()
+    if (document := await archive.find_one({"_id": user_id}, projection=USER_READ_PROJECTION)) is None:
+        raise CustomHTTPException(
+            code_error=UserErrorCode.USER_NOT_FOUND,
+            message_error=f"Archived user with '{user_id}' not found.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    return UserReadModel.from_document(document)
+
+
+async def restore_user(user_id: PydanticObjectId) -> bool:
+    """
+    Move an archived user back to ``User``, still deactivated; ``False`` when it is not archived.
+
+    :raises CustomHTTPException: If its email or phone number has been taken by another user since.
+    """
+    archive = UserArchive.get_motor_collection()
+    if (document := await archive.find_one({"_id": user_id})) is None:
+        return False
+
+    document.pop("archived_at", None)
+    try:
+        await User.get_motor_collection().insert_one(document)
+    except DuplicateKeyError as exc:
+        raise CustomHTTPException(
+            code_error=UserErrorCode.USER_EMAIL_ALREADY_EXIST,
+            message_error=f"User '{user_id}' cannot be restored: its email or phone number is used by another account.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        ) from exc
+
+    await archive.delete_one({"_id": user_id})
+    await stats.record_created(document.get("role"), bool(document.get("is_active")))
+    return True
+
+
+user_archiver = PeriodicTask("User archiving", settings.USER_ARCHIVE_INTERVAL, archive_inactive_users)
@@ -0,0 +1,193 @@
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+from starlette import status
+
+from src.common.helpers.exception import CustomHTTPException
+from src.config import settings
+from src.models import LoginEvent, LoginRollup
+from src.schemas import LoginRollupPoint, LoginRollupSeries
+from src.shared.error_codes import UserErrorCode
+from src.shared.utils import AuditPeriod, AuditScope
+from src.shared.write_behind import WriteBehindBuffer
+
+logging.basicConfig(format="%(message)s", level=logging.INFO)
+_log = logging.getLogger(__name__)
+
+# Fenêtre renvoyée quand ``since`` n'est pas fourni
+DEFAULT_WINDOWS = {AuditPeriod.HOUR: timedelta(hours=24), AuditPeriod.DAY: timedelta(days=30)}
+
+# (portée, identifiant, granularité, début du créneau) : clé d'un document LoginRollup
+RollupKey = Tuple[AuditScope, PydanticObjectId, AuditPeriod, datetime]
+
+# Codes d'erreur d'écriture passagers (réseau, bascule du primaire, arrêt) : l'événement est retenté
+RETRYABLE_WRITE_ERRORS = frozenset({6, 7, 89, 91, 189, 262, 9001, 10107, 11600, 11602, 13435, 13436})
+
+
+def bucket_start(moment: datetime, period: AuditPeriod) -> datetime:
+    moment = moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if period == AuditPeriod.DAY else moment
+
+
+def rollup_deltas(events: Iterable[Dict[str, Any]]) -> Counter:
+    """Number of logins per user and per role, for every hour and day bucket touched by ``events``."""
+
+    deltas: Counter = Counter()
+    for event in events:
+        keys = [(AuditScope.USER, event["meta"]["user"])]
+        if (role := event["meta"].get("role")) is not None:
+            keys.append((AuditScope.ROLE, role))
+        for period in AuditPeriod:
+            start = bucket_start(event["timestamp"], period)
+            deltas.update((scope, key, period, start) for scope, key in keys)
+    return deltas
+
+
+async def apply_rollups(deltas: Counter) -> Counter:
+    """
+    Add ``deltas`` to the rollups with ``$inc`` upserts in a single unordered ``bulk_write``.
+
+    Returns the deltas that were not applied, to be retried by the caller: only the rejected operations
+    on a partial failure, all of them when the write failed as a whole.
+    """
+    items = [(key, count) for key, count in deltas.items() if count]
+    operations = [
+        UpdateOne({"scope": scope, "key": key, "period": period, "start": start}, {"$inc": {"count": count}}, upsert=True)
+        for (scope, key, period, start), count in items
+    ]
+    if not operations:
+        return Counter()
+    try:
+        await LoginRollup.get_motor_collection().bulk_write(operations, ordered=False)
+    except BulkWriteError as exc:
+        failed = {error["index"] for error in exc.details.get("writeErrors", [])}
+        _log.error(f"--> Failed to update {len(failed)}/{len(operations)} login rollups: {exc}")
+        return Counter({key: count for index, (key, count) in enumerate(items) if index in failed})
+    except PyMongoError as exc:
+        _log.error(f"--> Failed to update {len(operations)} login rollups: {exc}")
+        return Counter(dict(items))
+    return Counter()
+
+
+class LoginAuditBuffer(WriteBehindBuffer):
+    """
+    Write-behind buffer of login events.
+
+    Events are kept in memory and flushed periodically with one unordered ``insert_many`` into the
+    ``LoginEvent`` time-series collection, followed by the ``LoginRollup`` increments of the inserted events.
+    Events still in the buffer are not visible in the rollups yet.
+
+    Events rejected with a transient error are retried on the next flush, the others are dropped. Rollup
+    increments that could not be written are kept and retried on the next flush as well.
+
+    :param flush_interval: Number of seconds between two periodic flushes.
+    :type flush_interval: int
+    :param max_pending: Number of buffered events that triggers an early flush.
+    :type max_pending: int
+    """
+
+    def __init__(self, flush_interval: int, max_pending: int):
+        super().__init__("Login audit flush", flush_interval, max_pending)
+        self._pending: List[Dict[str, Any]] = []
+        self._rollup_backlog: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(
+        self,
+        user_id: PydanticObjectId,
+        role: Optional[PydanticObjectId],
+        timestamp: datetime,
+        address_ip: Optional[str] = None,
+        device_id: Optional[str] = None,
+    ) -> None:
+        self._pending.append(
+            {
+                "timestamp": timestamp,
+                "meta": {"user": user_id, "role": role},
+                "address_ip": address_ip,
+                "device_id": device_id,
+            }
+        )
+        self._flush_if_full()
+
+    async def flush(self) -> int:
+        if not self._pending and not self._rollup_backlog:
+            return 0
+
+        pending, self._pending = self._pending, []
+        inserted = await self._insert(pending) if pending else []
+        deltas, self._rollup_backlog = self._rollup_backlog + rollup_deltas(inserted), Counter()
+        self._rollup_backlog.update(await apply_rollups(deltas))
+        return len(inserted)
+
+    async def _insert(self, pending: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert ``pending`` and return the inserted events; the events to retry go back in the buffer."""
+
+        try:
+            # insert_many ajoute un _id à chaque dict : on insère des copies pour pouvoir les remettre en file
+            await LoginEvent.get_motor_collection().insert_many([dict(event) for event in pending], ordered=False)
+        except BulkWriteError as exc:
+            # Insertion partielle : les autres événements sont déjà écrits et ne doivent pas être renvoyés
+            errors = {error["index"]: error.get("code") for error in exc.details.get("writeErrors", [])}
+            retried = [event for index, event in enumerate(pending) if errors.get(index) in RETRYABLE_WRITE_ERRORS]
+            _log.error(f"--> {len(errors)}/{len(pending)} login events rejected, {len(errors) - len(retried)} dropped: {exc}")
+            self._pending = retried + self._pending
+            return [event for index, event in enumerate(pending) if index not in errors]
+        except PyMongoError as exc:
+            _log.error(f"--> Failed to flush {len(pending)} login events: {exc}")
+            self._pending = pending + self._pending
+            return []
+        return pending
+
+
+login_audit = LoginAuditBuffer(
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL,
+    max_pending=settings.ACTIVITY_BUFFER_MAX_SIZE,
+)
+
+
+async def get_login_rollups(
+    scope: AuditScope,
+    key: PydanticObjectId,
+    period: AuditPeriod,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> LoginRollupSeries:
+    """
+    Login counts of one user or role between ``since`` and ``until``, one point per non empty bucket.
+
+    Only ``LoginRollup`` is read, through its unique (scope, key, period, start) index; raw events are never scanned.
+
+    :raises CustomHTTPException: If ``since`` is not before ``until``.
+    """
+    until = until.astimezone(UTC) if until else datetime.now(tz=UTC)
+    since = bucket_start(since if since else until - DEFAULT_WINDOWS[period], period)
+    if since >= until:
+        raise CustomHTTPException(
+            code_error=UserErrorCode.USER_INVALID_AUDIT_RANGE,
+            message_error="'since' must be before 'until'.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    cursor = LoginRollup.get_motor_collection().find(
+        {"scope": scope, "key": key, "period": period, "start": {"$gte": since, "$lt": until}},
+        projection={"_id": 0, "start": 1, "count": 1},
+        sort=[("start", 1)],
+    )
+    points = [LoginRollupPoint(start=document["start"], count=document["count"]) async for document in cursor]
+    return LoginRollupSeries(
+        scope=scope,
+        key=key,
+        period=period,
+        since=since,
+        until=until,
+        total=sum(point.count for point in points),
+        points=points,
+    )
@@ -5,6 +5,7 @@ from typing import Optional
 from beanie import PydanticObjectId
 from fastapi import Request, status
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from getmac import get_mac_address
 from starlette.responses import JSONResponse
 
@@ -12,18 +13,16 @@ from src.common.helpers.caching import delete_custom_key
 from src.common.helpers.exception import CustomHTTPException
 from src.config import settings
 from src.middleware import CustomAccessBearer
-from src.models import User
+from src.models import User, USER_HIDDEN_FIELDS
 from src.schemas import ChangePassword, LoginUser
+from src.services.activity import activity_buffer
+from src.services.audit import login_audit
 from src.services.roles import get_one_role
-from src.services.users import get_one_user
+from src.services.users import find_user_by_identifier, get_one_user, patch_user_attributes
 from src.shared import blacklist_token
 from src.shared.error_codes import AuthErrorCode, UserErrorCode
-from src.shared.utils import password_hash, verify_password
-
-
-async def _find_user_by_identifier(identifier: str, is_email: bool) -> Optional[User]:
-    search_field = "email" if is_email else "phonenumber"
-    return await User.find_one({search_field: identifier})
+from src.shared.identity_map import identity_map
+from src.shared.utils import normalize_email, normalize_phonenumber, password_hash, verify_password
 
 
 async def _validate_user_status(user: User) -> None:
@@ -53,7 +52,7 @@ async def login(request: Request, payload: LoginUser) -> JSONResponse:
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    user = await _find_user_by_identifier(identifier, is_email)
+    user = await find_user_by_identifier(identifier, is_email)
     await _validate_user_status(user)
 
     if not verify_password(payload.password, user.password):
@@ -63,8 +62,6 @@ async def login(request: Request, payload: LoginUser) -> JSONResponse:
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    role = await get_one_role(role_id=PydanticObjectId(user.role))
-
     # Récupérer l'adresse IP et le device_id
     address_ip = request.client.host
     forwarded_for = request.headers.get("X-Forwarded-For")
@@ -77,45 +74,43 @@ async def login(request: Request, payload: LoginUser) -> JSONResponse:
         or get_mac_address(ip=address_ip, network_request=True)
     )
 
+    # Les métadonnées de connexion encore en mémoire sont plus récentes que celles en base
+    user.attributes = {**(user.attributes or {}), **activity_buffer.pending(user.id)}
+
     # Vérifier l'authentification unique par appareil
-    if (
-        hasattr(user, "attributes")
-        and user.attributes
-        and user.attributes.get("device_id")
-        and user.attributes.get("device_id") != device_id
-    ):
+    if user.attributes.get("device_id") and user.attributes.get("device_id") != device_id:
         raise CustomHTTPException(
             code_error=AuthErrorCode.AUTH_ALREADY_LOGGED_IN,
             message_error="You are already logged in on another device.",
             status_code=status.HTTP_401_UNAUTHORIZED,
         )
 
-    # Mettre à jour les informations de l'utilisateur
-    current_time = datetime.now(tz=UTC)
-    update_data = {"last_login": current_time, "address_ip": address_ip, "device_id": device_id}
-    existing_attributes = user.attributes if hasattr(user, "attributes") and user.attributes else {}
-    await user.set({"attributes": {**existing_attributes, **update_data}, "updated_at": current_time})
-
-    user_data = user.model_dump(
-        by_alias=True,
-        mode="json",
-        exclude={
-            "password",
-            "attributes.otp_secret",
-            "attributes.otp_created_at",
-            "is_primary",
-        },
-    )
-    user_data.update({"role": role.model_dump(by_alias=True, mode="json", exclude={"permissions", "created_at", "updated_at"})})
-
-    # Générer les tokens
+    if user.role_summary is not None:
+        role_data = user.role_summary.model_dump(by_alias=True, mode="json")
+    else:
+        role = await get_one_role(role_id=PydanticObjectId(user.role))
+        role_data = role.model_dump(by_alias=True, mode="json", exclude={"permissions", "created_at", "updated_at"})
+
+    # device_id est lu par tous les workers : écriture immédiate, le reste est différé hors du chemin de la requête
+    if user.attributes.get("device_id") != device_id:
+        await patch_user_attributes(user_id=user.id, set_attributes={"device_id": device_id})
+    update_data = {"last_login": datetime.now(tz=UTC), "address_ip": address_ip, "device_id": device_id}
+    activity_buffer.record(user.id, last_login=update_data["last_login"], address_ip=address_ip)
+    login_audit.record(user.id, user.role, update_data["last_login"], address_ip=address_ip, device_id=device_id)
+    user.attributes = {**user.attributes, **update_data}
+
+    # Exclusions imbriquées : pydantic v2 ignore les clés pointées ("attributes.otp_secret")
+    user_data = user.model_dump(by_alias=True, mode="json", exclude=USER_HIDDEN_FIELDS)
+    user_data.update({"role": role_data})
+
+    # Générer les tokens (user_data est déjà sérialisé en mode "json", inutile de repasser par jsonable_encoder)
     response_data = {
-        "access_token": CustomAccessBearer.access_token(data=jsonable_encoder(user_data), user_id=str(user.id)),
-        "refresh_token": CustomAccessBearer.refresh_token(data=jsonable_encoder(user_data), user_id=str(user.id)),
+        "access_token": CustomAccessBearer.access_token(data=user_data, user_id=str(user.id)),
+        "refresh_token": CustomAccessBearer.refresh_token(data=user_data, user_id=str(user.id)),
         "user": user_data,
     }
 
-    return JSONResponse(content=jsonable_encoder(response_data), status_code=status.HTTP_200_OK)
+    return ORJSONResponse(content=response_data, status_code=status.HTTP_200_OK)
 
 
 async def logout(request: Request) -> JSONResponse:
@@ -127,8 +122,7 @@ async def logout(request: Request) -> JSONResponse:
 
     decode_token = CustomAccessBearer.decode_access_token(token=token)
     user_id = decode_token.get("subject", {}).get("_id")
-    user = await get_one_user(user_id=PydanticObjectId(user_id))
-    await user.set({"attributes": {**user.attributes, "device_id": None}})
+    await patch_user_attributes(user_id=PydanticObjectId(user_id), unset_attributes=["device_id"])
 
     await blacklist_token.add_blacklist_token(token=token)
 
@@ -173,7 +167,8 @@ async def change_password(user_id: PydanticObjectId, payload: ChangePassword) ->
     user = await get_one_user(user_id=user_id)
 
     password = password_hash(password=payload.confirm_password)
-    await user.set({"password": password})
+    await user.set({"password": password, "updated_at": datetime.now(tz=UTC)})
+    identity_map.evict(User, user_id)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -197,6 +192,13 @@ async def validate_access_token(token: str) -> JSONResponse:
 
 
 async def check_user_attribute(key: str, value: str, in_attributes: Optional[bool] = False) -> JSONResponse:
-    query = {f"attributes.{key}": value} if in_attributes else {key: value}
+    if in_attributes:
+        query = {f"attributes.{key}": value}
+    elif key == "email":
+        query = {"email_norm": normalize_email(value)}
+    elif key == "phonenumber":
+        query = {"phone_norm": normalize_phonenumber(value)}
+    else:
+        query = {key: value}
     can = await User.find_one(query).exists()
     return JSONResponse(status_code=status.HTTP_200_OK, content={"exists": can})
@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, UTC
 from urllib.parse import urljoin
 
 from fastapi import BackgroundTasks, status
@@ -15,7 +15,8 @@ from src.schemas import (
     ChangePassword,
     UserBaseSchema,
 )
-from src.services.users import check_if_email_exist
+from src.services.roles import get_one_role
+from src.services.users import check_if_email_exist, find_user_by_identifier, insert_user
 from src.shared import mail_service
 from src.shared.error_codes import UserErrorCode
 from src.shared.utils import password_hash
@@ -25,7 +26,7 @@ template_env = Environment(loader=template_loader, autoescape=select_autoescape(
 
 
 async def request_password_reset_with_email(bg: BackgroundTasks, email: EmailStr) -> JSONResponse:
-    if (user := await User.find_one({"email": email})) is None:
+    if (user := await find_user_by_identifier(email, is_email=True)) is None:
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_NOT_FOUND,
             message_error=f"User with email '{email}' not found",
@@ -68,7 +69,7 @@ async def reset_password_completed_with_email(bg: BackgroundTasks, token: str, p
     decode_token = CustomAccessBearer.decode_access_token(token=token)
 
     check_user_email = decode_token.get("subject", {}).get("email")
-    if (user := await User.find_one({"email": check_user_email})) is None:
+    if (user := await find_user_by_identifier(check_user_email, is_email=True)) is None:
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_NOT_FOUND,
             message_error=f"User with email '{check_user_email}' not found",
@@ -76,7 +77,7 @@ async def reset_password_completed_with_email(bg: BackgroundTasks, token: str, p
         )
 
     password = password_hash(password=payload.confirm_password)
-    await user.set({"password": password})
+    await user.set({"password": password, "updated_at": datetime.now(tz=UTC)})
 
     login_link = settings.FRONTEND_URL + settings.FRONTEND_PATH_LOGIN
     template = template_env.get_template(name="reset_password_completed_with_email.html")
@@ -135,8 +136,9 @@ async def completed_register_with_email(token: str, payload: UserBaseSchema, bg:
 
     addr_email = decode_token.get("subject", {}).get("email")
 
+    role = await get_one_role(role_id=payload.role)
     user_data_dict = payload.model_copy(update={"password": password_hash(payload.password)})
-    new_user = await User(**user_data_dict.model_dump(), email=addr_email).create()
+    new_user = await insert_user(User(**user_data_dict.model_dump(), email=addr_email, role_summary=role.summary()))
 
     template = template_env.get_template(name="create_account_success.html")
     rendered_html = template.render(service_name=email_settings.SMTP_APP_NAME, login_link=settings.FRONTEND_PATH_LOGIN)
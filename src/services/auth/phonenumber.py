@@ -4,8 +4,10 @@ from secrets import compare_digest
 from fastapi import BackgroundTasks, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
+from pymongo import ReturnDocument
 
 from src.common.helpers.exception import CustomHTTPException
+from src.config import settings
 from src.models import User
 from src.schemas import (
     ChangePasswordWithOTPCode,
@@ -14,16 +16,19 @@ from src.schemas import (
     VerifyOTP,
 )
 from src.services.shared import send_otp
+from src.services import stats
+from src.services.users import find_user_by_identifier, insert_user
 from src.shared import otp_service
 from src.shared.error_codes import AuthErrorCode, UserErrorCode
-from src.shared.utils import password_hash
+from src.shared.identity_map import identity_map
+from src.shared.utils import normalize_phonenumber, password_hash
 from src.services import roles
 
 
 async def find_user_by_phonenumber(phonenumber: str):
-    phone = f"+{phonenumber}" if not phonenumber.startswith("+") else phonenumber
+    phone = normalize_phonenumber(phonenumber)
 
-    if (user := await User.find_one({"phonenumber": phone})) is None:
+    if (user := await find_user_by_identifier(phone, is_email=False)) is None:
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_NOT_FOUND,
             message_error=f"User with phone number {phone!r} not found",
@@ -56,7 +61,7 @@ async def request_password_reset_with_phonenumber(bg: BackgroundTasks, payload:
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    if (user := await User.find_one({"phonenumber": payload.phonenumber})) is None:
+    if (user := await find_user_by_identifier(payload.phonenumber, is_email=False)) is None:
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_NOT_FOUND,
             message_error=f"User with phone number '{payload.phonenumber}' not found",
@@ -72,7 +77,7 @@ async def request_password_reset_with_phonenumber(bg: BackgroundTasks, payload:
 
 
 async def reset_password_completed_with_phonenumber(payload: ChangePasswordWithOTPCode) -> JSONResponse:
-    if (user := await User.find_one({"phonenumber": payload.phonenumber})) is None:
+    if (user := await find_user_by_identifier(payload.phonenumber, is_email=False)) is None:
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_NOT_FOUND,
             message_error=f"User with phone number '{payload.phonenumber}' not found",
@@ -88,7 +93,7 @@ async def reset_password_completed_with_phonenumber(payload: ChangePasswordWithO
         )
 
     password = password_hash(password=payload.confirm_password)
-    await user.set({"password": password})
+    await user.set({"password": password, "updated_at": datetime.now(tz=timezone.utc)})
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content=jsonable_encoder({"message": "Your password has been successfully updated !"}),
@@ -98,7 +103,7 @@ async def reset_password_completed_with_phonenumber(payload: ChangePasswordWithO
 async def signup_with_phonenumber(bg: BackgroundTasks, payload: RequestChangePassword):
     STATUS_CODE_400 = status.HTTP_400_BAD_REQUEST
 
-    await roles.get_one_role(role_id=payload.role)
+    role = await roles.get_one_role(role_id=payload.role)
 
     if payload.phonenumber and compare_digest(payload.phonenumber, " "):
         raise CustomHTTPException(
@@ -114,24 +119,11 @@ async def signup_with_phonenumber(bg: BackgroundTasks, payload: RequestChangePas
             status_code=STATUS_CODE_400,
         )
 
-    if user := await User.find_one({"phonenumber": payload.phonenumber}):
-        if user.is_active:
-            raise CustomHTTPException(
-                code_error=UserErrorCode.USER_PHONENUMBER_TAKEN,
-                message_error=f"This phone number '{payload.phonenumber}' is already taken.",
-                status_code=STATUS_CODE_400,
-            )
-        else:
-            raise CustomHTTPException(
-                code_error=UserErrorCode.USER_ACCOUND_DESABLE,
-                message_error=f"User account with phone number '{payload.phonenumber}' is disabled."
-                f" Please request to activate the account.",
-                status_code=STATUS_CODE_400,
-            )
-
     user_data_dict = payload.model_copy(update={"password": password_hash(payload.password)})
-    temp_user = User(**user_data_dict.model_dump(), attributes={})
-    await temp_user.create()
+    pending_expires_at = datetime.now(tz=timezone.utc) + timedelta(seconds=settings.PENDING_SIGNUP_TTL)
+    temp_user = await insert_user(
+        User(**user_data_dict.model_dump(), attributes={}, role_summary=role.summary(), pending_expires_at=pending_expires_at)
+    )
 
     await send_otp(temp_user, bg)
 
@@ -142,7 +134,7 @@ async def signup_with_phonenumber(bg: BackgroundTasks, payload: RequestChangePas
 
 
 async def verify_otp(payload: VerifyOTP):
-    if not (user := await User.find_one({"phonenumber": payload.phonenumber})):
+    if not (user := await find_user_by_identifier(payload.phonenumber, is_email=False)):
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_PHONENUMBER_NOT_FOUND,
             message_error=f"User phonenumber '{payload.phonenumber}' not found",
@@ -169,7 +161,22 @@ async def verify_otp(payload: VerifyOTP):
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
 
-        await user.set({"is_active": True})
+        # Mise à jour conditionnelle : deux vérifications concurrentes ne comptent le compte qu'une fois
+        previous = await User.get_motor_collection().find_one_and_update(
+            {"_id": user.id, "is_active": {"$ne": True}},
+            {"$set": {"is_active": True, "updated_at": datetime.now(tz=timezone.utc)}, "$unset": {"pending_expires_at": ""}},
+            projection={"role": 1, "is_primary": 1, "pending_expires_at": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if previous is None:
+            return JSONResponse(content={"message": "Account already activated"}, status_code=status.HTTP_200_OK)
+        identity_map.evict(User, user.id)
+        role = previous.get("role")
+        if not previous.get("is_primary") and previous.get("pending_expires_at") is None:
+            await stats.record_moved((role, False), (role, True))
+        elif not previous.get("is_primary"):
+            # Une inscription en attente n'était pas comptée
+            await stats.record_created(role, True)
 
         response_data = {"message": "Your count has been successfully verified !"}
 
@@ -177,7 +184,7 @@ async def verify_otp(payload: VerifyOTP):
 
 
 async def resend_otp(bg: BackgroundTasks, payload: PhonenumberModel):
-    if (user := await User.find_one({"phonenumber": payload.phonenumber})) is None:
+    if (user := await find_user_by_identifier(payload.phonenumber, is_email=False)) is None:
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_NOT_FOUND,
             message_error=f"User with phone number '{payload.phonenumber}' not found",
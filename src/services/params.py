@@ -1,49 +1,126 @@
+import logging
 from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping, Optional, Union
 
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, UpdateResponse
 from fastapi import status
-from slugify import slugify
+from pymongo import DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from src.common.helpers.exception import CustomHTTPException
 from src.models import Params
-from src.schemas import ParamsModel
+from src.schemas import PARAM_FIELDSET, ParamsModel
 from src.shared.error_codes import ParamErrorCode
+from src.shared.etag import make_etag
+from src.shared.fieldsets import Fieldset, sparse_fieldset
+from src.shared.pagination import count_total, CountStrategy
+from src.shared.utils import raise_on_duplicate_key
+
+logging.basicConfig(format="%(message)s", level=logging.INFO)
+_log = logging.getLogger(__name__)
 
 
 async def create(params: ParamsModel) -> Params:
-    return await Params(**params.model_dump()).create()
+    with raise_on_duplicate_key(ParamErrorCode.PARAM_ALREADY_EXIST, f"This parameter '{params.name}' already exists."):
+        return await Params(**params.model_dump()).create()
 
 
 async def get_one(id: PydanticObjectId) -> Params:
     if (param := await Params.get(document_id=id)) is None:
         raise CustomHTTPException(
-            code_error=ParamErrorCode.DOCUMENT_NOT_FOUND,
+            code_error=ParamErrorCode.PARAM_NOT_FOUND,
             message_error=f"Parameter {id} not found.",
             status_code=status.HTTP_404_NOT_FOUND,
         )
     return param
 
 
-async def update(id: PydanticObjectId, param: ParamsModel) -> Params:
-    param = await get_one(id=id)
+def fieldset(fields: Optional[Union[str, Iterable[str]]]) -> Fieldset:
+    return sparse_fieldset(fields, PARAM_FIELDSET, ParamErrorCode.PARAM_INVALID_FIELDS)
+
 
-    slug_value = f"{param.type}-{param.name}"
-    if await Params.find_one({"_id": {"$ne": id}, "slug": slugify(slug_value)}).exists():
+async def get_one_fields(id: PydanticObjectId, fieldset: Fieldset) -> Params:
+    """Projected variant of ``get_one`` for ``?fields=`` reads, returned without validation."""
+
+    if (document := await Params.get_motor_collection().find_one({"_id": id}, projection=fieldset.projection)) is None:
         raise CustomHTTPException(
-            code_error=ParamErrorCode.PARAM_ALREADY_EXIST,
-            message_error=f"Parameter with name '{param.name}' already exists.",
-            status_code=status.HTTP_400_BAD_REQUEST,
+            code_error=ParamErrorCode.PARAM_NOT_FOUND,
+            message_error=f"Parameter {id} not found.",
+            status_code=status.HTTP_404_NOT_FOUND,
         )
+    return Params.model_construct(**document)
+
+
+async def get_etag(id: PydanticObjectId, fields: Optional[str] = None) -> Optional[str]:
+    """Validator of ``GET /parameters/{id}`` read from a projection on ``updated_at``."""
+
+    document = await Params.get_motor_collection().find_one({"_id": id}, projection={"updated_at": 1})
+    if document is None or document.get("updated_at") is None:
+        return None
+    return make_etag(document["_id"], document["updated_at"].isoformat(), fields)
+
+
+async def list_etag(search: Mapping[str, Any], query_string: str) -> str:
+    """
+    Collection-level validator of ``GET /parameters``: number of matching documents and their latest ``updated_at``,
+    combined with the query string (filters, page, size, fields).
 
-    result = await param.set(
-        {
-            **param.model_dump(exclude_none=True, exclude_unset=True),
-            "slug": slugify(slug_value),
-            "updated_at": datetime.now(timezone.utc),
-        }
-    )
+    The latest ``updated_at`` comes from one document read on the ``updated_at`` indexes and the number of documents
+    from ``count_cache``, shared with the listing; a deletion may take ``PAGINATION_COUNT_TTL`` seconds to show.
+    """
+    collection = Params.get_motor_collection()
+    latest = await collection.find_one(search, projection={"_id": 0, "updated_at": 1}, sort=[("updated_at", DESCENDING)])
+    count = await count_total(collection, search, CountStrategy.CACHED)
+    updated_at = latest.get("updated_at") if latest else None
+    return make_etag(count, updated_at.isoformat() if updated_at else None, query_string)
+
+
+async def update(id: PydanticObjectId, param: ParamsModel) -> Params:
+    document = await get_one(id=id)
+
+    # Écriture par requête : Document.set transforme DuplicateKeyError en RevisionIdWasChanged
+    with raise_on_duplicate_key(ParamErrorCode.PARAM_ALREADY_EXIST, f"Parameter with name '{param.name}' already exists."):
+        result = await Params.find_one({"_id": document.id}).update(
+            {
+                "$set": {
+                    **param.model_dump(exclude_none=True, exclude_unset=True),
+                    "slug": Params.build_slug(param.type, param.name),
+                    "updated_at": datetime.now(timezone.utc),
+                }
+            },
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
     return result
 
 
 async def delete(id: PydanticObjectId) -> None:
     await Params.find_one({"_id": PydanticObjectId(id)}).delete()
+
+
+async def backfill_slugs() -> None:
+    """
+    Rewrite the slugs stored before ``Params.build_slug`` (``slugify(type + name)``) to the ``<type>-<name>`` format.
+
+    Without it, creating an existing parameter again would not hit the unique slug index. A slug already taken by
+    another parameter is left unchanged and reported.
+    """
+    collection = Params.get_motor_collection()
+    updates = [
+        (document["_id"], slug)
+        async for document in collection.find({}, projection={"type": 1, "name": 1, "slug": 1})
+        if (slug := Params.build_slug(document["type"], document["name"])) != document.get("slug")
+    ]
+    if not updates:
+        return
+
+    try:
+        await collection.bulk_write(
+            [UpdateOne({"_id": param_id}, {"$set": {"slug": slug}}) for param_id, slug in updates], ordered=False
+        )
+    except BulkWriteError as exc:
+        conflicts = [updates[error["index"]] for error in exc.details.get("writeErrors", [])]
+        _log.warning(
+            f"--> {len(conflicts)} parameters kept their previous slug, already used by another parameter: "
+            + ", ".join(f"{param_id} ({slug})" for param_id, slug in conflicts)
+        )
+    _log.info(f"--> {len(updates)} parameter slugs migrated")
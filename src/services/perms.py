@@ -2,9 +2,16 @@ import os
 
 from src import settings
 from src.common.config.mongo_client import config_mongodb_client
+from src.shared.single_flight import SingleFlight
+
+permissions_flight = SingleFlight("permissions")
 
 
 async def get_all_permissions():
+    return await permissions_flight.do("all", _aggregate_permissions)
+
+
+async def _aggregate_permissions():
     client = await config_mongodb_client(mongodb_uri=settings.MONGODB_URI)
 
     app_db_name, app_coll_name = os.getenv("APP_DESC_DB_COLLECTION").split(".")
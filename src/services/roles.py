@@ -1,12 +1,13 @@
 import asyncio
 import logging
 import os
+import time
 from datetime import datetime, UTC
-from typing import Dict, List, Optional, Sequence, Set
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
-from beanie import PydanticObjectId
-from fastapi_pagination import paginate
+from beanie import PydanticObjectId, UpdateResponse
 from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
 from slugify import slugify
 from starlette import status
 
@@ -14,9 +15,15 @@ from src.common.helpers.caching import delete_custom_key
 from src.common.helpers.exception import CustomHTTPException
 from src.config import settings
 from src.models import Role, User
-from src.schemas import RoleModel
+from src.schemas import ROLE_FIELDSET, RoleModel, USER_READ_PROJECTION, UserReadModel
+from src.shared.batch_loader import BatchLoader, clone_document
+from src.shared.single_flight import SingleFlight
 from src.shared.error_codes import RoleErrorCode
-from src.shared.utils import SortEnum
+from src.shared.etag import make_etag
+from src.shared.fieldsets import Fieldset, sparse_fieldset
+from src.shared.identity_map import identity_map
+from src.shared.pagination import construct_items, CountStrategy, paginate_collection
+from src.shared.utils import raise_on_duplicate_key, SortEnum
 from .perms import get_all_permissions
 
 logging.basicConfig(format="%(message)s", level=logging.INFO)
@@ -40,21 +47,21 @@ async def get_formatted_permissions() -> List[Dict]:
 
 
 async def create_role(role: RoleModel) -> Role:
-    new_role = await Role(**role.model_dump()).create()
+    with raise_on_duplicate_key(RoleErrorCode.ROLE_ALREADY_EXIST, f"This role '{role.name}' already exists."):
+        new_role = await Role(**role.model_dump()).create()
     return new_role
 
 
 async def insert_default_role(name: str, permissions: List[Dict], description: str = None) -> None:
-    slug_value = slugify(name)
-    if await Role.find_one({"slug": slug_value}).exists():
-        logger.info(f"--> Role '{name}' already exists!")
-        return
-
     role_data = {"name": name, "permissions": permissions}
     if description:
         role_data["description"] = description
 
-    await Role(**role_data).create()
+    try:
+        await Role(**role_data).create()
+    except DuplicateKeyError:
+        logger.info(f"--> Role '{name}' already exists!")
+        return
     logger.info(f"--> Role '{name}' created successfully!")
 
 
@@ -66,52 +73,185 @@ async def create_admin_role():
     await insert_default_role(admin_role_name, permissions, admin_role_description)
 
 
+async def _load_roles(role_ids: List[PydanticObjectId]) -> Dict[PydanticObjectId, Role]:
+    return {role.id: role for role in await Role.find({"_id": {"$in": role_ids}}).to_list()}
+
+
+role_loader = BatchLoader(
+    "roles", _load_roles, window=settings.BATCH_LOADER_WINDOW, max_batch_size=settings.BATCH_LOADER_MAX_SIZE
+)
+role_flight = SingleFlight("roles", clone=clone_document)
+
+
 async def get_one_role(role_id: PydanticObjectId) -> Role:
-    if (role := await Role.get(document_id=PydanticObjectId(role_id))) is None:
+    if (role := identity_map.get(Role, role_id)) is not None:
+        return role
+
+    role_oid = PydanticObjectId(role_id)
+    if (role := await role_flight.do(role_oid, lambda: role_loader.load(role_oid))) is None:
         raise CustomHTTPException(
             code_error=RoleErrorCode.ROLE_NOT_FOUND,
             message_error=f"Role with '{role_id}' not found.",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
+    identity_map.add(Role, role_id, role)
     return role
 
 
-async def update_role(role_id: PydanticObjectId, update_role: RoleModel) -> Role:
-    role = await get_one_role(role_id=role_id)
+def role_fieldset(fields: Optional[Union[str, Iterable[str]]]) -> Fieldset:
+    return sparse_fieldset(fields, ROLE_FIELDSET, RoleErrorCode.ROLE_INVALID_FIELDS)
 
-    if await Role.find_one({"_id": {"$ne": role_id}, "slug": slugify(update_role.name)}).exists():
+
+async def get_one_role_fields(role_id: PydanticObjectId, fieldset: Fieldset) -> Role:
+    """Projected variant of ``get_one_role`` for ``?fields=`` reads, returned without validation."""
+
+    document = await Role.get_motor_collection().find_one({"_id": PydanticObjectId(role_id)}, projection=fieldset.projection)
+    if document is None:
         raise CustomHTTPException(
-            code_error=RoleErrorCode.ROLE_ALREADY_EXIST,
-            message_error=f"Role with name '{update_role.name}' already exists.",
+            code_error=RoleErrorCode.ROLE_NOT_FOUND,
+            message_error=f"Role with '{role_id}' not found.",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
+    return Role.model_construct(**document)
+
 
-    result = await role.set(
-        {
-            **update_role.model_dump(exclude_none=True, exclude_unset=True),
-            "slug": slugify(update_role.name),
-            "updated_at": datetime.now(tz=UTC),
-        }
+async def get_role_etag(role_id: PydanticObjectId, fields: Optional[str] = None) -> Optional[str]:
+    """Validator of ``GET /roles/{id}`` read from a projection on ``updated_at`` and ``version``."""
+
+    document = await Role.get_motor_collection().find_one(
+        {"_id": PydanticObjectId(role_id)}, projection={"updated_at": 1, "version": 1}
     )
+    if document is None or document.get("updated_at") is None:
+        return None
+    return make_etag(document["_id"], document["updated_at"].isoformat(), document.get("version"), fields)
+
+
+async def update_role(role_id: PydanticObjectId, update_role: RoleModel) -> Role:
+    role = await get_one_role(role_id=role_id)
+    identity_map.evict(Role, role_id)
+
+    # Écriture par requête : Document.update transforme DuplicateKeyError en RevisionIdWasChanged
+    with raise_on_duplicate_key(RoleErrorCode.ROLE_ALREADY_EXIST, f"Role with name '{update_role.name}' already exists."):
+        result = await Role.find_one({"_id": role.id}).update(
+            {
+                "$set": {
+                    **update_role.model_dump(exclude_none=True, exclude_unset=True),
+                    "slug": slugify(update_role.name),
+                    "updated_at": datetime.now(tz=UTC),
+                },
+                "$inc": {"version": 1},
+            },
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+
+    if (result.name, result.slug) != (role.name, role.slug):
+        # Propager le nouveau nom sur les utilisateurs du rôle en une seule écriture ; les autres modifications
+        # (description, permissions) ne touchent pas le résumé et ne réécrivent pas les membres
+        await User.find({"role": result.id}).update(
+            {"$set": {"role_summary": result.summary().model_dump(by_alias=True), "updated_at": datetime.now(tz=UTC)}}
+        )
+        identity_map.evict(User)
+        _role_ids_by_slug.clear()
     return result
 
 
-async def get_users_for_role(name: str, sorting: Optional[SortEnum] = SortEnum.DESC):
-    if (role := await Role.find_one({"slug": slugify(name)})) is None:
+# slug -> (expiration, id du rôle) : évite de relire le rôle à chaque page des membres
+_role_ids_by_slug: Dict[str, Tuple[float, PydanticObjectId]] = {}
+
+
+async def resolve_role_slug(name: str) -> PydanticObjectId:
+    """Id of the role named ``name``, cached per slug for ``ROLE_SLUG_CACHE_TTL`` seconds."""
+
+    slug, now = slugify(name), time.monotonic()
+    if (cached := _role_ids_by_slug.get(slug)) is not None and cached[0] > now:
+        return cached[1]
+
+    async def lookup() -> Optional[Role]:
+        return await Role.find_one({"slug": slug})
+
+    if (role := await role_flight.do(("slug", slug), lookup)) is None:
         raise CustomHTTPException(
             code_error=RoleErrorCode.ROLE_NOT_FOUND,
             message_error=f"Role with '{name}' not found.",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
+    _role_ids_by_slug[slug] = (now + settings.ROLE_SLUG_CACHE_TTL, role.id)
+    return role.id
+
+
+async def _members_transformer(documents: List[Dict]) -> List[UserReadModel]:
+    return [UserReadModel.from_document(document) for document in documents]
+
+
+async def get_users_for_role(name: str, sorting: Optional[SortEnum] = SortEnum.DESC, include_total: bool = True):
+    """
+    One page of the members of a role, read with skip/limit on the ``(role, created_at)`` index.
+
+    Only the requested page is loaded and projected; the total is served by the pagination count cache.
+    """
+    role_id = await resolve_role_slug(name)
     sorted = DESCENDING if sorting == SortEnum.DESC else ASCENDING
-    users = await User.find({"role": PydanticObjectId(role.id)}, sort=[("created_at", sorted)]).to_list()
-    users_list = [{**user.model_dump(by_alias=True, mode="json", exclude={"password", "is_primary"})} for user in users]
-    result = paginate(users_list)
-    return result
+    return await paginate_collection(
+        User.get_motor_collection(),
+        {"role": role_id},
+        _members_transformer,
+        sort=[("created_at", sorted)],
+        projection=USER_READ_PROJECTION,
+        include_total=include_total,
+        count_strategy=CountStrategy.CACHED,
+    )
+
+
+async def get_role_ids_for_permission(code: str) -> List[PydanticObjectId]:
+    """Ids of the roles granting ``code``, read from the multikey index on ``permission_codes``."""
+
+    cursor = Role.get_motor_collection().find({"permission_codes": code}, projection={"_id": 1})
+    return [document["_id"] async for document in cursor]
+
+
+async def get_roles_for_permission(code: str, sorting: Optional[SortEnum] = SortEnum.DESC, include_total: bool = True):
+    """One page of the roles granting ``code``."""
+
+    sorted = DESCENDING if sorting == SortEnum.DESC else ASCENDING
+    return await paginate_collection(
+        Role.get_motor_collection(),
+        {"permission_codes": code},
+        construct_items(Role),
+        sort=[("created_at", sorted)],
+        include_total=include_total,
+        count_strategy=CountStrategy.CACHED,
+    )
+
+
+async def get_users_for_permission(code: str, sorting: Optional[SortEnum] = SortEnum.DESC, include_total: bool = True):
+    """
+    One page of the users whose role grants ``code``.
+
+    The roles are resolved first from ``permission_codes``, then users are read on the ``(role, created_at)`` index.
+    """
+    role_ids = await get_role_ids_for_permission(code)
+    sorted = DESCENDING if sorting == SortEnum.DESC else ASCENDING
+    return await paginate_collection(
+        User.get_motor_collection(),
+        {"role": {"$in": role_ids}},
+        _members_transformer,
+        sort=[("created_at", sorted)],
+        projection=USER_READ_PROJECTION,
+        include_total=include_total,
+        count_strategy=CountStrategy.CACHED,
+    )
+
+
+async def backfill_permission_codes() -> None:
+    """Flatten ``permissions`` on roles created before ``permission_codes`` existed."""
+
+    async for role in Role.find({"permission_codes": {"$exists": False}}):
+        await role.update({"$set": {"permission_codes": Role.flatten_permissions(role.permissions)}})
 
 
 async def assign_permissions_to_role(role_id: PydanticObjectId, permission_codes: Set[str]) -> Role:
     role = await get_one_role(role_id=role_id)
+    identity_map.evict(Role, role_id)
     old_permissions = role.permissions.copy()
 
     await role.update({"$pull": {"permissions": {"$in": role.permissions}}})
@@ -132,18 +272,40 @@ async def assign_permissions_to_role(role_id: PydanticObjectId, permission_codes
     if not new_permissions:
         return await role.update({"$set": {"permissions": old_permissions}})
 
+    bump_revision = {
+        "$set": {"updated_at": datetime.now(tz=UTC), "permission_codes": Role.flatten_permissions(new_permissions)},
+        "$inc": {"version": 1},
+    }
+
     await asyncio.gather(
         delete_custom_key(custom_key_prefix=settings.APP_NAME + "check-permissions"),
         delete_custom_key(custom_key_prefix=settings.APP_NAME + "access"),
     )
 
-    return await role.update({"$addToSet": {"permissions": {"$each": new_permissions}}})
+    return await role.update({"$addToSet": {"permissions": {"$each": new_permissions}}, **bump_revision})
+
+
+async def _unset_role_summaries(role_ids: List[PydanticObjectId]) -> None:
+    """Drop the summary of deleted roles from their users, in one ``update_many``."""
+
+    await User.get_motor_collection().update_many(
+        {"role": {"$in": role_ids}, "role_summary": {"$ne": None}},
+        {"$unset": {"role_summary": ""}, "$set": {"updated_at": datetime.now(tz=UTC)}},
+    )
+    identity_map.evict(User)
 
 
 async def delete_role(role_id: PydanticObjectId) -> None:
     await Role.find_one({"_id": PydanticObjectId(role_id)}).delete()
+    await _unset_role_summaries([PydanticObjectId(role_id)])
+    identity_map.evict(Role, role_id)
+    _role_ids_by_slug.clear()
 
 
-async def delete_many_roles(role_ids: Sequence[PydanticObjectId]) -> None:
+async def delete_many_roles(role_ids: Sequence[PydanticObjectId]) -> int:
     valid_oids = [PydanticObjectId(oid) for oid in role_ids]
-    await Role.find({"_id": {"$in": valid_oids}}).delete()
+    result = await Role.get_motor_collection().delete_many({"_id": {"$in": valid_oids}})
+    await _unset_role_summaries(valid_oids)
+    identity_map.evict(Role)
+    _role_ids_by_slug.clear()
+    return result.deleted_count
@@ -0,0 +1,128 @@
+import logging
+from collections import Counter
+from datetime import datetime, UTC
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from src.config import settings
+from src.models import Role, User, UserStat
+from src.schemas import RoleSummary, RoleUserStats, UserStats
+from src.shared.periodic import PeriodicTask
+
+logging.basicConfig(format="%(message)s", level=logging.INFO)
+_log = logging.getLogger(__name__)
+
+# (rôle, compte actif) : clé d'un compteur de UserStat
+StatKey = Tuple[Optional[PydanticObjectId], bool]
+
+# Les inscriptions par téléphone en attente de vérification ne sont pas comptées : l'index TTL peut
+# les supprimer sans passer par l'application. Elles le sont à leur activation.
+COUNTED_USERS = {"is_primary": {"$ne": True}, "pending_expires_at": None}
+PENDING_USERS = {"is_primary": {"$ne": True}, "pending_expires_at": {"$type": "date"}}
+
+
+async def apply_deltas(deltas: Mapping[StatKey, int]) -> None:
+    """
+    Add ``deltas`` to the counters with atomic ``$inc`` upserts in a single ``bulk_write``.
+
+    A failed write is only logged: counters are a derived view and the reconciler repairs any drift.
+    """
+    now = datetime.now(tz=UTC)
+    operations = [
+        UpdateOne(
+            {"role": role, "is_active": is_active},
+            {"$inc": {"count": delta}, "$set": {"updated_at": now}},
+            upsert=True,
+        )
+        for (role, is_active), delta in deltas.items()
+        if delta
+    ]
+    if not operations:
+        return
+    try:
+        await UserStat.get_motor_collection().bulk_write(operations, ordered=False)
+    except PyMongoError as exc:
+        _log.error(f"--> Failed to update {len(operations)} user counters: {exc}")
+
+
+async def record_created(role: Optional[PydanticObjectId], is_active: bool, count: int = 1) -> None:
+    await apply_deltas({(role, bool(is_active)): count})
+
+
+async def record_moved(before: StatKey, after: StatKey, count: int = 1) -> None:
+    if before != after:
+        await apply_deltas({before: -count, after: count})
+
+
+async def count_by_key(selector: Mapping[str, Any], pending: bool = False) -> Counter:
+    """Number of counted users (or of pending signups with ``pending``) matching ``selector`` per (role, active) key."""
+
+    pipeline = [
+        {"$match": {**selector, **(PENDING_USERS if pending else COUNTED_USERS)}},
+        {"$group": {"_id": {"role": "$role", "is_active": {"$eq": ["$is_active", True]}}, "count": {"$sum": 1}}},
+    ]
+    cursor = User.get_motor_collection().aggregate(pipeline)
+    return Counter({(doc["_id"].get("role"), doc["_id"]["is_active"]): doc["count"] async for doc in cursor})
+
+
+async def reconcile() -> int:
+    """Recompute every counter from the users collection and drop the counters that no longer match any user."""
+
+    counts = await count_by_key({})
+    now = datetime.now(tz=UTC)
+    collection = UserStat.get_motor_collection()
+    if counts:
+        await collection.bulk_write(
+            [
+                UpdateOne({"role": role, "is_active": is_active}, {"$set": {"count": count, "updated_at": now}}, upsert=True)
+                for (role, is_active), count in counts.items()
+            ],
+            ordered=False,
+        )
+        await collection.delete_many({"$nor": [{"role": role, "is_active": is_active} for role, is_active in counts]})
+    else:
+        await collection.delete_many({})
+    return sum(counts.values())
+
+
+async def ensure_user_stats() -> None:
+    """Build the counters on first start, when the statistics collection is still empty."""
+
+    if await UserStat.get_motor_collection().count_documents({}, limit=1) == 0:
+        total = await reconcile()
+        _log.info(f"--> User statistics initialized ({total} users)")
+
+
+async def get_user_stats() -> UserStats:
+    """
+    Read the counters: the cost depends on the number of roles, never on the number of users.
+
+    Phone number signups are only counted once verified.
+    """
+
+    per_role: Dict[Optional[PydanticObjectId], RoleUserStats] = {}
+    stats = UserStats()
+    async for document in UserStat.get_motor_collection().find({"count": {"$gt": 0}}):
+        entry = per_role.setdefault(document.get("role"), RoleUserStats(role=document.get("role")))
+        if document["is_active"]:
+            entry.active += document["count"]
+        else:
+            entry.inactive += document["count"]
+        entry.total += document["count"]
+        stats.updated_at = max(filter(None, (stats.updated_at, document.get("updated_at"))), default=None)
+
+    role_ids = [role_id for role_id in per_role if role_id is not None]
+    async for document in Role.get_motor_collection().find({"_id": {"$in": role_ids}}, projection={"name": 1, "slug": 1}):
+        per_role[document["_id"]].role_summary = RoleSummary.from_document(document)
+
+    stats.roles = sorted(per_role.values(), key=lambda entry: entry.total, reverse=True)
+    stats.active = sum(entry.active for entry in stats.roles)
+    stats.inactive = sum(entry.inactive for entry in stats.roles)
+    stats.total = stats.active + stats.inactive
+    return stats
+
+
+stats_reconciler = PeriodicTask("User statistics reconciliation", settings.USER_STATS_RECONCILE_INTERVAL, reconcile)
@@ -1,23 +1,65 @@
 import asyncio
+import base64
+import binascii
 import logging
 import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
-from typing import Sequence
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, UpdateResponse
 from fastapi import status
 from fastapi.responses import JSONResponse
 from jinja2 import Environment, PackageLoader, select_autoescape
-from pydantic import EmailStr
+from pydantic import EmailStr, ValidationError
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
 from slugify import slugify
 
 from src.common.helpers.caching import delete_custom_key
 from src.common.helpers.exception import CustomHTTPException
 from src.config import settings
-from src.models import Role, User
-from src.schemas import CreateUser, UpdatePassword, UpdateUser
+from src.models import identifier_fields, Role, User, UserOut, UserStatus, UserTombstone
+from src.schemas import (
+    BulkResult,
+    CreateUser,
+    UpdatePassword,
+    RoleSummary,
+    UpdateUser,
+    USER_EXPORT_COLUMNS,
+    USER_FIELDSET,
+    USER_FILTER_FIELDS,
+    USER_QUERY_INDEXES,
+    USER_READ_PROJECTION,
+    USER_SORTABLE,
+    UserBulkTarget,
+    UserBulkUpdate,
+    UserChangesPage,
+    UserImportError,
+    UserImportReport,
+    UserReadModel,
+)
+from src.shared.batch_loader import BatchLoader, clone_document
+from src.shared.bulk_import import ImportRow
 from src.shared.error_codes import RoleErrorCode, UserErrorCode
-from src.shared.utils import AccountAction, password_hash
+from src.shared.etag import make_etag
+from src.shared.export import csv_header, encode_batch
+from src.shared.fieldsets import Fieldset, sparse_fieldset
+from src.shared.filters import CompiledQuery, QueryCompiler
+from src.shared.identity_map import identity_map
+from src.shared.single_flight import SingleFlight
+from src.shared.utils import (
+    AccountAction,
+    ChangeType,
+    ExportFormat,
+    normalize_email,
+    normalize_phonenumber,
+    password_hash,
+    UserBulkAction,
+)
+from . import archive, stats
 from .roles import get_one_role
 
 logging.basicConfig(format="%(message)s", level=logging.INFO)
@@ -26,29 +68,163 @@ _log = logging.getLogger(__name__)
 template_loader = PackageLoader("src", "templates")
 template_env = Environment(loader=template_loader, autoescape=select_autoescape(["html", "txt"]))
 
+user_flight = SingleFlight("users", clone=clone_document)
+
+# Vrai quand des utilisateurs historiques partagent un identifiant normalisé et n'ont pas reçu email_norm/phone_norm
+_legacy_identifier_conflicts = False
+
+
+async def find_user_by_identifier(identifier: Optional[str], is_email: bool, projection_model=None) -> Optional[User]:
+    """
+    Resolve a user from an email address or a phone number in a single indexed query.
+
+    The identifier is normalized the same way ``email_norm``/``phone_norm`` are computed on write,
+    so callers never have to care about casing or ``+`` prefixes. Pass ``projection_model=UserStatus``
+    when only the existence and the activation status of the account are needed.
+
+    Users whose canonical field could not be backfilled (see ``backfill_identifier_fields``) are still
+    found by their raw ``email``/``phonenumber``.
+    """
+    if is_email:
+        field, raw_field, value = "email_norm", "email", normalize_email(identifier)
+    else:
+        field, raw_field, value = "phone_norm", "phonenumber", normalize_phonenumber(identifier)
+
+    if value is None:
+        return None
+
+    async def lookup() -> Optional[User]:
+        return await User.find_one({field: value}, projection_model=projection_model)
+
+    user = await user_flight.do((field, value, projection_model), lookup)
+    if user is None and _legacy_identifier_conflicts:
+        user = await User.find_one(
+            {field: {"$exists": False}, raw_field: {"$in": list({identifier, value})}}, projection_model=projection_model
+        )
+    return user
+
 
 async def check_if_email_exist(email: EmailStr) -> bool:
-    if await User.find_one({"email": email, "is_active": True}).exists():
+    if (user := await find_user_by_identifier(email, is_email=True, projection_model=UserStatus)) is None:
+        return True
+
+    if user.is_active:
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_EMAIL_ALREADY_EXIST,
             message_error=f"User with email '{email}' already exists",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
-    elif await User.find_one({"email": email, "is_active": False}).exists():
+    raise CustomHTTPException(
+        code_error=UserErrorCode.USER_ACCOUND_DESABLE,
+        message_error=f"User account with email '{email}' is disabled." f" Please request to activate the account.",
+        status_code=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+async def backfill_identifier_fields(batch_size: int = 500) -> None:
+    """
+    Compute ``email_norm``/``phone_norm`` for documents written before these fields existed.
+
+    Each field is written separately. A value rejected by the unique index is left unset and reported;
+    such users stay reachable through the raw ``email``/``phonenumber`` fallback of ``find_user_by_identifier``.
+    """
+    global _legacy_identifier_conflicts
+
+    collection = User.get_motor_collection()
+    cursor = collection.find(
+        {"$or": [{"email_norm": {"$exists": False}}, {"phone_norm": {"$exists": False}}]},
+        projection={"email": 1, "phonenumber": 1, "email_norm": 1, "phone_norm": 1},
+    )
+
+    updates: List[Tuple[PydanticObjectId, str, Optional[str]]] = []
+    conflicts: List[Tuple[PydanticObjectId, str]] = []
+    async for doc in cursor:
+        canonical = {
+            "email_norm": normalize_email(doc.get("email")),
+            "phone_norm": normalize_phonenumber(doc.get("phonenumber")),
+        }
+        updates.extend((doc["_id"], field, value) for field, value in canonical.items() if field not in doc)
+        if len(updates) >= batch_size:
+            conflicts += await _bulk_write_identifiers(collection, updates)
+            updates = []
+
+    if updates:
+        conflicts += await _bulk_write_identifiers(collection, updates)
+
+    if conflicts:
+        _legacy_identifier_conflicts = True
+        _log.warning(
+            f"--> {len(conflicts)} users share a normalized email or phone number and keep their raw identifier only: "
+            + ", ".join(f"{user_id} ({field})" for user_id, field in conflicts)
+        )
+
+
+async def _bulk_write_identifiers(
+    collection, updates: List[Tuple[PydanticObjectId, str, Optional[str]]]
+) -> List[Tuple[PydanticObjectId, str]]:
+    """Set one canonical field per update and return the (user, field) pairs rejected by the unique indexes."""
+
+    operations = [UpdateOne({"_id": user_id}, {"$set": {field: value}}) for user_id, field, value in updates]
+    try:
+        await collection.bulk_write(operations, ordered=False)
+    except BulkWriteError as exc:
+        return [updates[error["index"]][:2] for error in exc.details.get("writeErrors", [])]
+    return []
+
+
+async def insert_user(user: User) -> User:
+    """
+    Insert a new user, relying on the unique identifier indexes to reject duplicates.
+
+    The happy path is a single insert; the account status is only looked up once the index
+    has rejected the write, to report the same errors as the explicit existence checks.
+    An email conflict is reported before a phone number conflict.
+    """
+    if _legacy_identifier_conflicts:
+        # Les utilisateurs sans identifiant normalisé échappent aux index uniques
+        if user.email:
+            await check_if_email_exist(email=user.email)
+        if await find_user_by_identifier(user.phonenumber, is_email=False, projection_model=UserStatus) is not None:
+            await _raise_phonenumber_conflict(user.phonenumber)
+
+    try:
+        user = await user.create()
+    except DuplicateKeyError as exc:
+        if user.email:
+            await check_if_email_exist(email=user.email)
+        if "email_norm" not in (exc.details or {}).get("keyPattern", {}):
+            await _raise_phonenumber_conflict(user.phonenumber)
+        raise CustomHTTPException(
+            code_error=UserErrorCode.USER_EMAIL_ALREADY_EXIST,
+            message_error=f"User with email '{user.email}' already exists",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        ) from exc
+
+    if not user.is_primary and user.pending_expires_at is None:
+        await stats.record_created(user.role, user.is_active)
+    return user
+
+
+async def _raise_phonenumber_conflict(phonenumber: str) -> None:
+    user = await find_user_by_identifier(phonenumber, is_email=False, projection_model=UserStatus)
+    if user is not None and not user.is_active:
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_ACCOUND_DESABLE,
-            message_error=f"User account with email '{email}' is disabled." f" Please request to activate the account.",
+            message_error=f"User account with phone number '{phonenumber}' is disabled."
+            f" Please request to activate the account.",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
-    else:
-        return True
+    raise CustomHTTPException(
+        code_error=UserErrorCode.USER_PHONENUMBER_TAKEN,
+        message_error=f"This phone number '{phonenumber}' is already taken.",
+        status_code=status.HTTP_400_BAD_REQUEST,
+    )
 
 
 async def create_user(user_data: CreateUser) -> User:
-    await get_one_role(role_id=user_data.role)
-    await check_if_email_exist(email=user_data.email.lower())
+    role = await get_one_role(role_id=user_data.role)
     user_dict = user_data.model_copy(update={"password": password_hash(user_data.password)})
-    new_user = await User(**user_dict.model_dump(), is_active=True).create()
+    new_user = await insert_user(User(**user_dict.model_dump(), is_active=True, role_summary=role.summary()))
     return new_user
 
 
@@ -60,9 +236,8 @@ async def create_first_user(user_data: CreateUser) -> User:
             message_error=f"Role with name '{default_role}' not found.",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
-    await check_if_email_exist(email=user_data.email.lower())
     user_dict = user_data.model_copy(update={"role": role.id, "password": password_hash(user_data.password)})
-    new_user = await User(is_active=True, **user_dict.model_dump()).create()
+    new_user = await insert_user(User(is_active=True, role_summary=role.summary(), **user_dict.model_dump()))
     return new_user
 
 
@@ -78,64 +253,519 @@ async def create_admin_user():
         _log.info("--> Role not found !")
         return
 
-    if await User.find_one({"email": paylaod["email"], "is_primary": True}).exists():
+    if await User.find_one({"email_norm": normalize_email(paylaod["email"]), "is_primary": True}).exists():
         _log.info("--> Admin user alreay exist !")
         return
     else:
         password = os.getenv("DEFAULT_ADMIN_PASSWORD")
-        user = User(is_active=True, role=role.id, is_primary=True, **paylaod)
+        user = User(is_active=True, role=role.id, role_summary=role.summary(), is_primary=True, **paylaod)
         user.password = password_hash(password)
         await user.create()
         _log.info("--> Create first user successfully !")
 
 
+_hash_executor = ThreadPoolExecutor(max_workers=settings.IMPORT_HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+async def _resolve_import_roles(references: Set[str], known: Dict[str, RoleSummary]) -> None:
+    """Resolve role ids or slugs not seen yet in this import with a single ``$in`` query."""
+
+    if not (missing := references - set(known)):
+        return
+    oids = [PydanticObjectId(ref) for ref in missing if PydanticObjectId.is_valid(ref)]
+    cursor = Role.get_motor_collection().find(
+        {"$or": [{"_id": {"$in": oids}}, {"slug": {"$in": list(missing)}}]}, projection={"name": 1, "slug": 1, "version": 1}
+    )
+    async for document in cursor:
+        summary = RoleSummary.from_document(document)
+        known[str(summary.id)] = known[summary.slug] = summary
+
+
+async def _existing_identifiers(emails: Set[str], phones: Set[str]) -> Set[str]:
+    if not emails and not phones:
+        return set()
+    cursor = User.get_motor_collection().find(
+        {"$or": [{"email_norm": {"$in": list(emails)}}, {"phone_norm": {"$in": list(phones)}}]},
+        projection={"email_norm": 1, "phone_norm": 1, "_id": 0},
+    )
+    return {value async for document in cursor for value in document.values() if value}
+
+
+async def _import_batch(batch: List[ImportRow], roles: Dict[str, RoleSummary], seen: Set[str], report: UserImportReport):
+    pending = [row for row in batch if row.error is None]
+    await _resolve_import_roles({str(row.data["role"]) for row in pending if row.data.get("role")}, roles)
+
+    candidates = []
+    for row in pending:
+        try:
+            if not row.data.get("role"):
+                raise ValueError("Missing role.")
+            if (summary := roles.get(str(row.data["role"]))) is None:
+                raise ValueError(f"Role '{row.data['role']}' not found.")
+            user = User(**CreateUser.model_validate({**row.data, "role": summary.id}).model_dump())
+        except (ValidationError, CustomHTTPException, ValueError) as exc:
+            row.error = getattr(exc, "message_error", None) or str(exc)
+            continue
+        user.is_active, user.role_summary = True, summary
+        user.normalize_identifiers()
+        candidates.append((row, user))
+
+    existing = await _existing_identifiers(
+        {user.email_norm for _, user in candidates if user.email_norm},
+        {user.phone_norm for _, user in candidates if user.phone_norm},
+    )
+    accepted = []
+    for row, user in candidates:
+        identifiers = {value for value in (user.email_norm, user.phone_norm) if value}
+        if taken := identifiers & (existing | seen):
+            row.error = f"Identifier already used: {', '.join(sorted(taken))}."
+            continue
+        seen.update(identifiers)
+        accepted.append((row, user))
+
+    # Argon2 libère le GIL : les hachages se font en parallèle dans le pool
+    loop = asyncio.get_running_loop()
+    hashes = await asyncio.gather(
+        *(loop.run_in_executor(_hash_executor, password_hash, user.password) for _, user in accepted if user.password)
+    )
+    for user, hashed in zip((user for _, user in accepted if user.password), hashes):
+        user.password = hashed
+
+    if accepted:
+        try:
+            await User.insert_many([user for _, user in accepted], ordered=False)
+        except BulkWriteError as exc:
+            for error in exc.details.get("writeErrors", []):
+                accepted[error["index"]][0].error = error.get("errmsg", "Insert failed.")
+
+    for row in batch:
+        if row.error:
+            report.errors.append(UserImportError(row=row.index, error=row.error))
+        else:
+            report.inserted += 1
+    await stats.apply_deltas(Counter((user.role, True) for row, user in accepted if row.error is None))
+
+
+async def import_users(rows: AsyncIterable[ImportRow], batch_size: int = settings.IMPORT_BATCH_SIZE) -> UserImportReport:
+    """
+    Create users in bulk from parsed import rows.
+
+    Each batch resolves its roles and checks identifier uniqueness with set-based ``$in`` queries, hashes
+    passwords in a worker pool and is written with one unordered ``insert_many``. Invalid rows are reported
+    with their position and never abort the import.
+    """
+    started = time.perf_counter()
+    report, roles, seen = UserImportReport(), {}, set()
+    batch: List[ImportRow] = []
+    async for row in rows:
+        report.total += 1
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await _import_batch(batch, roles, seen, report)
+            batch = []
+    if batch:
+        await _import_batch(batch, roles, seen, report)
+
+    report.failed = len(report.errors)
+    report.elapsed = round(time.perf_counter() - started, 3)
+    report.rows_per_second = round(report.total / report.elapsed, 1) if report.elapsed else float(report.total)
+    _log.info(f"--> Imported {report.inserted}/{report.total} users in {report.elapsed}s ({report.rows_per_second} rows/s)")
+    return report
+
+
+async def _load_users(user_ids: List[PydanticObjectId]) -> Dict[PydanticObjectId, User]:
+    return {user.id: user for user in await User.find({"_id": {"$in": user_ids}}).to_list()}
+
+
+user_loader = BatchLoader(
+    "users", _load_users, window=settings.BATCH_LOADER_WINDOW, max_batch_size=settings.BATCH_LOADER_MAX_SIZE
+)
+
+
 async def get_one_user(user_id: PydanticObjectId):
-    if (user := await User.get(document_id=PydanticObjectId(user_id))) is None:
+    if (user := identity_map.get(User, user_id)) is None:
+        user_oid = PydanticObjectId(user_id)
+        if (user := await user_flight.do(user_oid, lambda: user_loader.load(user_oid))) is None:
+            raise CustomHTTPException(
+                code_error=UserErrorCode.USER_NOT_FOUND,
+                message_error=f"User with '{user_id}' not found.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        await resolve_role_summaries([user])
+        identity_map.add(User, user_id, user)
+    result = user.model_copy(update={"extras": {"role_info": get_role_info(user)}})
+    return result
+
+
+async def resolve_role_summaries(users: Sequence[Union[User, UserReadModel]]) -> None:
+    """
+    Fill ``role_summary`` on users written before it was denormalized, with one ``$in`` query.
+
+    Users that already carry a summary are left untouched, so reads usually never touch the role collection.
+    """
+    missing_role_ids = {user.role for user in users if user.role_summary is None and user.role}
+    if not missing_role_ids:
+        return
+
+    roles = await Role.find({"_id": {"$in": list(missing_role_ids)}}).to_list()
+    summaries = {role.id: role.summary() for role in roles}
+    for user in users:
+        if user.role_summary is None:
+            user.role_summary = summaries.get(user.role)
+
+
+def get_role_info(user: Union[User, UserReadModel]) -> Optional[Dict[str, Any]]:
+    return user.role_summary.model_dump(by_alias=True, mode="json") if user.role_summary else None
+
+
+def to_user_out(user: User) -> UserOut:
+    """Wrap an already validated user in ``UserOut`` without validating every field a second time."""
+
+    return UserOut.model_construct(
+        **{name: getattr(user, name) for name in User.model_fields}, extras={"role_info": get_role_info(user)}
+    )
+
+
+async def to_user_read_models(documents: List[Mapping[str, Any]], with_role_info: bool = True) -> List[UserReadModel]:
+    """Build listing items from raw projected documents, without validation nor Beanie state tracking."""
+
+    items = [UserReadModel.from_document(document) for document in documents]
+    if with_role_info:
+        await resolve_role_summaries(items)
+        for item in items:
+            item.extras = {"role_info": get_role_info(item)}
+    return items
+
+
+async def get_users_by_ids(user_ids: Sequence[PydanticObjectId], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Resolve many users at once with a single ``$in`` query, keyed by id.
+
+    Only the requested ``fields`` are read from MongoDB and serialized; unknown ids are absent from the result.
+    Role information comes from the denormalized summary, legacy users are completed with one role query.
+    """
+    unique_ids = list(dict.fromkeys(PydanticObjectId(user_id) for user_id in user_ids))
+    if len(unique_ids) > settings.USER_BATCH_MAX_IDS:
+        raise CustomHTTPException(
+            code_error=UserErrorCode.USER_BATCH_TOO_LARGE,
+            message_error=f"At most {settings.USER_BATCH_MAX_IDS} users can be requested at once.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    fieldset = user_fieldset(fields)
+    items = await find_user_read_models({"_id": {"$in": unique_ids}}, fieldset)
+    return {str(item.id): item.model_dump(by_alias=True, mode="json", include=fieldset.include) for item in items}
+
+
+async def get_user_etag(user_id: PydanticObjectId, fields: Optional[str] = None) -> Optional[str]:
+    """Validator of ``GET /users/{id}`` read from a projection on ``updated_at``; ``None`` when it cannot be computed."""
+
+    document = await User.get_motor_collection().find_one({"_id": PydanticObjectId(user_id)}, projection={"updated_at": 1})
+    if document is None or document.get("updated_at") is None:
+        return None
+    return make_etag(document["_id"], document["updated_at"].isoformat(), fields)
+
+
+user_query_compiler = QueryCompiler(USER_FILTER_FIELDS, USER_SORTABLE, USER_QUERY_INDEXES, UserErrorCode.USER_INVALID_FILTER)
+
+
+def build_users_filter(query: Optional[str] = None, is_active: Optional[bool] = None) -> Dict[str, Any]:
+    """MongoDB filter of the ``query``/``active`` parameters, shared by the users listing, export and bulk operations."""
+
+    search: Dict[str, Any] = {"is_primary": {"$ne": True}}
+    if is_active is not None:
+        search["is_active"] = is_active
+    if query:
+        search["$or"] = [
+            {"email": {"$regex": query, "$options": "i"}},
+            {"fullname": {"$regex": query, "$options": "i"}},
+            {
+                "$expr": {
+                    "$gt": [
+                        {
+                            "$indexOfArray": [
+                                {
+                                    "$map": {
+                                        "input": {"$objectToArray": "$attributes"},
+                                        "as": "attr",
+                                        "in": {"$toLower": "$$attr.v"},
+                                    }
+                                },
+                                {"$toLower": query},
+                            ]
+                        },
+                        -1,
+                    ]
+                }
+            },
+        ]
+    return search
+
+
+def users_listing_query(
+    query: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    filters: Optional[Iterable[str]] = None,
+    order_by: Optional[str] = None,
+    sort: int = DESCENDING,
+) -> CompiledQuery:
+    """
+    Filter and sort of the users listing parameters (``query``, ``active``, ``filter``, ``order_by``, ``sort``).
+
+    The export uses it too, so both endpoints accept the same filters.
+
+    :raises CustomHTTPException: If a filter or the sort is invalid or not served by an index.
+    """
+    compiled = user_query_compiler.compile(
+        filters,
+        order_by,
+        default_sort=[("created_at", sort)],
+        equals={"is_active": is_active} if is_active is not None else None,
+    )
+    return CompiledQuery(filter={**build_users_filter(query), **compiled.filter}, sort=compiled.sort, index=compiled.index)
+
+
+async def export_users(
+    search: Mapping[str, Any], export_format: ExportFormat, batch_size: int, sort: Optional[List[Tuple[str, int]]] = None
+) -> AsyncIterator[bytes]:
+    """
+    Stream the users matching ``search`` as NDJSON or CSV, one encoded chunk per cursor batch.
+
+    Documents are read with the read projection straight from a Motor cursor and never turned into models,
+    so memory stays bounded by ``batch_size`` whatever the number of exported users.
+    """
+    cursor = User.get_motor_collection().find(
+        search,
+        projection=USER_READ_PROJECTION,
+        sort=[("created_at", ASCENDING)] if sort is None else sort,
+        batch_size=batch_size,
+    )
+    if export_format == ExportFormat.CSV:
+        yield csv_header(USER_EXPORT_COLUMNS)
+    while documents := await cursor.to_list(length=batch_size):
+        yield encode_batch(documents, export_format, USER_EXPORT_COLUMNS)
+
+
+def _encode_change_cursor(updated_at: datetime, user_id: PydanticObjectId) -> str:
+    return base64.urlsafe_b64encode(f"{updated_at.isoformat()}|{user_id}".encode()).decode()
+
+
+def _decode_change_cursor(cursor: str) -> tuple[datetime, PydanticObjectId]:
+    try:
+        updated_at, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(updated_at), PydanticObjectId(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise CustomHTTPException(
+            code_error=UserErrorCode.USER_INVALID_CURSOR,
+            message_error=f"Invalid change feed cursor '{cursor}'.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        ) from exc
+
+
+# Projection de lecture du flux : ``pending_expires_at`` distingue les inscriptions en attente
+CHANGES_PROJECTION = {key: value for key, value in USER_READ_PROJECTION.items() if key != "pending_expires_at"}
+
+
+def _change_type(document: Mapping[str, Any], since: Optional[datetime]) -> ChangeType:
+    """A user created after the consumer's cursor is new to it, whatever was written since its creation."""
+
+    if document.get("pending_expires_at") is not None:
+        return ChangeType.PENDING
+    if not document.get("is_active"):
+        return ChangeType.DEACTIVATED
+    if since is None or (document.get("created_at") is not None and document["created_at"] > since):
+        return ChangeType.CREATED
+    return ChangeType.UPDATED
+
+
+async def _wait_for_user_change(timeout: float) -> None:
+    """Block until the next write on the users collection, using a change stream when the deployment supports it."""
+
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+    try:
+        async with User.get_motor_collection().watch(pipeline, max_await_time_ms=int(timeout * 1000)) as stream:
+            await asyncio.wait_for(stream.try_next(), timeout=timeout)
+    except (asyncio.TimeoutError, PyMongoError, NotImplementedError):
+        # Pas de replica set (ou délai écoulé) : le client reviendra avec le même curseur
+        return
+
+
+async def get_user_changes(since: Optional[str] = None, limit: int = 100, wait: float = 0) -> UserChangesPage:
+    """
+    Users created, updated, deactivated or deleted after ``since``, in ``(updated_at, _id)`` order.
+
+    The cursor is the position of the last returned change, so consumers pull deltas only and resume exactly
+    where they stopped, even when several users share the same ``updated_at``. When nothing changed and ``wait``
+    is set, the call waits on a change stream (if available) for up to ``wait`` seconds before answering.
+
+    Deleted users come from their tombstones, kept ``USER_TOMBSTONE_RETENTION`` seconds: a consumer whose
+    cursor is older than that must resynchronize from the listing.
+    """
+    position: Dict[str, Any] = {}
+    updated_at = None
+    if since:
+        updated_at, user_id = _decode_change_cursor(since)
+        position["$or"] = [{"updated_at": {"$gt": updated_at}}, {"updated_at": updated_at, "_id": {"$gt": user_id}}]
+    order = [("updated_at", ASCENDING), ("_id", ASCENDING)]
+
+    async def fetch() -> List[Mapping[str, Any]]:
+        users_cursor = User.get_motor_collection().find(
+            {"is_primary": {"$ne": True}, "updated_at": {"$ne": None}, **position},
+            projection=CHANGES_PROJECTION,
+            sort=order,
+            limit=limit + 1,
+        )
+        tombstones_cursor = UserTombstone.get_motor_collection().find(position, sort=order, limit=limit + 1)
+        documents = await users_cursor.to_list(length=None)
+        documents += [{**document, "deleted": True} for document in await tombstones_cursor.to_list(length=None)]
+        return sorted(documents, key=lambda document: (document["updated_at"], document["_id"]))[: limit + 1]
+
+    if not (documents := await fetch()) and wait > 0:
+        await _wait_for_user_change(wait)
+        documents = await fetch()
+
+    page = documents[:limit]
+    live = iter(await to_user_read_models([document for document in page if not document.get("deleted")]))
+    items = []
+    for document in page:
+        if document.get("deleted"):
+            extras = {"change": ChangeType.DELETED}
+            item = UserReadModel.model_construct(id=document["_id"], updated_at=document["updated_at"], extras=extras)
+        else:
+            item = next(live)
+            item.extras["change"] = _change_type(document, updated_at)
+        items.append(item)
+
+    next_cursor = _encode_change_cursor(items[-1].updated_at, items[-1].id) if items else since
+    return UserChangesPage.model_construct(items=items, next_cursor=next_cursor, has_more=len(documents) > limit)
+
+
+def user_fieldset(fields: Optional[Union[str, Iterable[str]]]) -> Fieldset:
+    return sparse_fieldset(fields, USER_FIELDSET, UserErrorCode.USER_INVALID_FIELDS)
+
+
+def user_read_models_transformer(fieldset: Fieldset):
+    """Listing transformer that only joins role information when ``role_info`` is part of the fieldset."""
+
+    with_role_info = fieldset.include is None or "extras" in fieldset.include
+
+    async def transformer(documents: List[Mapping[str, Any]]) -> List[UserReadModel]:
+        return await to_user_read_models(documents, with_role_info=with_role_info)
+
+    return transformer
+
+
+async def find_user_read_models(query: Mapping[str, Any], fieldset: Fieldset) -> List[UserReadModel]:
+    cursor = User.get_motor_collection().find(query, projection=fieldset.projection or USER_READ_PROJECTION)
+    return await user_read_models_transformer(fieldset)(await cursor.to_list(length=None))
+
+
+async def get_one_user_fields(user_id: PydanticObjectId, fieldset: Fieldset) -> UserReadModel:
+    """Projected variant of ``get_one_user`` for ``?fields=`` reads: only the selected fields are fetched."""
+
+    if not (items := await find_user_read_models({"_id": PydanticObjectId(user_id)}, fieldset)):
         raise CustomHTTPException(
             code_error=UserErrorCode.USER_NOT_FOUND,
             message_error=f"User with '{user_id}' not found.",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
-    role = await get_one_role(role_id=user.role)
-    result = user.model_copy(update={"extras": {"role_info": role.model_dump(by_alias=True, mode="json")}})
-    return result
+    return items[0]
 
 
-async def update_user(user_id: PydanticObjectId, update_user: UpdateUser):
-    if update_user.role:
-        await get_one_role(role_id=PydanticObjectId(update_user.role))
+async def backfill_role_summaries() -> None:
+    """Denormalize the role summary on users created before ``role_summary`` existed, one ``update_many`` per role."""
 
-    user = await get_one_user(user_id=user_id)
-    update_data = update_user.model_dump(exclude_unset=True)
+    async for role in Role.find_all():
+        await User.find({"role": role.id, "role_summary": None}).update(
+            {"$set": {"role_summary": role.summary().model_dump(by_alias=True)}}
+        )
+
+
+def _attribute_path(key: str) -> str:
+    if not key or "." in key or key.startswith("$"):
+        raise CustomHTTPException(
+            code_error=UserErrorCode.INVALID_ATTRIBUTES,
+            message_error=f"Invalid attribute key '{key}'.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    return f"attributes.{key}"
+
+
+async def patch_user_attributes(
+    user_id: PydanticObjectId,
+    set_attributes: Optional[Dict[str, Any]] = None,
+    unset_attributes: Optional[Iterable[str]] = None,
+    fields: Optional[Dict[str, Any]] = None,
+    return_document: bool = False,
+) -> Optional[User]:
+    """
+    Apply a partial update to ``user.attributes`` with a single ``update_one``.
+
+    Each changed key is written on its own ``attributes.<key>`` path with ``$set``/``$unset``,
+    so concurrent patches touching different keys never overwrite each other and the current
+    attributes do not need to be read first. Every effective write also bumps ``updated_at``.
+
+    :param user_id: The user to update.
+    :param set_attributes: Attribute keys to set.
+    :param unset_attributes: Attribute keys to remove.
+    :param fields: Additional top-level fields to ``$set`` in the same write.
+    :param return_document: Return the updated document (``find_one_and_update``) instead of ``None``.
+    :raises CustomHTTPException: If an attribute key is invalid, or if ``return_document`` is set and the user is missing.
+    """
+    set_values = {_attribute_path(key): value for key, value in (set_attributes or {}).items()}
+    set_values.update(fields or {})
+    set_values.update(identifier_fields(fields or {}))
+    unset_values = {_attribute_path(key): "" for key in (unset_attributes or [])}
+
+    expression = {}
+    if set_values or unset_values:
+        expression["$set"] = {"updated_at": datetime.now(tz=UTC), **set_values}
+    if unset_values:
+        expression["$unset"] = unset_values
+
+    identity_map.evict(User, user_id)
+    query = User.find_one({"_id": PydanticObjectId(user_id)})
+    if not return_document:
+        if expression:
+            await query.update(expression)
+        return None
+
+    user = await query.update(expression, response_type=UpdateResponse.NEW_DOCUMENT) if expression else await query
+    if user is None:
+        raise CustomHTTPException(
+            code_error=UserErrorCode.USER_NOT_FOUND,
+            message_error=f"User with '{user_id}' not found.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    return user
 
-    if "attributes" in update_data:
-        """
-        existing_attribute_keys = set(user.attributes.keys())
-        _log.info(f"Existing keys --> {existing_attribute_keys}")
 
-        new_keys = set(update_data.get("attributes", {}).keys()) - existing_attribute_keys
-        _log.info(f"New keys --> {new_keys}")
+async def update_user(user_id: PydanticObjectId, update_user: UpdateUser):
+    update_data = update_user.model_dump(exclude_unset=True)
+    attributes = update_data.pop("attributes", None) or {}
 
-        if new_keys:
-            raise CustomHTTPException(
-                code_error=UserErrorCode.INVALID_ATTRIBUTES,
-                message_error=f"Unauthorized addition of new keys: {', '.join(new_keys)}.",
-                status_code=status.HTTP_400_BAD_REQUEST,
-            )
-        """
-        update_data["attributes"] = {**user.attributes, **update_data["attributes"]}
+    previous_role = None
+    if update_user.role:
+        role = await get_one_role(role_id=PydanticObjectId(update_user.role))
+        update_data["role_summary"] = role.summary().model_dump(by_alias=True)
+        previous_role = (await get_one_user(user_id=user_id)).role
 
-    updated_user_doc = await user.set({**update_data, "updated_at": datetime.now(tz=UTC)})
+    user = await patch_user_attributes(user_id=user_id, set_attributes=attributes, fields=update_data, return_document=True)
+    if previous_role is not None and not user.is_primary and user.pending_expires_at is None:
+        await stats.record_moved((previous_role, bool(user.is_active)), (user.role, bool(user.is_active)))
 
-    role = await get_one_role(role_id=PydanticObjectId(updated_user_doc.role))
-    return user.model_copy(update={"extras": {"role_info": role.model_dump(by_alias=True)}})
+    await resolve_role_summaries([user])
+    return user.model_copy(update={"extras": {"role_info": get_role_info(user)}})
 
 
 async def update_user_password(user_id: PydanticObjectId, payload: UpdatePassword):
-    user = await get_one_user(user_id=user_id)
-    updated_user_doc = await user.set({"updated_at": datetime.now(tz=UTC), "password": password_hash(payload.confirm_password)})
-    role = await get_one_role(role_id=PydanticObjectId(updated_user_doc.role))
-    return user.model_copy(update={"extras": {"role_info": role.model_dump(by_alias=True)}})
+    user = await patch_user_attributes(
+        user_id=user_id,
+        fields={"password": password_hash(payload.confirm_password)},
+        return_document=True,
+    )
+    await resolve_role_summaries([user])
+    return user.model_copy(update={"extras": {"role_info": get_role_info(user)}})
 
 
 async def delete_user_account(user_id: PydanticObjectId) -> None:
@@ -146,20 +776,44 @@ async def delete_user_account(user_id: PydanticObjectId) -> None:
             message_error="Primary user cannot be deleted.",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
-    await user.set({"is_active": False})
-
-
-async def activate_user_account(user_id: PydanticObjectId, action: AccountAction) -> JSONResponse:
-    user = await get_one_user(user_id=user_id)
+    was_active = bool(user.is_active)
+    await user.set({"is_active": False, "updated_at": datetime.now(tz=UTC)})
+    identity_map.evict(User, user_id)
+    await stats.record_moved((user.role, was_active), (user.role, False))
 
-    is_active = True if action == AccountAction.ACTIVATE else False
-    await user.set({"is_active": is_active})
 
+async def _invalidate_token_caches() -> None:
     await asyncio.gather(
         delete_custom_key(custom_key_prefix=settings.APP_NAME + "access"),
         delete_custom_key(custom_key_prefix=settings.APP_NAME + "validate"),
     )
 
+
+async def activate_user_account(user_id: PydanticObjectId, action: AccountAction) -> JSONResponse:
+    try:
+        user = await get_one_user(user_id=user_id)
+    except CustomHTTPException:
+        # Un compte archivé est restauré avant d'être réactivé
+        if action != AccountAction.ACTIVATE or not await archive.restore_user(PydanticObjectId(user_id)):
+            raise
+        user = await get_one_user(user_id=user_id)
+
+    is_active = True if action == AccountAction.ACTIVATE else False
+    was_active = bool(user.is_active)
+    update: Dict[str, Any] = {"$set": {"is_active": is_active, "updated_at": datetime.now(tz=UTC)}}
+    if is_active:
+        # Un compte activé n'est plus une inscription en attente : il sort de l'index TTL
+        update["$unset"] = {"pending_expires_at": ""}
+    await user.update(update)
+    identity_map.evict(User, user_id)
+    if not user.is_primary and user.pending_expires_at is None:
+        await stats.record_moved((user.role, was_active), (user.role, is_active))
+    elif not user.is_primary and is_active:
+        # Une inscription en attente n'était pas comptée
+        await stats.record_created(user.role, True)
+
+    await _invalidate_token_caches()
+
     message = "activated" if is_active else "deactivated"
     return JSONResponse(
         content={"message": f"User account {message} successfully."},
@@ -167,6 +821,102 @@ async def activate_user_account(user_id: PydanticObjectId, action: AccountAction
     )
 
 
-async def delete_many_users(user_ids: Sequence[PydanticObjectId]) -> None:
+async def delete_many_users(user_ids: Sequence[PydanticObjectId]) -> int:
     valid_oids = [PydanticObjectId(oid) for oid in user_ids]
-    await User.find({"_id": {"$in": valid_oids}}).delete()
+    return await _delete_users({"_id": {"$in": valid_oids}, "is_primary": {"$ne": True}})
+
+
+async def _delete_users(selector: Dict[str, Any]) -> int:
+    """Hard-delete the users matching ``selector`` and leave a tombstone per user for the change feed."""
+
+    collection = User.get_motor_collection()
+    user_ids = [document["_id"] async for document in collection.find(selector, projection={"_id": 1})]
+    if not user_ids:
+        return 0
+    selector = {"_id": {"$in": user_ids}, "is_primary": {"$ne": True}}
+    counts = await stats.count_by_key(selector)
+    result = await collection.delete_many(selector)
+    identity_map.evict(User)
+    await stats.apply_deltas({key: -count for key, count in counts.items()})
+
+    deleted_at = datetime.now(tz=UTC)
+    await UserTombstone.get_motor_collection().bulk_write(
+        [UpdateOne({"_id": user_id}, {"$set": {"updated_at": deleted_at}}, upsert=True) for user_id in user_ids],
+        ordered=False,
+    )
+    return result.deleted_count
+
+
+def _bulk_selector(target: UserBulkTarget) -> Dict[str, Any]:
+    """Filter of the users targeted by a bulk operation; the primary user is never part of it."""
+
+    if (target.ids is None) == (target.filter is None):
+        raise CustomHTTPException(
+            code_error=UserErrorCode.USER_BULK_INVALID_OPERATION,
+            message_error="Provide either 'ids' or 'filter' to select the users.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    if target.ids is not None:
+        return {"_id": {"$in": target.ids}, "is_primary": {"$ne": True}}
+    if not target.filter.query and target.filter.active is None and target.filter.role is None:
+        # Un filtre vide ciblerait tous les utilisateurs
+        raise CustomHTTPException(
+            code_error=UserErrorCode.USER_BULK_INVALID_OPERATION,
+            message_error="The 'filter' must set at least one of 'query', 'active' or 'role'.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    selector = build_users_filter(target.filter.query, target.filter.active)
+    if target.filter.role is not None:
+        selector["role"] = target.filter.role
+    return selector
+
+
+async def bulk_update_users(operation: UserBulkUpdate) -> BulkResult:
+    """
+    Activate, deactivate or move to another role every targeted user with one ``update_many``.
+
+    Cached users and the token validation caches are invalidated once for the whole batch.
+    """
+    selector = _bulk_selector(operation)
+    fields: Dict[str, Any] = {"updated_at": datetime.now(tz=UTC)}
+    created: Counter = Counter()
+    if operation.action == UserBulkAction.REASSIGN_ROLE:
+        if operation.role is None:
+            raise CustomHTTPException(
+                code_error=UserErrorCode.USER_BULK_INVALID_OPERATION,
+                message_error="The 'reassign-role' action requires a 'role'.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        role = await get_one_role(role_id=operation.role)
+        fields.update(role=role.id, role_summary=role.summary().model_dump(by_alias=True))
+        # $and : le sélecteur peut déjà porter une condition sur ``role`` (filter.role)
+        changing = await stats.count_by_key({"$and": [selector, {"role": {"$ne": role.id}}]})
+        moved = {(key, (role.id, key[1])): count for key, count in changing.items()}
+    else:
+        fields["is_active"] = is_active = operation.action == UserBulkAction.ACTIVATE
+        changing = await stats.count_by_key({"$and": [selector, {"is_active": {"$ne": is_active}}]})
+        moved = {(key, (key[0], is_active)): count for key, count in changing.items()}
+        if is_active:
+            # Les inscriptions en attente activées entrent dans les compteurs
+            pending = await stats.count_by_key(selector, pending=True)
+            created.update({(role, True): count for (role, _), count in pending.items()})
+
+    update: Dict[str, Any] = {"$set": fields}
+    if fields.get("is_active"):
+        update["$unset"] = {"pending_expires_at": ""}
+    result = await User.get_motor_collection().update_many(selector, update)
+    identity_map.evict(User)
+    deltas = created
+    for (before, after), count in moved.items():
+        deltas[before] -= count
+        deltas[after] += count
+    await stats.apply_deltas(deltas)
+    await _invalidate_token_caches()
+    return BulkResult(action=operation.action, matched=result.matched_count, modified=result.modified_count)
+
+
+async def bulk_delete_users(target: UserBulkTarget) -> BulkResult:
+    deleted = await _delete_users(_bulk_selector(target))
+    await _invalidate_token_caches()
+    return BulkResult(action="delete", matched=deleted, modified=deleted)
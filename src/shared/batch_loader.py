@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Set, TypeVar
+
+logging.basicConfig(format="%(message)s", level=logging.INFO)
+_log = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class LoaderMetrics:
+    requested: int = 0
+    loaded: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+    errors: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Lookups served by a batch already waiting for the same key."""
+        return self.requested - self.loaded
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    DataLoader-style batching of lookups by key across concurrent coroutines.
+
+    Keys requested during ``window`` seconds (or until ``max_batch_size`` distinct keys are waiting) are
+    resolved together by a single ``load_many`` call, typically one ``find({"_id": {"$in": keys}})``.
+    Waiters share the batch result but each receives its own copy through ``clone``, so a document
+    mutated by one request is never seen by another.
+
+    The pending batch belongs to the running event loop; a loader reused from another loop starts afresh.
+
+    :param name: Name used in logs and metrics.
+    :type name: str
+    :param load_many: Coroutine resolving a list of keys to a ``{key: value}`` mapping; missing keys yield ``None``.
+    :param window: Number of seconds to wait for other keys before dispatching a batch.
+    :type window: float
+    :param max_batch_size: Number of distinct waiting keys that dispatches a batch immediately.
+    :type max_batch_size: int
+    :param clone: Function returning the copy handed to each waiter.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        load_many: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        window: float,
+        max_batch_size: int,
+        clone: Optional[Callable[[V], V]] = None,
+    ):
+        self.name = name
+        self.metrics = LoaderMetrics()
+        self._load_many = load_many
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._clone = clone
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._pending, self._timer, self._tasks = loop, {}, None, set()
+
+        self.metrics.requested += 1
+        if (future := self._pending.get(key)) is None:
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self._max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self._window, self._dispatch)
+
+        # shield : l'annulation d'un appelant ne doit pas annuler le résultat partagé avec les autres
+        value = await asyncio.shield(future)
+        return self._clone(value) if value is not None and self._clone else value
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = self._loop.create_task(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: Dict[K, asyncio.Future]) -> None:
+        self.metrics.batches += 1
+        self.metrics.loaded += len(batch)
+        self.metrics.largest_batch = max(self.metrics.largest_batch, len(batch))
+        try:
+            results = await self._load_many(list(batch))
+        except Exception as exc:
+            self.metrics.errors += 1
+            _log.warning(f"--> {self.name} loader failed for {len(batch)} keys: {exc}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+
+def clone_document(document: Any) -> Any:
+    return document.model_copy(deep=True)
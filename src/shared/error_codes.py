@@ -32,6 +32,12 @@ class UserErrorCode(StrEnum):
     USER_DELETE_PRIMARY = "users/can-not-delete-user"
     INVALID_ATTRIBUTES = "users/invalid-attributes"
     USER_UNAUTHORIZED_PERFORM_ACTION = "users/unauthorized-action"
+    USER_INVALID_FIELDS = "users/invalid-fields"
+    USER_BATCH_TOO_LARGE = "users/batch-too-large"
+    USER_INVALID_CURSOR = "users/invalid-cursor"
+    USER_BULK_INVALID_OPERATION = "users/invalid-bulk-operation"
+    USER_INVALID_FILTER = "users/invalid-filter"
+    USER_INVALID_AUDIT_RANGE = "users/invalid-audit-range"
 
 
 class RoleErrorCode(StrEnum):
@@ -39,6 +45,7 @@ class RoleErrorCode(StrEnum):
     ROLE_CREATE_FAILED = "roles/create-role-failed"
     ROLE_UPDATE_INFO_FAILED = "roles/update-role-failed"
     ROLE_ALREADY_EXIST = "roles/role-already-exist"
+    ROLE_INVALID_FIELDS = "roles/invalid-fields"
 
 
 class ParamErrorCode(StrEnum):
@@ -46,3 +53,4 @@ class ParamErrorCode(StrEnum):
     PARAM_ALREADY_EXIST = "parameters/parameter-already-exist"
     PARAM_CREATE_FAILED = "parameters/create-parameter-failed"
     PARAM_UPDATE_INFO_FAILED = "parameters/update-parameter-failed"
+    PARAM_INVALID_FIELDS = "parameters/invalid-fields"
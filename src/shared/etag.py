@@ -0,0 +1,32 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak validator built from the values that change whenever the representation changes."""
+
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Weak comparison of ``etag`` with the ``If-None-Match`` request header (RFC 9110, 13.1.2)."""
+
+    if etag is None or not (header := request.headers.get("If-None-Match")):
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def with_etag(response: Response, etag: Optional[str]) -> Response:
+    if etag is not None:
+        response.headers["ETag"] = etag
+    return response
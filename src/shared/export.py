@@ -0,0 +1,40 @@
+import csv
+import io
+from typing import Any, Iterable, Mapping, Sequence
+
+import orjson
+
+from .utils import ExportFormat
+
+MEDIA_TYPES = {ExportFormat.NDJSON: "application/x-ndjson", ExportFormat.CSV: "text/csv"}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value, default=str).decode()
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def csv_header(columns: Sequence[str]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue().encode()
+
+
+def encode_batch(documents: Iterable[Mapping[str, Any]], export_format: ExportFormat, columns: Sequence[str]) -> bytes:
+    """
+    Encode one batch of raw MongoDB documents as NDJSON lines or CSV rows.
+
+    Batches are encoded independently so exports stream with a memory footprint bounded by the batch size.
+    ``columns`` only applies to CSV; nested values (``attributes``) are written as JSON.
+    """
+    if export_format == ExportFormat.NDJSON:
+        return b"".join(orjson.dumps(document, default=str, option=orjson.OPT_APPEND_NEWLINE) for document in documents)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for document in documents:
+        writer.writerow([_csv_value(document.get(column)) for column in columns])
+    return buffer.getvalue().encode()
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from starlette import status
+
+from src.common.helpers.exception import CustomHTTPException
+
+# Champ public -> (attribut du modèle à sérialiser, chemins MongoDB nécessaires pour le construire)
+Selectable = Mapping[str, Tuple[str, Sequence[str]]]
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """
+    Subset of fields requested by a client (``?fields=_id,fullname``).
+
+    ``projection`` is the MongoDB inclusion projection and ``include`` the matching pydantic ``include``;
+    both are ``None`` when every field was requested.
+    """
+
+    projection: Optional[Dict[str, int]] = None
+    include: Optional[Set[str]] = None
+
+    def page_include(self, page_fields: Iterable[str]) -> Optional[Dict[str, object]]:
+        """``include`` applied to the items of a page, keeping the page metadata (total, page, size...)."""
+
+        if self.include is None:
+            return None
+        return {**{name: True for name in page_fields if name != "items"}, "items": {"__all__": self.include}}
+
+
+def sparse_fieldset(fields: Optional[Union[str, Iterable[str]]], selectable: Selectable, code_error: StrEnum) -> Fieldset:
+    """
+    Turn a ``fields`` parameter into a projection restricted to ``selectable``.
+
+    ``fields`` is either a comma separated string or a list of names; ``_id`` is always returned.
+
+    :raises CustomHTTPException: If a requested field is not selectable.
+    """
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(",")]
+    requested = {field for field in fields or [] if field}
+    if not requested:
+        return Fieldset()
+
+    if unknown := requested - set(selectable):
+        raise CustomHTTPException(
+            code_error=code_error,
+            message_error=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed fields: {', '.join(selectable)}.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    requested.add("_id")
+    projection = {path: 1 for field in requested for path in selectable[field][1]}
+    include = {selectable[field][0] for field in requested}
+    return Fieldset(projection=projection, include=include)
@@ -0,0 +1,172 @@
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from pymongo import ASCENDING, DESCENDING
+from starlette import status
+
+from src.common.helpers.exception import CustomHTTPException
+
+WILDCARD = "$**"
+
+
+class FilterOperator(StrEnum):
+    EQ: str = "eq"
+    IN: str = "in"
+    GT: str = "gt"
+    GTE: str = "gte"
+    LT: str = "lt"
+    LTE: str = "lte"
+
+
+EQUALITY_OPERATORS = frozenset({FilterOperator.EQ, FilterOperator.IN})
+RANGE_OPERATORS = frozenset({FilterOperator.GT, FilterOperator.GTE, FilterOperator.LT, FilterOperator.LTE})
+
+
+@dataclass(frozen=True)
+class FilterField:
+    """A filterable field: MongoDB path, value type and allowed operators."""
+
+    path: str
+    type_: Any
+    operators: FrozenSet[FilterOperator]
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    filter: Dict[str, Any]
+    sort: List[Tuple[str, int]]
+    index: Tuple[str, ...]
+
+
+class QueryCompiler:
+    """
+    Compile ``field:operator:value`` filters and an ``order_by`` expression to a MongoDB filter and sort.
+
+    A query is only accepted when one of the declared ``indexes`` serves it following the
+    equality-sort-range rule: the equality fields form the index prefix, the sort fields come next in
+    index order (all ascending or all descending) and the single range field is either a sort field or
+    the following key. A wildcard index (``prefix.$**``) serves an equality on one ``prefix.<key>`` field
+    only when it is the whole query: no other equality, no range and no ``order_by``; the default sort is
+    then dropped since the index cannot provide it.
+    """
+
+    def __init__(
+        self,
+        fields: Mapping[str, FilterField],
+        sortable: Mapping[str, str],
+        indexes: Sequence[Sequence[str]],
+        code_error: StrEnum,
+        wildcard_type: Any = str,
+    ):
+        self.fields = fields
+        self.sortable = sortable
+        self.indexes = [tuple(keys) for keys in indexes]
+        self.code_error = code_error
+        self.wildcard_type = wildcard_type
+        self._wildcards = {keys[0].removesuffix(WILDCARD): keys for keys in self.indexes if keys[0].endswith(WILDCARD)}
+
+    def _error(self, message: str) -> CustomHTTPException:
+        return CustomHTTPException(code_error=self.code_error, message_error=message, status_code=status.HTTP_400_BAD_REQUEST)
+
+    def _field(self, name: str) -> FilterField:
+        if (field := self.fields.get(name)) is not None:
+            return field
+        if any(name.startswith(prefix) and len(name) > len(prefix) for prefix in self._wildcards):
+            return FilterField(path=name, type_=self.wildcard_type, operators=EQUALITY_OPERATORS)
+        raise self._error(f"Unknown filter field '{name}'. Allowed fields: {', '.join(self.fields)}.")
+
+    def _parse(self, expression: str) -> Tuple[FilterField, FilterOperator, Any]:
+        try:
+            name, operator, raw = expression.split(":", 2)
+            operator = FilterOperator(operator)
+        except ValueError as exc:
+            raise self._error(f"Invalid filter '{expression}', expected 'field:operator:value'.") from exc
+
+        field = self._field(name)
+        if operator not in field.operators:
+            allowed = ", ".join(sorted(field.operators))
+            raise self._error(f"Operator '{operator}' is not allowed on '{name}'. Allowed operators: {allowed}.")
+        try:
+            if operator == FilterOperator.IN:
+                return field, operator, TypeAdapter(List[field.type_]).validate_python(raw.split("|"))
+            return field, operator, TypeAdapter(field.type_).validate_python(raw)
+        except ValidationError as exc:
+            raise self._error(f"Invalid value '{raw}' for '{name}'.") from exc
+
+    def _parse_order(self, order_by: str) -> List[Tuple[str, int]]:
+        sort = []
+        for item in filter(None, (part.strip() for part in order_by.split(","))):
+            name, direction = (item[1:], DESCENDING) if item.startswith("-") else (item, ASCENDING)
+            if name not in self.sortable:
+                raise self._error(f"Cannot sort on '{name}'. Sortable fields: {', '.join(self.sortable)}.")
+            sort.append((self.sortable[name], direction))
+        return sort
+
+    def _unsupported(self) -> CustomHTTPException:
+        shapes = "; ".join(", ".join(keys) for keys in self.indexes)
+        return self._error(f"This combination of filters and sort is not supported. Supported index shapes: {shapes}.")
+
+    def _wildcard_index(self, equality: set) -> Optional[Tuple]:
+        for prefix, keys in self._wildcards.items():
+            if any(path.startswith(prefix) for path in equality):
+                return keys
+        return None
+
+    def _serving_index(self, equality: set, range_path: Optional[str], sort: List[Tuple[str, int]]) -> Optional[Tuple]:
+        sort_paths = [path for path, _ in sort]
+        if len({direction for _, direction in sort}) > 1:
+            return None
+        matched, sorted_count = len(equality), len(sort_paths)
+        for keys in self.indexes:
+            if keys[0].endswith(WILDCARD) or set(keys[:matched]) != equality:
+                continue
+            rest = keys[matched:]
+            if list(rest[:sorted_count]) != sort_paths:
+                continue
+            if (
+                range_path is None
+                or range_path in sort_paths
+                or (len(rest) > sorted_count and rest[sorted_count] == range_path)
+            ):
+                return keys
+        return None
+
+    def compile(
+        self,
+        filters: Optional[Iterable[str]] = None,
+        order_by: Optional[str] = None,
+        default_sort: Optional[List[Tuple[str, int]]] = None,
+        equals: Optional[Mapping[str, Any]] = None,
+    ) -> CompiledQuery:
+        """
+        :param filters: ``field:operator:value`` expressions, ``in`` values separated by ``|``.
+        :param order_by: Comma separated sortable fields, ``-`` prefix for descending order.
+        :param default_sort: Sort used when ``order_by`` is empty.
+        :param equals: Extra equality conditions (path -> value) from dedicated query parameters.
+        :raises CustomHTTPException: If a filter is invalid or no declared index serves the query.
+        """
+        query: Dict[str, Any] = dict(equals or {})
+        equality, ranges = set(query), set()
+        for field, operator, value in map(self._parse, filters or []):
+            if operator in EQUALITY_OPERATORS:
+                equality.add(field.path)
+                query[field.path] = {"$in": value} if operator == FilterOperator.IN else value
+            else:
+                ranges.add(field.path)
+                query.setdefault(field.path, {})[f"${operator}"] = value
+
+        if ranges & equality or len(ranges) > 1:
+            raise self._error("Only one field can be filtered by range, and not together with an equality on it.")
+
+        if (wildcard := self._wildcard_index(equality)) is not None:
+            # L'index wildcard ne couvre qu'un chemin : tout autre critère ou tri demanderait un parcours complet
+            if len(equality) > 1 or ranges or order_by:
+                raise self._unsupported()
+            return CompiledQuery(filter=query, sort=[], index=wildcard)
+
+        sort = self._parse_order(order_by) if order_by else list(default_sort or [])
+        if (index := self._serving_index(equality, next(iter(ranges), None), sort)) is None:
+            raise self._unsupported()
+        return CompiledQuery(filter=query, sort=sort, index=index)
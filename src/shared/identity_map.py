@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple, Type
+
+_documents: ContextVar[Optional[Dict[Tuple[str, str], Any]]] = ContextVar("identity_map", default=None)
+
+
+class IdentityMap:
+    """
+    Request-scoped cache of documents loaded by id.
+
+    Within a ``scope()`` (opened for every HTTP request by ``IdentityMapMiddleware``) the first load of a
+    document is remembered and later lookups of the same id return it without querying MongoDB again.
+    Services must ``evict`` what they write. Outside of a scope (startup tasks, CLI, direct service calls)
+    every method is a no-op, so lookups always hit the database.
+    """
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        token = _documents.set({})
+        try:
+            yield
+        finally:
+            _documents.reset(token)
+
+    @staticmethod
+    def _key(model: Type, document_id: Hashable) -> Tuple[str, str]:
+        return model.__name__, str(document_id)
+
+    def get(self, model: Type, document_id: Hashable) -> Optional[Any]:
+        if (documents := _documents.get()) is None:
+            return None
+        return documents.get(self._key(model, document_id))
+
+    def add(self, model: Type, document_id: Hashable, document: Any) -> None:
+        if (documents := _documents.get()) is not None:
+            documents[self._key(model, document_id)] = document
+
+    def evict(self, model: Type, document_id: Optional[Hashable] = None) -> None:
+        """Forget one document, or every document of ``model`` when ``document_id`` is omitted."""
+
+        if (documents := _documents.get()) is None:
+            return
+        if document_id is not None:
+            documents.pop(self._key(model, document_id), None)
+            return
+        for key in [key for key in documents if key[0] == model.__name__]:
+            del documents[key]
+
+
+identity_map = IdentityMap()
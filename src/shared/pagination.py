@@ -0,0 +1,109 @@
+import hashlib
+import time
+from enum import StrEnum
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Type
+
+import orjson
+from fastapi_pagination.api import create_page, resolve_params
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pydantic import BaseModel
+
+from src.config import settings
+
+
+class CountStrategy(StrEnum):
+    EXACT: str = "exact"
+    CACHED: str = "cached"
+    ESTIMATED: str = "estimated"
+
+
+class CountCache:
+    """
+    Short-lived cache of ``count_documents`` results, keyed by collection and filter.
+
+    Browsing the pages of one listing reuses the same total instead of scanning the filter again on every
+    page; totals may lag behind writes by at most ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._totals: Dict[str, Tuple[float, int]] = {}
+
+    @staticmethod
+    def _key(collection: AsyncIOMotorCollection, query_filter: Mapping[str, Any]) -> str:
+        encoded = orjson.dumps(query_filter, default=str, option=orjson.OPT_SORT_KEYS)
+        return f"{collection.name}:{hashlib.blake2b(encoded, digest_size=16).hexdigest()}"
+
+    async def count(self, collection: AsyncIOMotorCollection, query_filter: Mapping[str, Any]) -> int:
+        key, now = self._key(collection, query_filter), time.monotonic()
+        if (cached := self._totals.get(key)) is not None and cached[0] > now:
+            return cached[1]
+
+        total = await collection.count_documents(query_filter)
+        # Purge des entrées expirées pour borner la taille du cache
+        self._totals = {k: v for k, v in self._totals.items() if v[0] > now}
+        self._totals[key] = (now + self.ttl, total)
+        return total
+
+    def clear(self) -> None:
+        self._totals.clear()
+
+
+count_cache = CountCache(ttl=settings.PAGINATION_COUNT_TTL)
+
+
+async def count_total(
+    collection: AsyncIOMotorCollection, query_filter: Mapping[str, Any], strategy: CountStrategy = CountStrategy.CACHED
+) -> int:
+    if strategy == CountStrategy.ESTIMATED:
+        return await collection.estimated_document_count()
+    if strategy == CountStrategy.CACHED:
+        return await count_cache.count(collection, query_filter)
+    return await collection.count_documents(query_filter)
+
+
+async def paginate_collection(
+    collection: AsyncIOMotorCollection,
+    query_filter: Mapping[str, Any],
+    transformer: Callable[[List[Dict[str, Any]]], Awaitable[Sequence[Any]]],
+    sort: Optional[List[Tuple[str, int]]] = None,
+    projection: Optional[Mapping[str, Any]] = None,
+    include_total: bool = True,
+    count_strategy: Optional[CountStrategy] = None,
+):
+    """
+    Paginate raw documents with ``skip``/``limit`` executed by MongoDB.
+
+    Only the requested page is loaded, as plain dicts; ``transformer`` turns them into the response items.
+    The page type is the one declared by the route ``response_model`` (``customize_page``).
+
+    ``total`` is skipped when ``include_total`` is false. Otherwise it is estimated from the collection
+    metadata for an empty filter and served from ``count_cache`` for filtered queries, unless
+    ``count_strategy`` says otherwise.
+    """
+    params = resolve_params()
+    raw_params = params.to_raw_params().as_limit_offset()
+
+    total = None
+    if include_total and raw_params.include_total:
+        strategy = count_strategy or (CountStrategy.CACHED if query_filter else CountStrategy.ESTIMATED)
+        total = await count_total(collection, query_filter, strategy)
+
+    cursor = collection.find(
+        query_filter,
+        projection=projection,
+        sort=sort,
+        skip=raw_params.offset or 0,
+        limit=raw_params.limit or 0,
+    )
+    items = await transformer(await cursor.to_list(length=None))
+    return create_page(items, total=total, params=params)
+
+
+def construct_items(model: Type[BaseModel]) -> Callable[[List[Dict[str, Any]]], Awaitable[List[BaseModel]]]:
+    """Transformer wrapping trusted raw documents in ``model`` with ``model_construct`` (no validation)."""
+
+    async def transformer(documents: List[Dict[str, Any]]) -> List[BaseModel]:
+        return [model.model_construct(**document) for document in documents]
+
+    return transformer
@@ -0,0 +1,41 @@
+import asyncio
+import contextlib
+import logging
+from typing import Awaitable, Callable, Optional
+
+from pymongo.errors import PyMongoError
+
+_log = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Run ``func`` every ``interval`` seconds in the background of the application process.
+
+    Database errors are logged and the next run happens as planned.
+    """
+
+    def __init__(self, name: str, interval: float, func: Callable[[], Awaitable[object]]):
+        self.name = name
+        self._interval = interval
+        self._func = func
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self._func()
+            except PyMongoError as exc:
+                _log.error(f"--> {self.name} failed: {exc}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
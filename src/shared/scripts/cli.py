@@ -1,5 +1,11 @@
+import gzip
+import sys
+import time
 from datetime import datetime, timezone
+from itertools import islice
+from typing import List, Optional
 
+import orjson
 import pymongo
 import typer
 import yaml
@@ -7,7 +13,9 @@ from email_validator import EmailNotValidError, validate_email
 from slugify import slugify
 
 from src.config import settings
-from .utils import BASE_URL, make_request
+from src.shared.bulk_import import iter_rows
+from src.shared.utils import ExportFormat
+from .utils import BASE_URL, make_request, stream_request
 
 app = typer.Typer(pretty_exceptions_enable=False)
 
@@ -91,6 +99,81 @@ def load_params_data(filepath: str):
         client.close()
 
 
+@app.command(name="export-users", help="Export users as NDJSON or CSV, streamed from the export API.")
+def export_users(
+    access_token: str = typer.Option(..., "--token", envvar="AUTH_CLI_TOKEN", help="Access token with auth:can-display-user"),
+    output: str = typer.Option("-", "--output", "-o", help="Output file, '-' for stdout"),
+    export_format: ExportFormat = typer.Option(ExportFormat.NDJSON, "--format", "-f", help="ndjson or csv"),
+    query: Optional[str] = typer.Option(None, "--query", "-q", help="Filter by email, fullname or attribute"),
+    active: Optional[bool] = typer.Option(None, "--active/--inactive", help="Filter by account state"),
+    filters: Optional[List[str]] = typer.Option(None, "--filter", help="Repeatable 'field:operator:value' filter"),
+    order_by: Optional[str] = typer.Option(None, "--order-by", help="Comma separated sort fields, e.g. '-last_login'"),
+    batch_size: int = typer.Option(settings.EXPORT_BATCH_SIZE, "--batch-size", min=1, help="Documents read per batch"),
+    compress: bool = typer.Option(False, "--gzip", help="Gzip the output"),
+):
+    params = {"format": export_format, "batch_size": batch_size, "query": query, "active": active}
+    params.update({"filter": filters or None, "order_by": order_by})
+    params = {key: value for key, value in params.items() if value is not None}
+
+    sink = sys.stdout.buffer if output == "-" else open(output, "wb")
+    stream = gzip.GzipFile(fileobj=sink, mode="wb") if compress else sink
+    lines = 0
+    try:
+        with stream_request("get", f"{BASE_URL}/users/_export", access_token=access_token, params=params) as response:
+            for chunk in response.iter_bytes():
+                stream.write(chunk)
+                lines += chunk.count(b"\n")
+    finally:
+        if compress:
+            stream.close()
+        if sink is not sys.stdout.buffer:
+            sink.close()
+
+    # La ligne d'en-tête du CSV n'est pas un utilisateur
+    total = lines - 1 if export_format == ExportFormat.CSV and lines else lines
+    typer.echo(f"{total} users exported.", err=True)
+
+
+@app.command(name="import-users", help="Import users from an NDJSON or CSV file through the bulk import API.")
+def import_users(
+    filepath: str,
+    access_token: str = typer.Option(..., "--token", envvar="AUTH_CLI_TOKEN", help="Access token with auth:can-create-user"),
+    export_format: Optional[ExportFormat] = typer.Option(None, "--format", "-f", help="ndjson or csv (default: file suffix)"),
+    batch_size: int = typer.Option(settings.IMPORT_BATCH_SIZE, "--batch-size", min=1, help="Rows sent per request"),
+):
+    export_format = export_format or (ExportFormat.CSV if filepath.lower().endswith(".csv") else ExportFormat.NDJSON)
+    api_url = f"{BASE_URL}/users/_import"
+    total = inserted = 0
+    started = time.perf_counter()
+    with open(filepath, "rb") as fd:
+        rows = iter_rows(fd, export_format)
+        while batch := list(islice(rows, batch_size)):
+            # Les lignes illisibles sont rapportées ici, seules les lignes valides sont envoyées
+            for row in batch:
+                if row.error:
+                    typer.echo(f"row {row.index}: {row.error}", err=True)
+            sent = [row for row in batch if row.error is None]
+            total += len(batch)
+            if not sent:
+                continue
+
+            content = b"".join(orjson.dumps(row.data, option=orjson.OPT_APPEND_NEWLINE) for row in sent)
+            response = make_request(
+                method="post", url=api_url, access_token=access_token, params={"format": ExportFormat.NDJSON}, content=content
+            )
+            report = response.json() if response.is_success else {}
+            if not {"inserted", "errors"} <= report.keys():
+                typer.echo(f"Unexpected import response: {response.text}", err=True)
+                raise typer.Exit(code=1)
+            inserted += report["inserted"]
+            # Les positions rapportées par l'API sont celles du lot envoyé
+            for error in report["errors"]:
+                typer.echo(f"row {sent[error['row'] - 1].index}: {error['error']}", err=True)
+
+    elapsed = time.perf_counter() - started
+    typer.echo(f"{inserted}/{total} users imported in {elapsed:.1f}s ({total / elapsed if elapsed else total:.0f} rows/s).")
+
+
 @app.command(name="create-role-and-assign-permissions", help="Create a role and assign permissions")
 def create_role_and_assign_permissions():
     """
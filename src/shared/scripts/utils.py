@@ -1,4 +1,5 @@
-from typing import Optional, Union
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
 
 import httpx
 import typer
@@ -15,6 +16,7 @@ def make_request(
     params: Optional[dict] = None,
     json: Optional[Union[str, dict, list]] = None,
     data: Optional[Union[str, dict, list]] = None,
+    content: Optional[bytes] = None,
 ) -> httpx.Response:
     """
     Make an HTTP request using the specified method.
@@ -28,7 +30,7 @@ def make_request(
         if method.lower() in ("get", "delete", "head"):
             response = getattr(client, method)(url, headers=headers, params=params)
         elif method.lower() in ("post", "put", "patch"):
-            response = client.request(method, url, headers=headers, params=params, json=json, data=data)
+            response = client.request(method, url, headers=headers, params=params, json=json, data=data, content=content)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
@@ -39,3 +41,22 @@ def make_request(
         raise typer.Exit(code=1) from exc
 
     return response
+
+
+@contextmanager
+def stream_request(
+    method: str, url: str, access_token: Optional[str] = None, params: Optional[dict] = None
+) -> Iterator[httpx.Response]:
+    """
+    Make an HTTP request whose response body is read incrementally with ``iter_bytes``.
+    Raises:
+        typer.Exit: If the API request fails.
+    """
+    headers = {"Authorization": f"Bearer {access_token}"}
+    # Pas de délai de lecture : un export volumineux peut durer plus de 30 secondes
+    with httpx.Client(timeout=httpx.Timeout(30, read=None)) as client:
+        with client.stream(method, url, headers=headers, params=params) as response:
+            if not response.is_success:
+                typer.echo(f"API error: {response.read().decode(errors='replace')}", err=True)
+                raise typer.Exit(code=1)
+            yield response
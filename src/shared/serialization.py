@@ -0,0 +1,30 @@
+from typing import Any, Generic, Mapping, Optional, Type, TypeVar
+
+from pydantic import TypeAdapter
+from starlette import status
+from starlette.responses import Response
+
+T = TypeVar("T")
+
+
+class JSONSerializer(Generic[T]):
+    """
+    JSON serializer compiled once per response type.
+
+    Routes returning ``serializer.response(value)`` send bytes produced by pydantic-core in a single pass:
+    FastAPI skips the ``response_model`` re-validation and ``jsonable_encoder`` walk for ``Response`` objects,
+    so values built with ``model_construct`` from trusted data are never validated again.
+    The route ``response_model`` is kept for the OpenAPI schema only.
+    """
+
+    def __init__(self, type_: Type[T], exclude: Optional[Mapping[str, Any]] = None):
+        self._adapter = TypeAdapter(type_)
+        self._exclude = exclude
+
+    def dump(self, value: T, include: Optional[Mapping[str, Any] | set] = None) -> bytes:
+        return self._adapter.dump_json(value, by_alias=True, include=include, exclude=self._exclude)
+
+    def response(
+        self, value: T, status_code: int = status.HTTP_200_OK, include: Optional[Mapping[str, Any] | set] = None
+    ) -> Response:
+        return Response(content=self.dump(value, include=include), status_code=status_code, media_type="application/json")
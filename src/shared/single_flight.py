@@ -0,0 +1,55 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class FlightMetrics:
+    started: int = 0
+    shared: int = 0
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesce identical concurrent lookups: one in-flight call per key, awaited by every caller.
+
+    When a hot entry expires, the first caller starts the lookup and later callers with the same key
+    wait for that same call instead of querying MongoDB again. The entry is dropped as soon as the call
+    completes, so results are never cached beyond the flight.
+
+    Each caller awaits the shared task through ``asyncio.shield``: a cancelled caller leaves the lookup
+    running for the others. An exception raised by the lookup is raised to every caller.
+
+    :param name: Name used in metrics.
+    :type name: str
+    :param clone: Function returning the copy handed to each caller, for mutable results such as documents.
+    """
+
+    def __init__(self, name: str, clone: Optional[Callable[[V], V]] = None):
+        self.name = name
+        self.metrics = FlightMetrics()
+        self._clone = clone
+        self._calls: Dict[K, asyncio.Task] = {}
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not loop:
+            self.metrics.started += 1
+            task = self._calls[key] = loop.create_task(func())
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.metrics.shared += 1
+
+        value = await asyncio.shield(task)
+        return self._clone(value) if value is not None and self._clone else value
+
+    def _forget(self, key: K, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Marquer l'exception comme consommée si tous les appelants ont été annulés entre-temps
+        if not task.cancelled():
+            task.exception()
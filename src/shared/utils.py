@@ -1,17 +1,22 @@
 import logging
 import os
+import re
+from contextlib import contextmanager
 from enum import StrEnum
 from pathlib import Path
 from secrets import compare_digest
-from typing import Any, Callable, Optional, TypeVar
+from typing import Any, Callable, Iterator, Optional, TypeVar
 
 import pyotp
-from fastapi import Request, Response
+from fastapi import Request, Response, status
 from pwdlib import PasswordHash
 from pwdlib.hashers.argon2 import Argon2Hasher
 from pwdlib.hashers.bcrypt import BcryptHasher
+from pymongo.errors import DuplicateKeyError
 from slugify import slugify
 
+from src.common.helpers.exception import CustomHTTPException
+
 password_context = PasswordHash((Argon2Hasher(), BcryptHasher()))
 
 logging.basicConfig(format="%(message)s", level=logging.INFO)
@@ -26,11 +31,58 @@ class SortEnum(StrEnum):
     DESC: str = "desc"
 
 
+class ChangeType(StrEnum):
+    CREATED: str = "created"
+    UPDATED: str = "updated"
+    DEACTIVATED: str = "deactivated"
+    PENDING: str = "pending"
+    DELETED: str = "deleted"
+
+
+class UserBulkAction(StrEnum):
+    ACTIVATE: str = "activate"
+    DEACTIVATE: str = "deactivate"
+    REASSIGN_ROLE: str = "reassign-role"
+
+
+class ExportFormat(StrEnum):
+    NDJSON: str = "ndjson"
+    CSV: str = "csv"
+
+
+class AuditPeriod(StrEnum):
+    HOUR: str = "hour"
+    DAY: str = "day"
+
+
+class AuditScope(StrEnum):
+    USER: str = "user"
+    ROLE: str = "role"
+
+
 class AccountAction(StrEnum):
     ACTIVATE: str = "activate"
     DEACTIVATE: str = "deactivate"
 
 
+@contextmanager
+def raise_on_duplicate_key(code_error: StrEnum, message_error: str) -> Iterator[None]:
+    """
+    Map a unique index violation raised by the wrapped write to a ``CustomHTTPException``.
+
+    Uniqueness is enforced by the database indexes, so writes are attempted directly
+    instead of being preceded by an ``exists()`` query.
+    """
+    try:
+        yield
+    except DuplicateKeyError as exc:
+        raise CustomHTTPException(
+            code_error=code_error,
+            message_error=message_error,
+            status_code=status.HTTP_400_BAD_REQUEST,
+        ) from exc
+
+
 def custom_key_builder(service_name: str, *args, **kwargs):
     def _key_builder(
         func: Callable[..., Any],
@@ -64,6 +116,30 @@ def custom_key_builder(service_name: str, *args, **kwargs):
     return _key_builder
 
 
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Canonical form of an e-mail address, as stored in ``email_norm``."""
+    if not email or not (value := email.strip()):
+        return None
+    return value.lower()
+
+
+def normalize_phonenumber(phonenumber: Optional[str]) -> Optional[str]:
+    """
+    Canonical E.164 form of a phone number, as stored in ``phone_norm``.
+
+    Separators are dropped, a leading international ``00`` prefix is rewritten to ``+``
+    and numbers without any prefix get a ``+``, so ``2250151571396``, ``+225 01 51 57 13 96``
+    and ``002250151571396`` all resolve to ``+2250151571396``.
+    """
+    if not phonenumber:
+        return None
+    value = re.sub(r"[\s\-.()]", "", phonenumber)
+    if value.startswith("00"):
+        value = value[2:]
+    value = value.lstrip("+")
+    return f"+{value}" if value else None
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return password_context.verify(password=plain_password, hash=hashed_password)
 
@@ -0,0 +1,57 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Set
+
+from .periodic import PeriodicTask
+
+
+class WriteBehindBuffer(ABC):
+    """
+    Base of the in-memory buffers written to MongoDB in the background of the application process.
+
+    Subclasses hold the pending items, report their number with ``__len__`` and write them in ``flush``,
+    which returns the number of items written and never raises on database errors.
+    The buffer is flushed every ``flush_interval`` seconds, as soon as it holds ``max_pending`` items, and on stop.
+
+    :param name: Name used in logs.
+    :type name: str
+    :param flush_interval: Number of seconds between two periodic flushes.
+    :type flush_interval: int
+    :param max_pending: Number of buffered items that triggers an early flush.
+    :type max_pending: int
+    """
+
+    def __init__(self, name: str, flush_interval: int, max_pending: int):
+        self._max_pending = max_pending
+        self._flusher = PeriodicTask(name, flush_interval, self.flush)
+        # Références des flush anticipés : une tâche non référencée peut être collectée avant sa fin
+        self._early_flushes: Set[asyncio.Task] = set()
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Number of pending items.
+        """
+        pass
+
+    @abstractmethod
+    async def flush(self) -> int:
+        """
+        Write the pending items and return how many were written.
+        """
+        pass
+
+    def _flush_if_full(self) -> None:
+        if len(self) >= self._max_pending:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._early_flushes.add(task)
+            task.add_done_callback(self._early_flushes.discard)
+
+    def start(self) -> None:
+        self._flusher.start()
+
+    async def stop(self) -> None:
+        await self._flusher.stop()
+        if self._early_flushes:
+            await asyncio.gather(*self._early_flushes, return_exceptions=True)
+        await self.flush()
@@ -0,0 +1,80 @@
+"""
+Memory and time comparison between the Beanie document path and the lean read models used by listings.
+
+Usage: python -m tests.benchmarks.bench_read_models [number_of_users]
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from dotenv import load_dotenv
+
+load_dotenv("tests/.test.env", override=True)
+
+from beanie import init_beanie, PydanticObjectId  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+
+from src.config import settings  # noqa: E402
+from src.models import Role, User, UserOut  # noqa: E402
+from src.schemas import USER_READ_PROJECTION  # noqa: E402
+from src.services.users import get_role_info, to_user_read_models  # noqa: E402
+
+EXCLUDE = {"password", "is_primary", "attributes.otp_secret", "attributes.otp_created_at"}
+
+
+async def document_path():
+    users_list = await User.find({}).to_list()
+    return [
+        UserOut(**user.model_dump(by_alias=True, mode="json", exclude=EXCLUDE), extras={"role_info": get_role_info(user)})
+        for user in users_list
+        if user.is_primary is False
+    ]
+
+
+async def read_model_path():
+    cursor = User.get_motor_collection().find({"is_primary": {"$ne": True}}, projection=USER_READ_PROJECTION)
+    return await to_user_read_models(await cursor.to_list(length=None))
+
+
+async def measure(label: str, func) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    items = await func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} items={len(items):<6} peak={peak / 1024 / 1024:8.2f} MiB  time={elapsed * 1000:8.1f} ms")
+
+
+async def main(count: int) -> None:
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client[settings.MONGO_DB], document_models=[User, Role])
+
+    role = await Role(name="Benchmark").create()
+    summary = role.summary().model_dump(by_alias=True)
+    await User.get_motor_collection().insert_many(
+        [
+            {
+                "_id": PydanticObjectId(),
+                "email": f"user{index}@example.com",
+                "email_norm": f"user{index}@example.com",
+                "fullname": f"User {index}",
+                "role": role.id,
+                "role_summary": summary,
+                "password": "x" * 60,
+                "attributes": {"city": "Abidjan", "otp_secret": "secret", "index": str(index)},
+                "is_active": True,
+                "is_primary": False,
+            }
+            for index in range(count)
+        ]
+    )
+
+    await measure("documents", document_path)
+    await measure("read models", read_model_path)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,66 @@
+"""
+Per-request CPU cost of serializing a user, before (re-validation + jsonable_encoder) and after (precompiled serializer).
+
+Usage: python -m tests.benchmarks.bench_serialization [iterations]
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, UTC
+
+from dotenv import load_dotenv
+
+load_dotenv("tests/.test.env", override=True)
+
+from beanie import PydanticObjectId  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from src.models import User, USER_HIDDEN_FIELDS, UserOut  # noqa: E402
+from src.schemas import RoleSummary  # noqa: E402
+from src.services.users import get_role_info, to_user_out  # noqa: E402
+from src.shared.serialization import JSONSerializer  # noqa: E402
+
+EXCLUDE = {"password", "is_primary", "attributes.otp_secret", "attributes.otp_created_at"}
+serializer = JSONSerializer(UserOut, exclude=USER_HIDDEN_FIELDS)
+
+
+def build_user() -> User:
+    return User.model_construct(
+        id=PydanticObjectId(),
+        email="user@example.com",
+        phonenumber="+2250101010101",
+        fullname="John Doe",
+        role=PydanticObjectId(),
+        role_summary=RoleSummary(_id=PydanticObjectId(), name="Manager", slug="manager"),
+        password="x" * 60,
+        attributes={"city": "Abidjan", "country": "CI", "otp_secret": "secret"},
+        is_active=True,
+        is_primary=False,
+        created_at=datetime.now(tz=UTC),
+        updated_at=datetime.now(tz=UTC),
+    )
+
+
+def previous_path(user: User) -> bytes:
+    result = UserOut(**user.model_dump(by_alias=True, mode="json", exclude=EXCLUDE), extras={"role_info": get_role_info(user)})
+    return json.dumps(jsonable_encoder(result, by_alias=True, exclude=EXCLUDE)).encode()
+
+
+def serializer_path(user: User) -> bytes:
+    return serializer.dump(to_user_out(user))
+
+
+def measure(label: str, func, user: User, iterations: int) -> None:
+    started = time.process_time()
+    for _ in range(iterations):
+        func(user)
+    cpu = time.process_time() - started
+    print(f"{label:<12} cpu/request={cpu / iterations * 1_000_000:8.1f} µs")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sample = build_user()
+    measure("previous", previous_path, sample, count)
+    measure("serializer", serializer_path, sample, count)
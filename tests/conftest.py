@@ -34,6 +34,16 @@ def mock_redis_client():
         yield mock_redis
 
 
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    from src.services import roles
+    from src.shared.pagination import count_cache
+
+    count_cache.clear()
+    roles._role_ids_by_slug.clear()
+    yield
+
+
 @pytest.fixture()
 def fixture_models():
     from src import models
@@ -54,7 +64,15 @@ async def mock_mongodb_client(mock_app_instance, fixture_models):
     mock_app_instance.mongo_db_client = client[settings.MONGO_DB]
     await init_beanie(
         database=mock_app_instance.mongo_db_client,
-        document_models=[fixture_models.User, fixture_models.Role],
+        document_models=[
+            fixture_models.User,
+            fixture_models.Role,
+            fixture_models.Params,
+            fixture_models.UserStat,
+            fixture_models.UserArchive,
+            fixture_models.LoginRollup,
+            fixture_models.UserTombstone,
+        ],
     )
     yield client
 
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import pytest
 from slugify import slugify
 from starlette import status
@@ -112,6 +114,72 @@ async def test_update_role_success(
     mock_check_permissions_handler.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_update_role_refreshes_user_role_summary(
+    http_client_api,
+    fixture_models,
+    fake_role_collection,
+    fake_role_data,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    fake_role_data.update({"name": "Developpeur"})
+
+    response = await http_client_api.put(
+        f"/roles/{fake_role_collection.id}", json=fake_role_data, headers={"Authorization": "Bearer valid_token"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    user = await fixture_models.User.get(fake_user_collection.id)
+    assert user.role_summary.name == fake_role_data["name"]
+    assert user.role_summary.slug == slugify(fake_role_data["name"])
+    assert user.role_summary.version == response.json()["version"]
+
+
+@pytest.mark.asyncio
+async def test_update_role_description_keeps_members_untouched(
+    http_client_api,
+    fixture_models,
+    fake_role_collection,
+    fake_role_data,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    before = await fixture_models.User.get(fake_user_collection.id)
+    fake_role_data.update({"name": fake_role_collection.name, "description": "Nouvelle description"})
+
+    response = await http_client_api.put(
+        f"/roles/{fake_role_collection.id}", json=fake_role_data, headers={"Authorization": "Bearer valid_token"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["description"] == "Nouvelle description"
+
+    user = await fixture_models.User.get(fake_user_collection.id)
+    assert (user.role_summary, user.updated_at) == (before.role_summary, before.updated_at)
+
+
+@pytest.mark.asyncio
+async def test_delete_role_unsets_user_role_summary(
+    http_client_api,
+    fixture_models,
+    fake_role_collection,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    await fake_user_collection.set({"role_summary": fake_role_collection.summary().model_dump(by_alias=True)})
+
+    response = await http_client_api.delete(
+        f"/roles/{fake_role_collection.id}", headers={"Authorization": "Bearer valid_token"}
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT, response.text
+
+    user = await fixture_models.User.get(fake_user_collection.id)
+    assert user.role_summary is None
+
+
 @pytest.mark.asyncio
 async def test_update_role_not_found(
     http_client_api,
@@ -135,6 +203,31 @@ async def test_update_role_not_found(
     mock_check_permissions_handler.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_update_role_name_already_exists(
+    http_client_api,
+    fixture_models,
+    fake_role_collection,
+    fake_role_data,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    other_role = await fixture_models.Role(name="Manager").create()
+    fake_role_data.update({"name": fake_role_collection.name})
+
+    response = await http_client_api.put(
+        f"/roles/{other_role.id}", json=fake_role_data, headers={"Authorization": "Bearer valid_token"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+    assert response.json() == {
+        "code_error": "roles/role-already-exist",
+        "message_error": f"Role with name '{fake_role_collection.name}' already exists.",
+    }
+
+    mock_verify_access_token.assert_called_once()
+    mock_check_permissions_handler.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_update_user_bad_request(
     http_client_api,
@@ -174,6 +267,35 @@ async def test_get_role_members_succes(
     mock_check_permissions_handler.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_get_role_members_paginated_by_database(
+    http_client_api,
+    fixture_models,
+    fake_role_collection,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    # Date explicite : les deux membres pourraient sinon partager la même milliseconde dans la base de test
+    await fixture_models.User(
+        email="second.member@example.com",
+        role=fake_role_collection.id,
+        is_active=True,
+        created_at=fake_user_collection.created_at + timedelta(seconds=1),
+    ).create()
+    url, headers = f"/roles/{fake_role_collection.name}/members", {"Authorization": "Bearer valid_token"}
+
+    response = await http_client_api.get(url, params={"size": 1, "page": 2, "sorting": "asc"}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["total"] == 2
+    assert [item["email"] for item in response.json()["items"]] == ["second.member@example.com"]
+
+    response = await http_client_api.get(url, params={"include_total": False}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["total"] is None
+    assert len(response.json()["items"]) == 2
+
+
 @pytest.mark.asyncio
 async def test_delete_role_not_found(
     http_client_api,
@@ -203,3 +325,44 @@ async def test_delete_role_success(
     mock_verify_access_token.assert_called_once()
     mock_verify_access_token.assert_called_once_with("valid_token")
     mock_check_permissions_handler.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_read_role_with_fields(
+    http_client_api,
+    fake_role_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    response = await http_client_api.get(
+        f"/roles/{fake_role_collection.id}", params={"fields": "name,slug"}, headers={"Authorization": "Bearer valid_token"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json() == {
+        "_id": str(fake_role_collection.id),
+        "name": fake_role_collection.name,
+        "slug": fake_role_collection.slug,
+    }
+
+
+@pytest.mark.asyncio
+async def test_listing_roles_by_permission(
+    http_client_api,
+    fake_role_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    assert fake_role_collection.permission_codes == ["perm-1"]
+
+    response = await http_client_api.get(
+        "/roles/_by-permission", params={"code": "perm-1"}, headers={"Authorization": "Bearer valid_token"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert [item["_id"] for item in response.json()["items"]] == [str(fake_role_collection.id)]
+
+    response = await http_client_api.get(
+        "/roles/_by-permission", params={"code": "perm-unknown"}, headers={"Authorization": "Bearer valid_token"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["items"] == []
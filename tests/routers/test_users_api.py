@@ -1,9 +1,12 @@
+import json
 import os
+from datetime import datetime, UTC
 
 import pytest
 from starlette import status
 
 from src.common.helpers.error_codes import AppErrorCode
+from src.services import stats
 from src.shared.error_codes import AuthErrorCode, UserErrorCode
 
 
@@ -99,6 +102,22 @@ async def test_listing_users_success(http_client_api, mock_verify_access_token,
     mock_check_permissions_handler.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_listing_users_total_excludes_primary_user(
+    http_client_api,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    await fake_user_collection.get_motor_collection().insert_one(
+        {"email": "admin@example.com", "is_primary": True, "is_active": True}
+    )
+
+    response = await http_client_api.get("/users", headers={"Authorization": "Bearer valid_token"})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["total"] == len(response.json()["items"]) == 1
+
+
 async def test_listing_users_with_query_success(
     http_client_api,
     fake_user_collection,
@@ -130,6 +149,7 @@ async def test_read_user_success(
     assert response.status_code == status.HTTP_200_OK, response.text
     assert response.json()["_id"] == str(id_user)
     assert response.json()["email"] == fake_user_collection.email
+    assert "role_summary" not in response.json()
 
     mock_verify_access_token.assert_called_once()
     mock_verify_access_token.assert_called_once_with("valid_token")
@@ -319,3 +339,269 @@ async def test_activate_user_account_acction_uses_cases(
     mock_check_permissions_handler.assert_called()
 
     mock_check_check_user_access_handler.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_users_with_fields(http_client_api, fake_role_collection, fake_user_collection):
+    response = await http_client_api.post(
+        "/users/_batch",
+        json={"ids": [str(fake_user_collection.id), "66e85363aa07cb1e95d3e3d0"], "fields": ["fullname", "role_info"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert list(response.json()) == [str(fake_user_collection.id)]
+    user = response.json()[str(fake_user_collection.id)]
+    assert set(user) == {"_id", "fullname", "extras"}
+    assert user["extras"]["role_info"]["name"] == fake_role_collection.name
+
+
+@pytest.mark.asyncio
+async def test_batch_users_unknown_field(http_client_api, fake_user_collection):
+    response = await http_client_api.post("/users/_batch", json={"ids": [str(fake_user_collection.id)], "fields": ["password"]})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+    assert response.json()["code_error"] == "users/invalid-fields"
+
+
+@pytest.mark.asyncio
+async def test_listing_users_with_fields(
+    http_client_api,
+    fake_role_collection,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    response = await http_client_api.get(
+        "/users", params={"fields": "fullname,role_info"}, headers={"Authorization": "Bearer valid_token"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["total"] == 1
+    assert response.json()["items"] == [
+        {
+            "_id": str(fake_user_collection.id),
+            "fullname": fake_user_collection.fullname,
+            "extras": {"role_info": fake_role_collection.summary().model_dump(by_alias=True, mode="json")},
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_read_user_not_modified(
+    http_client_api,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    url, headers = f"/users/{fake_user_collection.id}", {"Authorization": "Bearer valid_token"}
+    response = await http_client_api.get(url, headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    etag = response.headers["ETag"]
+
+    response = await http_client_api.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED, response.text
+    assert response.content == b""
+
+    await fake_user_collection.set({"fullname": "Jane Doe", "updated_at": datetime.now(tz=UTC)})
+    response = await http_client_api.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_users_changes_feed(http_client_api, fake_role_collection, fake_user_collection):
+    response = await http_client_api.get("/users/_changes", params={"limit": 10})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    page = response.json()
+    assert [item["_id"] for item in page["items"]] == [str(fake_user_collection.id)]
+    assert page["items"][0]["extras"]["change"] == "created"
+    assert page["has_more"] is False
+    cursor = page["next_cursor"]
+
+    response = await http_client_api.get("/users/_changes", params={"since": cursor})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["items"] == []
+    assert response.json()["next_cursor"] == cursor
+
+    await fake_user_collection.set({"is_active": False, "updated_at": datetime.now(tz=UTC)})
+    response = await http_client_api.get("/users/_changes", params={"since": cursor})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert [item["extras"]["change"] for item in response.json()["items"]] == ["deactivated"]
+
+
+@pytest.mark.asyncio
+async def test_users_changes_invalid_cursor(http_client_api):
+    response = await http_client_api.get("/users/_changes", params={"since": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+    assert response.json()["code_error"] == UserErrorCode.USER_INVALID_CURSOR
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+async def test_export_users(
+    http_client_api,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+    export_format,
+):
+    response = await http_client_api.get(
+        "/users/_export",
+        params={"format": export_format, "batch_size": 1},
+        headers={"Authorization": "Bearer valid_token"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    lines = response.text.splitlines()
+    if export_format == "csv":
+        assert response.headers["content-type"].startswith("text/csv")
+        assert lines[0].startswith("_id,email,")
+        lines = lines[1:]
+    assert len(lines) == 1
+    assert str(fake_user_collection.id) in lines[0]
+    assert "password" not in lines[0]
+
+
+@pytest.mark.asyncio
+async def test_export_users_uses_listing_filters(
+    http_client_api,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    headers = {"Authorization": "Bearer valid_token"}
+    response = await http_client_api.get(
+        "/users/_export", params={"filter": f"role:eq:{fake_user_collection.role}", "order_by": "-created_at"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert str(fake_user_collection.id) in response.text
+
+    response = await http_client_api.get(
+        "/users/_export", params={"filter": "role:eq:66e85363aa07cb1e95d3e3d0"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.text == ""
+
+    response = await http_client_api.get("/users/_export", params={"order_by": "email"}, headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+
+
+@pytest.mark.asyncio
+async def test_import_users(
+    http_client_api,
+    fake_role_collection,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    role = str(fake_role_collection.id)
+    rows = [
+        {"email": "new.user@example.com", "role": role, "password": "secret", "attributes": {"city": "Abidjan"}},
+        {"email": fake_user_collection.email.upper(), "role": role},
+        {"email": "orphan@example.com", "role": "unknown-role"},
+        {"phonenumber": "+2250707070707", "role": fake_role_collection.slug},
+        {"email": "NEW.user@example.com", "role": role},
+    ]
+    content = "\n".join(json.dumps(row) for row in rows[:3]) + "\n{not json\n" + "\n".join(json.dumps(row) for row in rows[3:])
+
+    response = await http_client_api.post(
+        "/users/_import",
+        params={"format": "ndjson", "batch_size": 2},
+        content=content,
+        headers={"Authorization": "Bearer valid_token"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    report = response.json()
+    assert (report["total"], report["inserted"], report["failed"]) == (6, 2, 4)
+    assert [error["row"] for error in report["errors"]] == [2, 3, 4, 6]
+
+    response = await http_client_api.get("/users/_export", headers={"Authorization": "Bearer valid_token"})
+    assert "new.user@example.com" in response.text
+    assert "secret" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_and_delete_users(
+    http_client_api,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+    mock_redis_client,
+):
+    headers = {"Authorization": "Bearer valid_token"}
+    response = await http_client_api.patch(
+        "/users/_bulk", json={"action": "deactivate", "ids": [str(fake_user_collection.id)]}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json() == {"action": "deactivate", "matched": 1, "modified": 1}
+    mock_redis_client.delete.assert_called()
+
+    response = await http_client_api.patch(
+        "/users/_bulk", json={"action": "reassign-role", "filter": {"active": False}}, headers=headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+    assert response.json()["code_error"] == UserErrorCode.USER_BULK_INVALID_OPERATION
+
+    for payload in ({"filter": {}}, {"filter": {"query": ""}}):
+        response = await http_client_api.post("/users/_bulk-delete", json=payload, headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+        assert response.json()["code_error"] == UserErrorCode.USER_BULK_INVALID_OPERATION
+    assert await fake_user_collection.__class__.get(fake_user_collection.id) is not None
+
+    response = await http_client_api.post("/users/_bulk-delete", json={"filter": {"active": False}}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["modified"] == 1
+    assert await fake_user_collection.__class__.get(fake_user_collection.id) is None
+
+
+@pytest.mark.asyncio
+async def test_users_stats_endpoint(
+    http_client_api,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    await stats.reconcile()
+    response = await http_client_api.get("/users/_stats", headers={"Authorization": "Bearer valid_token"})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["total"] == 1
+    assert response.json()["roles"][0]["active"] == 1
+
+
+@pytest.mark.asyncio
+async def test_listing_users_with_filters(
+    http_client_api,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    headers = {"Authorization": "Bearer valid_token"}
+    params = {
+        "filter": [f"role:eq:{fake_user_collection.role}", "created_at:gte:2000-01-01T00:00:00"],
+        "order_by": "-created_at",
+    }
+    response = await http_client_api.get("/users", params=params, headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert [item["_id"] for item in response.json()["items"]] == [str(fake_user_collection.id)]
+
+    response = await http_client_api.get("/users", params={"filter": "role:eq:66e85363aa07cb1e95d3e3d0"}, headers=headers)
+    assert response.json()["items"] == []
+
+    response = await http_client_api.get("/users", params={"order_by": "email"}, headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST, response.text
+    assert response.json()["code_error"] == UserErrorCode.USER_INVALID_FILTER
+
+
+@pytest.mark.asyncio
+async def test_listing_users_by_permission(
+    http_client_api,
+    fake_user_collection,
+    mock_verify_access_token,
+    mock_check_permissions_handler,
+):
+    headers = {"Authorization": "Bearer valid_token"}
+    response = await http_client_api.get("/users/_by-permission", params={"code": "perm-1"}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert [item["_id"] for item in response.json()["items"]] == [str(fake_user_collection.id)]
+
+    response = await http_client_api.get("/users/_by-permission", params={"code": "perm-unknown"}, headers=headers)
+    assert response.json()["items"] == []
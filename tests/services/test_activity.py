@@ -0,0 +1,41 @@
+import pytest
+
+from src.services.activity import UserActivityBuffer
+
+
+@pytest.mark.asyncio
+async def test_activity_buffer_coalesces_updates(fixture_models, fake_user_collection):
+    buffer = UserActivityBuffer(flush_interval=60, max_pending=100)
+
+    buffer.record(fake_user_collection.id, address_ip="10.0.0.1", device_id="first")
+    buffer.record(fake_user_collection.id, device_id="second")
+    assert buffer.pending(fake_user_collection.id) == {"address_ip": "10.0.0.1", "device_id": "second"}
+
+    assert await buffer.flush() == 1
+    assert buffer.pending(fake_user_collection.id) == {}
+
+    user = await fixture_models.User.get(fake_user_collection.id)
+    assert user.attributes == {**fake_user_collection.attributes, "address_ip": "10.0.0.1", "device_id": "second"}
+
+
+@pytest.mark.asyncio
+async def test_activity_buffer_discard(fake_user_collection):
+    buffer = UserActivityBuffer(flush_interval=60, max_pending=100)
+
+    buffer.record(fake_user_collection.id, device_id="device")
+    buffer.discard(fake_user_collection.id, "device_id")
+
+    assert buffer.pending(fake_user_collection.id) == {}
+    assert await buffer.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_activity_buffer_early_flush_is_awaited_on_stop(fixture_models, fake_user_collection):
+    buffer = UserActivityBuffer(flush_interval=60, max_pending=1)
+
+    buffer.record(fake_user_collection.id, address_ip="10.0.0.2")
+    await buffer.stop()
+
+    assert len(buffer) == 0
+    user = await fixture_models.User.get(fake_user_collection.id)
+    assert user.attributes["address_ip"] == "10.0.0.2"
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from src.common.helpers.exception import CustomHTTPException
+from src.services import archive, stats, users
+from src.shared.utils import AccountAction
+
+
+@pytest.mark.asyncio
+async def test_archive_and_restore_on_reactivation(fixture_models, fake_user_collection):
+    long_ago = datetime.now(tz=UTC) - timedelta(days=365)
+    await fake_user_collection.set({"is_active": False, "updated_at": long_ago})
+    await stats.reconcile()
+
+    assert await archive.archive_inactive_users(batch_size=1) == 1
+    assert await fixture_models.User.get(fake_user_collection.id) is None
+    assert (await stats.get_user_stats()).total == 0
+
+    archived = await archive.get_archived_user(fake_user_collection.id)
+    assert archived.email == fake_user_collection.email
+    with pytest.raises(CustomHTTPException):
+        await users.get_one_user(fake_user_collection.id)
+
+    await users.activate_user_account(fake_user_collection.id, AccountAction.ACTIVATE)
+    restored = await fixture_models.User.get(fake_user_collection.id)
+    assert restored.is_active is True
+    assert await fixture_models.UserArchive.get_motor_collection().count_documents({}) == 0
+    assert (await stats.get_user_stats()).active == 1
+
+
+@pytest.mark.asyncio
+async def test_archive_skips_recent_and_active_users(fake_user_collection):
+    assert await archive.archive_inactive_users() == 0
+
+    await fake_user_collection.set({"is_active": False})
+    assert await archive.archive_inactive_users() == 0
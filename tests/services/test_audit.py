@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, UTC
+from unittest import mock
+
+import pytest
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from src.common.helpers.exception import CustomHTTPException
+from src.services import audit
+from src.shared.utils import AuditPeriod, AuditScope
+
+
+@pytest.fixture
+def mock_login_events():
+    collection = mock.MagicMock()
+    collection.insert_many = mock.AsyncMock()
+    with mock.patch.object(audit.LoginEvent, "get_motor_collection", return_value=collection):
+        yield collection
+
+
+@pytest.fixture
+def login_events_collection():
+    # La base de test ne crée pas de collection time-series : les événements vont dans une collection ordinaire
+    collection = audit.LoginRollup.get_motor_collection().database["login_events"]
+    with mock.patch.object(audit.LoginEvent, "get_motor_collection", return_value=collection):
+        yield collection
+
+
+@pytest.mark.asyncio
+async def test_login_audit_flush_updates_rollups(login_events_collection):
+    buffer = audit.LoginAuditBuffer(flush_interval=60, max_pending=100)
+    user_id, role_id = PydanticObjectId(), PydanticObjectId()
+    now = datetime.now(tz=UTC).replace(minute=30)
+
+    buffer.record(user_id, role_id, now, address_ip="10.0.0.1", device_id="device")
+    buffer.record(user_id, role_id, now - timedelta(hours=1))
+    assert len(buffer) == 2
+
+    assert await buffer.flush() == 2
+    assert len(buffer) == 0
+    events = await login_events_collection.find({"meta.user": user_id}).to_list(length=None)
+    assert sorted(event["device_id"] or "" for event in events) == ["", "device"]
+
+    hourly = await audit.get_login_rollups(AuditScope.USER, user_id, AuditPeriod.HOUR)
+    assert [point.count for point in hourly.points] == [1, 1]
+    assert hourly.total == 2
+
+    daily = await audit.get_login_rollups(AuditScope.ROLE, role_id, AuditPeriod.DAY)
+    assert daily.total == 2
+
+
+@pytest.mark.asyncio
+async def test_login_audit_keeps_events_on_failure(mock_login_events):
+    mock_login_events.insert_many.side_effect = PyMongoError("down")
+    buffer = audit.LoginAuditBuffer(flush_interval=60, max_pending=100)
+    buffer.record(PydanticObjectId(), None, datetime.now(tz=UTC))
+
+    assert await buffer.flush() == 0
+    assert len(buffer) == 1
+
+
+@pytest.mark.asyncio
+async def test_login_audit_retries_only_transient_rejections(mock_login_events):
+    mock_login_events.insert_many.side_effect = BulkWriteError(
+        {
+            "writeErrors": [
+                {"index": 1, "code": 11600, "errmsg": "interrupted at shutdown"},
+                {"index": 2, "code": 121, "errmsg": "document failed validation"},
+            ],
+            "nInserted": 2,
+        }
+    )
+    buffer = audit.LoginAuditBuffer(flush_interval=60, max_pending=100)
+    user_id, now = PydanticObjectId(), datetime.now(tz=UTC)
+    for device_id in ("first", "second", "third", "fourth"):
+        buffer.record(user_id, None, now, device_id=device_id)
+
+    assert await buffer.flush() == 2
+    assert [event["device_id"] for event in buffer._pending] == ["second"]
+    assert (await audit.get_login_rollups(AuditScope.USER, user_id, AuditPeriod.HOUR)).total == 2
+
+
+@pytest.mark.asyncio
+async def test_login_audit_retries_failed_rollups(login_events_collection):
+    buffer = audit.LoginAuditBuffer(flush_interval=60, max_pending=100)
+    user_id = PydanticObjectId()
+    buffer.record(user_id, None, datetime.now(tz=UTC))
+
+    rollups = mock.MagicMock()
+    rollups.bulk_write = mock.AsyncMock(side_effect=PyMongoError("down"))
+    with mock.patch.object(audit.LoginRollup, "get_motor_collection", return_value=rollups):
+        assert await buffer.flush() == 1
+    assert (await audit.get_login_rollups(AuditScope.USER, user_id, AuditPeriod.HOUR)).total == 0
+
+    # Le buffer est vide mais les incréments en attente sont réécrits au flush suivant
+    assert len(buffer) == 0
+    assert await buffer.flush() == 0
+    assert (await audit.get_login_rollups(AuditScope.USER, user_id, AuditPeriod.HOUR)).total == 1
+
+
+@pytest.mark.asyncio
+async def test_login_rollups_invalid_range():
+    now = datetime.now(tz=UTC)
+    with pytest.raises(CustomHTTPException):
+        await audit.get_login_rollups(
+            AuditScope.USER, PydanticObjectId(), AuditPeriod.DAY, since=now, until=now - timedelta(days=2)
+        )
@@ -9,14 +9,15 @@ from starlette.responses import JSONResponse
 from src.common.depends.permission import CustomHTTPException
 from src.config import settings
 from src.schemas import LoginUser
-from src.services import auth
+from src.services import auth, stats
 from src.shared.error_codes import AuthErrorCode, UserErrorCode
 from beanie import PydanticObjectId
 
 
 @pytest.mark.asyncio
 @mock.patch("src.services.auth.auth.get_mac_address")
-@mock.patch("src.services.auth.auth.User.set", new_callable=mock.AsyncMock)
+@mock.patch("src.services.auth.auth.patch_user_attributes", new_callable=mock.AsyncMock)
+@mock.patch("src.services.auth.auth.activity_buffer")
 @mock.patch("src.services.auth.auth.User.find_one", new_callable=mock.AsyncMock)
 @mock.patch("src.services.auth.auth.verify_password", return_value=True)
 @mock.patch("src.services.auth.auth.get_one_role", new_callable=mock.AsyncMock)
@@ -28,7 +29,8 @@ async def test_login_success(
     mock_get_one_role,
     mock_verify_password,
     mock_find_one,
-    mock_user_set,
+    mock_activity_buffer,
+    mock_patch_user_attributes,
     mock_get_mac_address,
     fixture_models,
     mock_task,
@@ -48,7 +50,7 @@ async def test_login_success(
                 password="hashedpassword",
                 role=PydanticObjectId("66e85363aa07cb1e95d3e3d0"),
                 is_active=True,
-                attributes={"device_id": None, "address_ip": None, "last_login": None},
+                attributes={"device_id": None, "address_ip": None, "last_login": None, "otp_secret": "secret"},
             )
             payload = LoginUser(email="test@example.com", password="testpassword")
         else:
@@ -60,14 +62,14 @@ async def test_login_success(
                 password="hashedpassword",
                 role=PydanticObjectId("66e85363aa07cb1e95d3e3d0"),
                 is_active=True,
-                attributes={"device_id": None, "address_ip": None, "last_login": None},
+                attributes={"device_id": None, "address_ip": None, "last_login": None, "otp_secret": "secret"},
             )
             payload = LoginUser(phonenumber="+2250151571396", password="testpassword")
 
         # setup mocks
         mock_find_one.return_value = fake_user
         mock_get_one_role.return_value.model_dump = mock.Mock(return_value={"_id": "66e85363aa07cb1e95d3e3d0", "name": "admin"})
-        mock_user_set.return_value = fake_user
+        mock_activity_buffer.pending.return_value = {}
 
         # mock request headers for X-Forwarded-For
         mock_request.headers = {"X-Forwarded-For": "192.168.1.1"}
@@ -88,6 +90,12 @@ async def test_login_success(
         # user data assertions
         assert response_data["user"][identifier] == payload.email if register_with_email else payload.phonenumber
         assert response_data["user"]["role"]["name"] == "admin"
+        assert response_data["user"]["attributes"]["device_id"] == "test_device_id"
+        assert "otp_secret" not in response_data["user"]["attributes"]
+        assert "otp_secret" not in mock_access_token.call_args.kwargs["data"]["attributes"]
+
+        mock_patch_user_attributes.assert_awaited_with(user_id=fake_user.id, set_attributes={"device_id": "test_device_id"})
+        mock_activity_buffer.record.assert_called_with(fake_user.id, last_login=mock.ANY, address_ip="192.168.1.1")
 
 
 @pytest.mark.asyncio
@@ -213,3 +221,34 @@ async def test_login_invalid_identifier_not_found(mock_find_one, mock_request, f
         assert excinfo.value.message_error == expected_message
 
         mock_request.assert_not_called()
+
+
+@pytest.mark.asyncio
+@mock.patch("src.services.auth.phonenumber.otp_service")
+@mock.patch("src.services.auth.phonenumber.send_otp", new_callable=mock.AsyncMock)
+async def test_phonenumber_signup_expires_until_verified(
+    mock_send_otp, mock_otp_service, fixture_models, fake_role_collection, mock_task
+):
+    from src.schemas import RequestChangePassword, VerifyOTP
+    from src.services.auth import phonenumber
+
+    payload = RequestChangePassword(phonenumber="+2250707070707", password="password123", role=fake_role_collection.id)
+    await phonenumber.signup_with_phonenumber(mock_task, payload)
+
+    user = await fixture_models.User.find_one({"phonenumber": payload.phonenumber})
+    assert user.is_active is False
+    assert user.pending_expires_at is not None
+    mock_send_otp.assert_called_once()
+    assert (await stats.get_user_stats()).total == 0
+    assert await stats.reconcile() == 0
+
+    await user.set({"attributes.otp_secret": "secret"})
+    mock_otp_service.generate_otp_instance.return_value.verify.return_value = True
+    response = await phonenumber.verify_otp(VerifyOTP(phonenumber=payload.phonenumber, otp_code="1234"))
+    assert response.status_code == status.HTTP_200_OK
+
+    user = await fixture_models.User.get(user.id)
+    assert user.is_active is True
+    assert user.pending_expires_at is None
+    assert (await stats.get_user_stats()).active == 1
+    assert await stats.reconcile() == 1
@@ -0,0 +1,40 @@
+import pytest
+
+from src.common.helpers.exception import CustomHTTPException
+from src.schemas import ParamsModel
+from src.services import params
+from src.shared.error_codes import ParamErrorCode
+
+
+@pytest.mark.asyncio
+async def test_backfill_slugs_prevents_duplicates(fixture_models):
+    collection = fixture_models.Params.get_motor_collection()
+    await collection.insert_one({"type": "CITY", "name": "Abidjan", "slug": "cityabidjan"})
+
+    await params.backfill_slugs()
+    assert (await collection.find_one({"name": "Abidjan"}))["slug"] == "city-abidjan"
+
+    with pytest.raises(CustomHTTPException) as exc_info:
+        await params.create(ParamsModel(type="CITY", name="Abidjan"))
+    assert exc_info.value.code_error == ParamErrorCode.PARAM_ALREADY_EXIST
+
+
+@pytest.mark.asyncio
+async def test_list_etag_follows_latest_update():
+    param = await params.create(ParamsModel(type="CITY", name="Abidjan"))
+    etag = await params.list_etag({"type": "CITY"}, "type=city")
+    assert await params.list_etag({"type": "CITY"}, "type=city") == etag
+
+    await params.update(param.id, ParamsModel(type="CITY", name="Bouake"))
+    assert await params.list_etag({"type": "CITY"}, "type=city") != etag
+
+
+@pytest.mark.asyncio
+async def test_update_to_existing_name_conflicts():
+    await params.create(ParamsModel(type="CITY", name="Abidjan"))
+    param = await params.create(ParamsModel(type="CITY", name="Bouake"))
+
+    with pytest.raises(CustomHTTPException) as exc_info:
+        await params.update(param.id, ParamsModel(type="CITY", name="Abidjan"))
+    assert exc_info.value.code_error == ParamErrorCode.PARAM_ALREADY_EXIST
+    assert (await params.get_one(param.id)).name == "Bouake"
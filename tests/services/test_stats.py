@@ -0,0 +1,58 @@
+import pytest
+
+from src.schemas import UserBulkUpdate
+from src.services import stats, users
+from src.shared.utils import AccountAction
+
+
+@pytest.mark.asyncio
+async def test_reconcile_and_incremental_counters(fixture_models, fake_role_collection, fake_user_collection, fake_data):
+    assert await stats.reconcile() == 1
+    summary = await stats.get_user_stats()
+    assert (summary.total, summary.active, summary.inactive) == (1, 1, 0)
+    assert summary.roles[0].role == fake_role_collection.id
+    assert summary.roles[0].role_summary.name == fake_role_collection.name
+
+    await users.activate_user_account(fake_user_collection.id, AccountAction.DEACTIVATE)
+    await users.insert_user(
+        fixture_models.User(email=fake_data.unique.email(), role=fake_role_collection.id, is_active=True, password="x")
+    )
+    summary = await stats.get_user_stats()
+    assert (summary.total, summary.active, summary.inactive) == (2, 1, 1)
+
+    await users.delete_many_users([fake_user_collection.id])
+    summary = await stats.get_user_stats()
+    assert (summary.total, summary.active, summary.inactive) == (1, 1, 0)
+
+    assert await stats.reconcile() == 1
+    assert (await stats.get_user_stats()).total == 1
+
+
+async def _counters_by_role():
+    return {entry.role: (entry.active, entry.inactive) for entry in (await stats.get_user_stats()).roles}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_counts_only_filtered_users(fixture_models, fake_role_collection, fake_user_collection, fake_data):
+    source = fake_role_collection.id
+    third = (await fixture_models.Role(name=fake_data.unique.name()).create()).id
+    target = (await fixture_models.Role(name=fake_data.unique.name()).create()).id
+    await fixture_models.User(email=fake_data.unique.email(), role=source, is_active=True).create()
+    for is_active in (True, True, False):
+        await fixture_models.User(email=fake_data.unique.email(), role=third, is_active=is_active).create()
+    await stats.reconcile()
+
+    await users.bulk_update_users(
+        UserBulkUpdate.model_validate({"action": "reassign-role", "role": target, "filter": {"role": source}})
+    )
+    assert await _counters_by_role() == {target: (2, 0), third: (2, 1)}
+
+    # Déjà actifs : rien ne change, l'utilisateur inactif du rôle n'est pas sélectionné
+    result = await users.bulk_update_users(
+        UserBulkUpdate.model_validate({"action": "activate", "filter": {"role": third, "active": True}})
+    )
+    assert result.modified == 0
+    assert await _counters_by_role() == {target: (2, 0), third: (2, 1)}
+
+    assert await stats.reconcile() == 5
+    assert await _counters_by_role() == {target: (2, 0), third: (2, 1)}
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from beanie import PydanticObjectId
+
+from src.common.helpers.exception import CustomHTTPException
+from src.schemas import USER_READ_PROJECTION
+from src.services import users
+from src.shared.error_codes import UserErrorCode
+from src.shared.utils import ChangeType
+
+
+@pytest.mark.asyncio
+async def test_patch_user_attributes_set_and_unset(fake_user_collection):
+    user = await users.patch_user_attributes(
+        user_id=fake_user_collection.id,
+        set_attributes={"avatar": "avatar.png"},
+        unset_attributes=["city"],
+        return_document=True,
+    )
+
+    assert user.attributes == {"avatar": "avatar.png"}
+
+
+@pytest.mark.asyncio
+async def test_patch_user_attributes_keeps_other_keys(fixture_models, fake_user_collection):
+    await users.patch_user_attributes(user_id=fake_user_collection.id, set_attributes={"device_id": "device"})
+
+    user = await fixture_models.User.get(fake_user_collection.id)
+    assert user.attributes == {**fake_user_collection.attributes, "device_id": "device"}
+
+
+@pytest.mark.asyncio
+async def test_patch_user_attributes_invalid_key(fake_user_collection):
+    with pytest.raises(CustomHTTPException) as exc_info:
+        await users.patch_user_attributes(user_id=fake_user_collection.id, set_attributes={"profile.city": "Abidjan"})
+
+    assert exc_info.value.code_error == UserErrorCode.INVALID_ATTRIBUTES
+
+
+@pytest.mark.asyncio
+async def test_patch_user_attributes_not_found():
+    with pytest.raises(CustomHTTPException) as exc_info:
+        await users.patch_user_attributes(
+            user_id=PydanticObjectId("66e85363aa07cb1e95d3e3d0"), set_attributes={"city": "Abidjan"}, return_document=True
+        )
+
+    assert exc_info.value.code_error == UserErrorCode.USER_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_to_user_read_models_skips_hidden_fields(fixture_models, fake_role_collection, fake_user_collection):
+    await fake_user_collection.set({"attributes.otp_secret": "secret"})
+    documents = await fixture_models.User.get_motor_collection().find({}, projection=USER_READ_PROJECTION).to_list(None)
+
+    items = await users.to_user_read_models(documents)
+
+    assert items[0].id == fake_user_collection.id
+    assert "otp_secret" not in items[0].attributes
+    assert items[0].extras["role_info"]["name"] == fake_role_collection.name
+    assert "password" not in items[0].model_dump()
+
+
+@pytest.mark.asyncio
+async def test_find_user_by_identifier_queries_database(fixture_models, fake_user_collection):
+    user = await users.find_user_by_identifier(fake_user_collection.email.upper(), is_email=True)
+    assert user.id == fake_user_collection.id
+
+    account = await users.find_user_by_identifier("2250101010101", is_email=False, projection_model=fixture_models.UserStatus)
+    assert (account.id, account.is_active) == (fake_user_collection.id, True)
+
+    assert await users.find_user_by_identifier("unknown@example.com", is_email=True) is None
+
+
+@pytest.mark.asyncio
+async def test_resolve_role_slug_queries_database(fake_role_collection):
+    from src.services import roles
+
+    assert await roles.resolve_role_slug(fake_role_collection.name) == fake_role_collection.id
+    with pytest.raises(CustomHTTPException):
+        await roles.resolve_role_slug("unknown-role")
+
+
+@pytest.mark.asyncio
+async def test_patch_user_fields_normalizes_identifiers(fixture_models, fake_user_collection):
+    await users.patch_user_attributes(
+        user_id=fake_user_collection.id, fields={"email": "New.Address@Example.com", "phonenumber": "00225 07 07 07 07 07"}
+    )
+
+    user = await fixture_models.User.get(fake_user_collection.id)
+    assert (user.email_norm, user.phone_norm) == ("new.address@example.com", "+2250707070707")
+
+
+@pytest.mark.asyncio
+async def test_find_user_by_identifier_falls_back_on_legacy_users(monkeypatch, fixture_models, fake_user_collection):
+    await fixture_models.User.get_motor_collection().update_one(
+        {"_id": fake_user_collection.id}, {"$unset": {"email_norm": "", "phone_norm": ""}}
+    )
+    assert await users.find_user_by_identifier(fake_user_collection.email, is_email=True) is None
+
+    monkeypatch.setattr(users, "_legacy_identifier_conflicts", True)
+    user = await users.find_user_by_identifier(fake_user_collection.email, is_email=True)
+    assert user.id == fake_user_collection.id
+
+
+@pytest.mark.asyncio
+async def test_user_changes_report_deleted_and_pending_users(fixture_models, fake_role_collection, fake_user_collection):
+    # Position du curseur strictement avant les écritures du test, même à la milliseconde près
+    await fake_user_collection.set({"updated_at": datetime.now(tz=UTC) - timedelta(minutes=1)})
+    cursor = (await users.get_user_changes()).next_cursor
+
+    assert await users.delete_many_users([fake_user_collection.id]) == 1
+    pending = await fixture_models.User(
+        phonenumber="+2250707070707",
+        role=fake_role_collection.id,
+        is_active=False,
+        pending_expires_at=datetime.now(tz=UTC) + timedelta(days=1),
+    ).create()
+
+    page = await users.get_user_changes(since=cursor)
+    assert [(item.id, item.extras["change"]) for item in page.items] == [
+        (fake_user_collection.id, ChangeType.DELETED),
+        (pending.id, ChangeType.PENDING),
+    ]
+    assert (await users.get_user_changes(since=page.next_cursor)).items == []
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from src.shared.batch_loader import BatchLoader
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_coalesces_concurrent_keys():
+    calls = []
+
+    async def load_many(keys):
+        calls.append(sorted(keys))
+        return {key: key * 10 for key in keys if key != 3}
+
+    loader = BatchLoader("numbers", load_many, window=0.01, max_batch_size=100)
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+
+    assert results == [10, 20, 10, None]
+    assert calls == [[1, 2, 3]]
+    assert loader.metrics.batches == 1
+    assert loader.metrics.coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_propagates_errors_to_every_waiter():
+    async def load_many(keys):
+        raise RuntimeError("database unavailable")
+
+    loader = BatchLoader("failing", load_many, window=0.01, max_batch_size=100)
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert loader.metrics.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_dispatches_when_batch_is_full():
+    calls = []
+
+    async def load_many(keys):
+        calls.append(len(keys))
+        return {key: key for key in keys}
+
+    loader = BatchLoader("full", load_many, window=10, max_batch_size=2)
+    assert await asyncio.gather(loader.load(1), loader.load(2)) == [1, 2]
+    assert calls == [2]
@@ -0,0 +1,36 @@
+import io
+from itertools import islice
+
+import pytest
+
+from src.shared.bulk_import import aiter_rows, iter_rows
+from src.shared.utils import ExportFormat
+
+CSV_PAYLOAD = '﻿email,fullname,attributes\r\na@x.io,"Multi\nline",\r\n\r\nb@x.io,,"{""city"": ""A""}"\r\nc@x.io,,{\r\n'.encode()
+
+
+async def chunked(content: bytes, size: int):
+    for start in range(0, len(content), size):
+        yield bytes(islice(content, start, start + size))
+
+
+def test_iter_rows_reads_csv_lines():
+    rows = list(iter_rows(io.BytesIO(CSV_PAYLOAD), ExportFormat.CSV))
+
+    assert [row.index for row in rows] == [1, 2, 3]
+    assert rows[0].data == {"email": "a@x.io", "fullname": "Multi\nline"}
+    assert rows[1].data == {"email": "b@x.io", "attributes": {"city": "A"}}
+    assert rows[2].error.startswith("Invalid attributes JSON")
+
+
+@pytest.mark.asyncio
+async def test_aiter_rows_splits_chunks_into_lines():
+    content = b'{"email": "a@x.io"}\n\nnot json\n[1]\n{"email": "b@x.io"}'
+    rows = [row async for row in aiter_rows(chunked(content, 4), ExportFormat.NDJSON)]
+
+    assert [(row.index, row.data.get("email")) for row in rows] == [(1, "a@x.io"), (2, None), (3, None), (4, "b@x.io")]
+    assert rows[1].error.startswith("Invalid JSON")
+    assert rows[2].error == "Each line must be a JSON object."
+
+    rows = [row async for row in aiter_rows(chunked(CSV_PAYLOAD, 5), ExportFormat.CSV)]
+    assert [row.data for row in rows] == [row.data for row in iter_rows(io.BytesIO(CSV_PAYLOAD), ExportFormat.CSV)]
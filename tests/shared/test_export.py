@@ -0,0 +1,30 @@
+from datetime import datetime, UTC
+
+import orjson
+from bson import ObjectId
+
+from src.shared.export import csv_header, encode_batch
+from src.shared.utils import ExportFormat
+
+COLUMNS = ("_id", "email", "attributes", "created_at")
+
+
+def _documents():
+    return [
+        {"_id": ObjectId(), "email": "a@example.com", "attributes": {"city": "Abidjan"}, "created_at": datetime.now(tz=UTC)},
+        {"_id": ObjectId(), "email": None, "attributes": {}, "created_at": None},
+    ]
+
+
+def test_encode_batch_ndjson():
+    documents = _documents()
+    lines = encode_batch(documents, ExportFormat.NDJSON, COLUMNS).splitlines()
+    assert [orjson.loads(line)["_id"] for line in lines] == [str(document["_id"]) for document in documents]
+
+
+def test_encode_batch_csv():
+    documents = _documents()
+    rows = (csv_header(COLUMNS) + encode_batch(documents, ExportFormat.CSV, COLUMNS)).decode().splitlines()
+    assert rows[0] == "_id,email,attributes,created_at"
+    assert rows[1].startswith(f"{documents[0]['_id']},a@example.com,")
+    assert rows[2] == f"{documents[1]['_id']},,{{}},"
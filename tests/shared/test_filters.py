@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+from beanie import PydanticObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from src.common.helpers.exception import CustomHTTPException
+from src.services.users import user_query_compiler
+
+ROLE_ID = "66e85363aa07cb1e95d3e3d0"
+
+
+def test_compile_equality_range_and_sort():
+    compiled = user_query_compiler.compile(
+        [f"role:eq:{ROLE_ID}", "created_at:gte:2024-01-01T00:00:00", "created_at:lt:2025-01-01T00:00:00"],
+        default_sort=[("created_at", DESCENDING)],
+        equals={"is_active": True},
+    )
+
+    assert compiled.filter == {
+        "is_active": True,
+        "role": PydanticObjectId(ROLE_ID),
+        "created_at": {"$gte": datetime(2024, 1, 1), "$lt": datetime(2025, 1, 1)},
+    }
+    assert compiled.sort == [("created_at", DESCENDING)]
+    assert compiled.index == ("role", "is_active", "created_at")
+
+
+def test_compile_order_by_and_in_operator():
+    compiled = user_query_compiler.compile([f"role:in:{ROLE_ID}|{ROLE_ID}"], order_by="last_login")
+
+    assert compiled.filter == {"role": {"$in": [PydanticObjectId(ROLE_ID)] * 2}}
+    assert compiled.sort == [("attributes.last_login", ASCENDING)]
+    assert compiled.index == ("role", "attributes.last_login")
+
+
+def test_compile_attribute_equality_uses_wildcard_index():
+    compiled = user_query_compiler.compile(["attributes.city:eq:Abidjan"], default_sort=[("created_at", DESCENDING)])
+
+    assert compiled.filter == {"attributes.city": "Abidjan"}
+    assert compiled.sort == []
+    assert compiled.index == ("attributes.$**",)
+
+
+@pytest.mark.parametrize(
+    "filters, order_by, equals",
+    [
+        (["attributes.city:eq:Abidjan", "created_at:gte:2024-01-01T00:00:00"], "fullname", None),
+        (["attributes.city:eq:Abidjan", "created_at:gte:2024-01-01T00:00:00"], None, None),
+        (["attributes.city:eq:Abidjan", f"role:eq:{ROLE_ID}"], None, None),
+        (["attributes.city:eq:Abidjan", "attributes.country:eq:CI"], None, None),
+        (["attributes.city:eq:Abidjan"], "-created_at", None),
+        (["attributes.city:eq:Abidjan"], None, {"is_active": True}),
+    ],
+)
+def test_compile_rejects_wildcard_with_other_criteria(filters, order_by, equals):
+    with pytest.raises(CustomHTTPException):
+        user_query_compiler.compile(filters, order_by, default_sort=[("created_at", DESCENDING)], equals=equals)
+
+
+@pytest.mark.parametrize(
+    "filters, order_by",
+    [
+        (["password:eq:secret"], None),
+        (["created_at:eq:2024-01-01"], None),
+        (["role:eq:not-an-id"], None),
+        (["role"], None),
+        ([f"role:eq:{ROLE_ID}"], "fullname"),
+        (["created_at:gte:2024-01-01", "last_login:gte:2024-01-01"], None),
+        ([], "created_at,-fullname"),
+    ],
+)
+def test_compile_rejects_invalid_or_unindexed_queries(filters, order_by):
+    with pytest.raises(CustomHTTPException):
+        user_query_compiler.compile(filters, order_by, default_sort=[("created_at", DESCENDING)])
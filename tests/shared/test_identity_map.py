@@ -0,0 +1,36 @@
+import pytest
+
+from src.services import roles
+from src.shared.identity_map import identity_map
+
+
+def test_identity_map_is_noop_outside_scope():
+    identity_map.add(dict, "id", {"name": "value"})
+
+    assert identity_map.get(dict, "id") is None
+
+
+def test_identity_map_evict():
+    with identity_map.scope():
+        identity_map.add(dict, "first", {"name": "first"})
+        identity_map.add(dict, "second", {"name": "second"})
+
+        identity_map.evict(dict, "first")
+        assert identity_map.get(dict, "first") is None
+        assert identity_map.get(dict, "second") == {"name": "second"}
+
+        identity_map.evict(dict)
+        assert identity_map.get(dict, "second") is None
+
+
+@pytest.mark.asyncio
+async def test_get_one_role_is_memoized_within_scope(fake_role_collection):
+    requested = roles.role_loader.metrics.requested
+    with identity_map.scope():
+        first = await roles.get_one_role(role_id=fake_role_collection.id)
+        second = await roles.get_one_role(role_id=fake_role_collection.id)
+
+    await roles.get_one_role(role_id=fake_role_collection.id)
+
+    assert first is second
+    assert roles.role_loader.metrics.requested - requested == 2
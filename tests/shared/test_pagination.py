@@ -0,0 +1,38 @@
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from src.shared.pagination import CountCache, count_total, CountStrategy
+
+
+@pytest.mark.asyncio
+async def test_count_cache_reuses_totals_until_cleared():
+    collection = AsyncMongoMockClient()["test"]["items"]
+    await collection.insert_many([{"kind": "a"}, {"kind": "a"}, {"kind": "b"}])
+    cache = CountCache(ttl=60)
+
+    assert await cache.count(collection, {"kind": "a"}) == 2
+    await collection.insert_one({"kind": "a"})
+    assert await cache.count(collection, {"kind": "a"}) == 2
+    assert await cache.count(collection, {"kind": "b"}) == 1
+
+    cache.clear()
+    assert await cache.count(collection, {"kind": "a"}) == 3
+
+
+@pytest.mark.asyncio
+async def test_count_total_strategies():
+    collection = AsyncMongoMockClient()["test"]["items"]
+    await collection.insert_many([{"kind": "a"}, {"kind": "b"}])
+
+    assert await count_total(collection, {"kind": "a"}, CountStrategy.EXACT) == 1
+    assert await count_total(collection, {}, CountStrategy.ESTIMATED) == 2
+
+
+@pytest.mark.asyncio
+async def test_count_cache_expires():
+    collection = AsyncMongoMockClient()["test"]["items"]
+    cache = CountCache(ttl=0)
+
+    assert await cache.count(collection, {}) == 0
+    await collection.insert_one({"kind": "a"})
+    assert await cache.count(collection, {}) == 1
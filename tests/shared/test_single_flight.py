@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from src.shared.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_in_flight_call():
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"name": "admin"}
+
+    flight = SingleFlight("roles", clone=dict)
+    results = await asyncio.gather(*(flight.do("admin", lookup) for _ in range(5)))
+
+    assert calls == 1
+    assert all(result == {"name": "admin"} for result in results)
+    assert results[0] is not results[1]
+    assert flight.metrics.shared == 4
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_and_forgets_key():
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database unavailable")
+
+    async def succeeding():
+        return "ok"
+
+    flight = SingleFlight("failing")
+    results = await asyncio.gather(flight.do("key", failing), flight.do("key", failing), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await flight.do("key", succeeding) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_caller():
+    async def lookup():
+        await asyncio.sleep(0.02)
+        return "value"
+
+    flight = SingleFlight("cancel")
+    first = asyncio.create_task(flight.do("key", lookup))
+    second = asyncio.create_task(flight.do("key", lookup))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "value"
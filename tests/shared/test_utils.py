@@ -0,0 +1,31 @@
+import pytest
+
+from src.shared.utils import normalize_email, normalize_phonenumber
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("John.Doe@Example.COM", "john.doe@example.com"),
+        ("  haf@example.com ", "haf@example.com"),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_normalize_email(value, expected):
+    assert normalize_email(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("+2250151571396", "+2250151571396"),
+        ("2250151571396", "+2250151571396"),
+        ("002250151571396", "+2250151571396"),
+        ("+225 01-51.57 (13) 96", "+2250151571396"),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_normalize_phonenumber(value, expected):
+    assert normalize_phonenumber(value) == expected